@@ -0,0 +1,142 @@
+"""
+Boogpp Compilation Cache
+Persists front-end results and generated LLVM IR keyed by source hash.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+
+CACHE_DIR_NAME = ".boogpp_cache"
+
+# Pinned rather than HIGHEST_PROTOCOL so entries stay readable by every
+# supported interpreter, independent of which one wrote them
+PICKLE_PROTOCOL = 5
+
+# Root of the compiler package; its sources decide what a cached AST or IR
+# looks like, so they are part of every cache key
+COMPILER_DIR = Path(__file__).resolve().parent
+
+# Module files that make up the compiler, including mypyc-built extensions
+_COMPILER_SUFFIXES = ('.py', '.so', '.pyd')
+
+
+def source_digest(root: Path) -> str:
+    """Hash the compiler module files under root"""
+    digest = hashlib.sha256()
+    for path in sorted(p for p in Path(root).rglob('*') if p.suffix in _COMPILER_SUFFIXES):
+        digest.update(path.relative_to(root).as_posix().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(path.read_bytes())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def compiler_fingerprint() -> str:
+    """Digest of the installed compiler sources, computed once per process"""
+    return source_digest(COMPILER_DIR)
+
+
+class CompilationCache:
+    """On-disk cache for front-end results and generated LLVM IR"""
+
+    def __init__(self, cache_dir: Path, version: str, fingerprint: Optional[str] = None):
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        # Entries written by a different build of the compiler never match,
+        # even when the version string was not bumped
+        self.fingerprint = fingerprint if fingerprint is not None else compiler_fingerprint()
+
+    def make_key(self, source_code: str, filename: str, safety_mode: str) -> str:
+        """Build the cache key for a source file"""
+        # Filenames are recorded in AST nodes and diagnostics, so they are part of the key
+        digest = hashlib.sha256()
+        digest.update(self.fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(filename.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(source_code.encode('utf-8'))
+        return f"{digest.hexdigest()}-{self.version}-{safety_mode.lower()}"
+
+    def load_frontend(self, key: str) -> Optional[Any]:
+        """Load cached (token_count, ast, type_annotations, warnings), if any"""
+        try:
+            # Unpickle straight from the file so the raw bytes are never held
+            # alongside the reconstructed AST
+            with open(self.cache_dir / f"{key}.pkl", 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            # Missing, stale or corrupt entry; treat as a miss
+            return None
+
+    def store_frontend(self, key: str, entry: Any) -> bool:
+        """Store front-end results for a key"""
+        try:
+            data = pickle.dumps(entry, protocol=PICKLE_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError):
+            return False
+        return self._write(self.cache_dir / f"{key}.pkl", data)
+
+    def load_ir(self, key: str, optimization_level: int) -> Optional[str]:
+        """Load cached LLVM IR for a key and optimization level"""
+        data = self._read(self.cache_dir / f"{key}-O{optimization_level}.ll")
+        if data is None:
+            return None
+        return data.decode('utf-8')
+
+    def load_ir_file(self, key: str, optimization_level: int, ir_path: Path) -> bool:
+        """Copy cached LLVM IR to ir_path, returning False on a miss"""
+        try:
+            shutil.copyfile(self.cache_dir / f"{key}-O{optimization_level}.ll", ir_path)
+            return True
+        except OSError:
+            return False
+
+    def store_ir(self, key: str, optimization_level: int, llvm_ir: Union[str, bytes]) -> bool:
+        """Store generated LLVM IR for a key and optimization level"""
+        if isinstance(llvm_ir, str):
+            llvm_ir = llvm_ir.encode('utf-8')
+        return self._write(self.cache_dir / f"{key}-O{optimization_level}.ll", llvm_ir)
+
+    def store_ir_file(self, key: str, optimization_level: int, ir_path: Path) -> bool:
+        """Store LLVM IR that was already written to disk"""
+        return self._replace(self.cache_dir / f"{key}-O{optimization_level}.ll",
+                             lambda tmp_path: shutil.copyfile(ir_path, tmp_path))
+
+    def _read(self, path: Path) -> Optional[bytes]:
+        """Read a cache entry, returning None on a miss"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write(self, path: Path, data: bytes) -> bool:
+        """Atomically write a cache entry"""
+        def fill(tmp_path: str) -> None:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+        return self._replace(path, fill)
+
+    def _replace(self, path: Path, fill: Callable[[str], Any]) -> bool:
+        """Atomically replace a cache entry with a temp file filled by fill"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.cache_dir), suffix='.tmp')
+            os.close(fd)
+            try:
+                fill(tmp_path)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            return True
+        except OSError:
+            return False
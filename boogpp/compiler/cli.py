@@ -4,10 +4,14 @@ Boogpp Compiler CLI
 Command-line interface for the Boogpp compiler.
 """
 
+import io
+import os
 import sys
+import mmap
 import argparse
+import contextlib
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Tuple, Dict, List
 
 # Version import: support running as part of the boogpp package (python -m boogpp.compiler)
 # and as a standalone package inside the repo (python -m compiler from boogpp directory).
@@ -19,9 +23,46 @@ except Exception:
 from .lexer import tokenize, LexerError
 from .parser import parse, ParseError
 from .safety import check_safety, SafetyMode, SafetyViolation
-from .safety.enhanced_checker import check_safety_enhanced, EnhancedSafetyChecker
-from .typechecker import check_types, TypeChecker
-from .codegen import generate_code
+from .parser.ast_nodes import Program
+from .cache import CompilationCache, CACHE_DIR_NAME
+
+# Type checking, code generation, the process pool and llvmlite are only
+# imported by the stages that use them, so `version` and `check` stay fast
+if TYPE_CHECKING:
+    import subprocess
+
+
+_SAFETY_MAP = {
+    'safe': SafetyMode.SAFE,
+    'unsafe': SafetyMode.UNSAFE,
+    'custom': SafetyMode.CUSTOM,
+}
+
+_OUTPUT_TYPES = ('exe', 'dll', 'service', 'driver')
+
+# Write buffer for streamed LLVM IR
+IR_WRITE_BUFFER_SIZE = 1 << 20
+
+# Runtime support object, built next to the outputs that link against it
+RUNTIME_OBJ_NAME = 'boogpp_runtime.obj'
+
+
+def _load_source(path: Path) -> str:
+    """Read a UTF-8 source file through a read-only memory map"""
+    # Decoding straight from the mapping avoids holding a separate bytes
+    # copy of the file alongside the decoded text
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        if os.fstat(fd).st_size == 0:
+            return ""
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            source = str(mm, 'utf-8')
+    finally:
+        os.close(fd)
+    # Match text-mode reads, which translate platform newlines
+    if '\r' in source:
+        source = source.replace('\r\n', '\n').replace('\r', '\n')
+    return source
 
 
 class CompilerError(Exception):
@@ -32,37 +73,31 @@ class CompilerError(Exception):
 class BoogppCompiler:
     """Boogpp compiler"""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, use_cache: bool = True, jobs: int = 1,
+                 build_runtime: bool = True):
         self.verbose = verbose
+        self.use_cache = use_cache
+        self.jobs = jobs
+        # Batch builds compile the runtime object once up front, so their
+        # workers only link against it
+        self.build_runtime = build_runtime
 
     def log(self, message: str) -> None:
         """Log message if verbose mode is enabled"""
         if self.verbose:
             print(f"[Boogpp] {message}")
 
-    def compile_file(
+    def _run_frontend(
         self,
+        source_code: str,
         input_file: Path,
-        output_file: Optional[Path] = None,
-        safety_mode: SafetyMode = SafetyMode.SAFE,
-        optimization_level: int = 0,
-        output_type: str = "exe",
-        link: bool = False
-    ) -> bool:
-        """Compile a Boogpp source file"""
-
-        self.log(f"Compiling {input_file}...")
+        safety_mode: SafetyMode
+    ) -> Optional[Tuple[int, Program, Dict, List[SafetyViolation], Optional[str]]]:
+        """Run lexing, parsing, safety and type checking; returns None on failure.
 
-        # Read source file
-        try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                source_code = f.read()
-        except FileNotFoundError:
-            print(f"Error: File not found: {input_file}", file=sys.stderr)
-            return False
-        except Exception as e:
-            print(f"Error reading file: {e}", file=sys.stderr)
-            return False
+        When declarations are analyzed in parallel, the LLVM IR is produced
+        by the same workers and returned as the last element.
+        """
 
         # Lexical analysis
         self.log("Lexical analysis...")
@@ -70,7 +105,7 @@ class BoogppCompiler:
             tokens = tokenize(source_code, str(input_file))
         except LexerError as e:
             print(f"Lexer error: {e}", file=sys.stderr)
-            return False
+            return None
 
         self.log(f"Generated {len(tokens)} tokens")
 
@@ -80,57 +115,183 @@ class BoogppCompiler:
             ast = parse(tokens)
         except ParseError as e:
             print(f"Parser error: {e}", file=sys.stderr)
-            return False
+            return None
 
         self.log("AST generated successfully")
 
+        # Analyze declarations in parallel when it pays off
+        parallel_result = None
+        if self.jobs > 1:
+            from concurrent.futures.process import BrokenProcessPool
+            from .parallel import analyze_parallel, PARALLEL_MIN_DECLS
+
+            if len(ast.declarations) >= PARALLEL_MIN_DECLS:
+                self.log(f"Analyzing {len(ast.declarations)} declarations with {self.jobs} jobs...")
+                try:
+                    parallel_result = analyze_parallel(ast, str(input_file.stem), safety_mode, self.jobs)
+                except (OSError, BrokenProcessPool) as e:
+                    self.log(f"Parallel analysis unavailable ({e}), falling back to serial")
+
         # Safety checking
         self.log(f"Safety checking (mode: {safety_mode.name})...")
-        violations = check_safety(ast, safety_mode)
+        if parallel_result:
+            violations = parallel_result.violations
+        else:
+            violations = check_safety(ast, safety_mode)
 
         # Report violations
         errors = [v for v in violations if v.severity == "error"]
         warnings = [v for v in violations if v.severity == "warning"]
 
-        for warning in warnings:
-            print(f"Warning: {warning}", file=sys.stderr)
+        _report("Warning", warnings)
 
         if errors:
-            for error in errors:
-                print(f"Error: {error}", file=sys.stderr)
+            _report("Error", errors)
             print(f"\nCompilation failed with {len(errors)} error(s)", file=sys.stderr)
-            return False
+            return None
 
         self.log("Safety checks passed")
 
         # Type checking
         self.log("Type checking...")
-        type_checker = TypeChecker()
-        type_errors = type_checker.check_program(ast)
+        if parallel_result:
+            type_errors = parallel_result.type_errors
+            type_annotations = parallel_result.type_annotations
+        else:
+            from .typechecker import TypeChecker
+            type_checker = TypeChecker()
+            type_errors = type_checker.check_program(ast)
+            type_annotations = type_checker.type_annotations
 
         # Report type errors
         if type_errors:
-            for error in type_errors:
-                print(f"Type Error: {error}", file=sys.stderr)
+            _report("Type Error", type_errors)
             print(f"\nCompilation failed with {len(type_errors)} type error(s)", file=sys.stderr)
-            return False
+            return None
 
         self.log("Type checking passed")
 
+        llvm_ir = parallel_result.llvm_ir if parallel_result else None
+        return len(tokens), ast, type_annotations, warnings, llvm_ir
+
+    @staticmethod
+    def _runtime_obj_is_fresh(runtime_obj: Path, runtime_c: Path, runtime_inc: Path) -> bool:
+        """Check whether the runtime object is newer than its sources"""
+        try:
+            obj_mtime = runtime_obj.stat().st_mtime
+            sources = [runtime_c, *runtime_inc.glob('*.h')]
+            return all(src.stat().st_mtime <= obj_mtime for src in sources)
+        except OSError:
+            return False
+
+    def _start_runtime_build(self, clang_path: str, output_dir: Path) -> Tuple[Optional[Path], Optional['subprocess.Popen[str]']]:
+        """Start compiling the runtime support object into output_dir unless it is up to date.
+
+        Returns the object path (None if there is no runtime) and the clang
+        process, if one was started.
+        """
+        runtime_obj = None
+        runtime_proc = None
+        try:
+            pkg_root = Path(__file__).resolve().parents[1]
+            runtime_c = pkg_root / 'runtime' / 'src' / 'boogpp_runtime.c'
+            runtime_inc = pkg_root / 'runtime' / 'include'
+            if runtime_c.exists():
+                runtime_obj = output_dir / RUNTIME_OBJ_NAME
+                if self._runtime_obj_is_fresh(runtime_obj, runtime_c, runtime_inc):
+                    self.log(f"Runtime support object is up to date: {runtime_obj}")
+                else:
+                    print(f"Compiling runtime support: {runtime_c} -> {runtime_obj}")
+                    runtime_proc = _spawn_tool([clang_path, '-c', str(runtime_c), '-I', str(runtime_inc), '-o', str(runtime_obj)])
+        except Exception as e:
+            print(f'Warning: error compiling runtime support: {e}')
+            runtime_obj = None
+        return runtime_obj, runtime_proc
+
+    @staticmethod
+    def _finish_runtime_build(runtime_obj: Optional[Path],
+                              runtime_proc: Optional['subprocess.Popen[str]']) -> Optional[Path]:
+        """Wait for a runtime build started by _start_runtime_build; returns the usable object"""
+        if runtime_proc is not None and _wait_tool(runtime_proc) != 0:
+            print('Warning: failed to compile runtime support object; proceeding without it.')
+            # Drop any partial output so it is not mistaken for a fresh object
+            if runtime_obj is not None:
+                runtime_obj.unlink(missing_ok=True)
+            return None
+        return runtime_obj
+
+    def compile_file(
+        self,
+        input_file: Path,
+        output_file: Optional[Path] = None,
+        safety_mode: SafetyMode = SafetyMode.SAFE,
+        optimization_level: int = 0,
+        output_type: str = "exe",
+        link: bool = False
+    ) -> bool:
+        """Compile a Boogpp source file"""
+
+        self.log(f"Compiling {input_file}...")
+
+        # Read source file
+        try:
+            source_code = _load_source(input_file)
+        except FileNotFoundError:
+            print(f"Error: File not found: {input_file}", file=sys.stderr)
+            return False
+        except Exception as e:
+            print(f"Error reading file: {e}", file=sys.stderr)
+            return False
+
         # Determine output file
         if output_file is None:
             output_file = input_file.with_suffix(f".{output_type}")
 
+        # Look up cached front-end results for unchanged sources
+        cache = None
+        cache_key = None
+        if self.use_cache:
+            cache = CompilationCache(output_file.parent / CACHE_DIR_NAME, __version__)
+            cache_key = cache.make_key(source_code, str(input_file), safety_mode.name)
+
+        llvm_ir = None
+        cached = cache.load_frontend(cache_key) if cache else None
+        if cached is not None:
+            token_count, ast, type_annotations, warnings = cached
+            self.log("Front-end cache hit, skipping analysis")
+            _report("Warning", warnings)
+        else:
+            frontend = self._run_frontend(source_code, input_file, safety_mode)
+            if frontend is None:
+                return False
+            token_count, ast, type_annotations, warnings, llvm_ir = frontend
+            if cache and cache.store_frontend(cache_key, frontend[:4]):
+                self.log("Front-end results cached")
+
         # Code generation
         self.log(f"Code generation (optimization level: O{optimization_level})...")
+        llvm_file = output_file.with_suffix('.ll')
         try:
-            llvm_ir = generate_code(ast, str(input_file.stem), type_checker.type_annotations)
-            self.log("LLVM IR generated successfully")
-
-            # Write LLVM IR to file
-            llvm_file = output_file.with_suffix('.ll')
-            with open(llvm_file, 'w', encoding='utf-8') as f:
-                f.write(llvm_ir)
+            if llvm_ir is not None:
+                self.log("LLVM IR generated by parallel workers")
+                with open(llvm_file, 'wb') as f:
+                    f.write(llvm_ir)
+                if cache:
+                    cache.store_ir(cache_key, optimization_level, llvm_ir)
+            elif cache and cache.load_ir_file(cache_key, optimization_level, llvm_file):
+                self.log("LLVM IR cache hit, skipping code generation")
+            else:
+                from .codegen import generate_code
+                try:
+                    with open(llvm_file, 'wb', buffering=IR_WRITE_BUFFER_SIZE) as f:
+                        generate_code(ast, str(input_file.stem), type_annotations, out=f)
+                except BaseException:
+                    # Do not leave a truncated module behind for llc to pick up
+                    llvm_file.unlink(missing_ok=True)
+                    raise
+                self.log("LLVM IR generated successfully")
+                if cache:
+                    cache.store_ir_file(cache_key, optimization_level, llvm_file)
             self.log(f"LLVM IR written to {llvm_file}")
 
         except Exception as e:
@@ -142,47 +303,47 @@ class BoogppCompiler:
 
         # Optionally attempt to link using llc + clang if requested
         if link:
-            import shutil
-            import subprocess
-
-            llc_path = shutil.which('llc')
-            clang_path = shutil.which('clang')
-
-            # If clang/llc are not on PATH, try some common install locations
-            common_clang = [
-                Path("C:/Program Files/LLVM/bin/clang.exe"),
-                Path("C:/Program Files (x86)/LLVM/bin/clang.exe"),
-            ]
-            common_llc = [
-                Path("C:/Program Files/LLVM/bin/llc.exe"),
-                Path("C:/Program Files (x86)/LLVM/bin/llc.exe"),
-            ]
-            if not clang_path:
-                for c in common_clang:
-                    if c.exists():
-                        clang_path = str(c)
-                        print(f"Found clang at {clang_path}")
-                        break
-            if not llc_path:
-                for c in common_llc:
-                    if c.exists():
-                        llc_path = str(c)
-                        print(f"Found llc at {llc_path}")
-                        break
+            from .codegen.object_emitter import emit_object, llvmlite_available
+            from .toolchain import find_toolchain
+
+            toolchain = find_toolchain()
+            llc_path = toolchain['llc']
+            clang_path = toolchain['clang']
+            self.log(f"Toolchain: clang={clang_path}, llc={llc_path}")
 
             if not clang_path:
                 print('Linking requested but clang not found on PATH. Skipping linking.')
             else:
+                # The IR object and the runtime object do not depend on each
+                # other, so the runtime compile is started before the IR is
+                # lowered and waited on afterwards
+
+                # Compile BoogPP runtime C support library into an object (if available)
+                if self.build_runtime:
+                    runtime_obj, runtime_proc = self._start_runtime_build(clang_path, output_file.parent)
+                else:
+                    runtime_obj, runtime_proc = output_file.with_name(RUNTIME_OBJ_NAME), None
+
                 obj_file = output_file.with_suffix('.obj')
-                # Prefer llc if available, otherwise try clang to compile IR directly
-                if llc_path:
+                obj_proc = None
+                emitted = False
+                # Prefer emitting the object in-process, which avoids
+                # starting llc only to re-parse the IR text
+                if llvmlite_available():
+                    try:
+                        emit_object(llvm_file, obj_file, optimization_level)
+                        emitted = True
+                        self.log(f"Object emitted in-process with llvmlite: {obj_file}")
+                    except Exception as e:
+                        print(f'In-process object emission failed ({e}); falling back to external tools.')
+                # Otherwise prefer llc if available, or try clang to compile IR directly
+                if emitted:
+                    pass
+                elif llc_path:
                     print(f"Running llc to produce object: {obj_file}...")
                     try:
-                        r = subprocess.run([llc_path, '-filetype=obj', '-o', str(obj_file), str(llvm_file)], check=False)
-                        if r.returncode != 0:
-                            print('llc failed to produce object file. Skipping linking.')
-                            obj_file = None
-                        
+                        obj_proc = _spawn_tool([llc_path, f'-O{optimization_level}', '-filetype=obj',
+                                          '-o', str(obj_file), str(llvm_file)])
                     except Exception as e:
                         print(f'Error running llc: {e}')
                         obj_file = None
@@ -190,30 +351,20 @@ class BoogppCompiler:
                     # Use clang to compile LLVM IR to object
                     print(f"llc not found; using clang to compile IR to object: {obj_file}...")
                     try:
-                        r = subprocess.run([clang_path, '-c', str(llvm_file), '-o', str(obj_file)], check=False)
-                        if r.returncode != 0:
-                            print('clang failed to compile LLVM IR to object. Skipping linking.')
-                            obj_file = None
+                        obj_proc = _spawn_tool([clang_path, f'-O{optimization_level}', '-c', str(llvm_file),
+                                          '-o', str(obj_file)])
                     except Exception as e:
                         print(f'Error running clang on IR: {e}')
                         obj_file = None
 
-                # Compile BoogPP runtime C support library into an object (if available)
-                runtime_obj = None
-                try:
-                    pkg_root = Path(__file__).resolve().parents[1]
-                    runtime_c = pkg_root / 'runtime' / 'src' / 'boogpp_runtime.c'
-                    runtime_inc = pkg_root / 'runtime' / 'include'
-                    if runtime_c.exists():
-                        runtime_obj = output_file.with_name('boogpp_runtime.obj')
-                        print(f"Compiling runtime support: {runtime_c} -> {runtime_obj}")
-                        rrt = subprocess.run([clang_path, '-c', str(runtime_c), '-I', str(runtime_inc), '-o', str(runtime_obj)], check=False)
-                        if rrt.returncode != 0:
-                            print('Warning: failed to compile runtime support object; proceeding without it.')
-                            runtime_obj = None
-                except Exception as e:
-                    print(f'Warning: error compiling runtime support: {e}')
-                    runtime_obj = None
+                if obj_proc is not None and _wait_tool(obj_proc) != 0:
+                    if llc_path:
+                        print('llc failed to produce object file. Skipping linking.')
+                    else:
+                        print('clang failed to compile LLVM IR to object. Skipping linking.')
+                    obj_file = None
+
+                runtime_obj = self._finish_runtime_build(runtime_obj, runtime_proc)
 
                 # If we have an object file, link it (include runtime object if compiled)
                 if obj_file and obj_file.exists():
@@ -224,15 +375,10 @@ class BoogppCompiler:
                             link_cmd.append(str(runtime_obj))
                         # Prefer console subsystem for visibility
                         link_cmd.append('-Wl,/subsystem:console')
-                        r2 = subprocess.run(link_cmd, check=False)
-                        if r2.returncode != 0:
+                        if _run_tool(link_cmd) != 0:
                             print('clang failed to link object file into executable.')
                             # Try using lld-link (if available) as a fallback
-                            lld_link = shutil.which('lld-link')
-                            if not lld_link:
-                                cand = Path('C:/Program Files/LLVM/bin/lld-link.exe')
-                                if cand.exists():
-                                    lld_link = str(cand)
+                            lld_link = toolchain['lld-link']
                             if lld_link:
                                 try:
                                     print(f"Trying lld-link -> {lld_link}")
@@ -240,8 +386,7 @@ class BoogppCompiler:
                                     if runtime_obj and Path(runtime_obj).exists():
                                         lld_cmd.append(str(runtime_obj))
                                     lld_cmd.append(f"-out:{str(output_file)}")
-                                    r3 = subprocess.run(lld_cmd, check=False)
-                                    if r3.returncode == 0:
+                                    if _run_tool(lld_cmd) == 0:
                                         print(f'\u2713 Native binary created with lld-link: {output_file}')
                                     else:
                                         print('lld-link failed to link the object file.')
@@ -260,7 +405,7 @@ class BoogppCompiler:
         print(f"  LLVM IR: {output_file.with_suffix('.ll') if output_file else 'not generated'}")
         print(f"  Safety: {safety_mode.name}")
         print(f"  Type: {output_type}")
-        print(f"  Tokens: {len(tokens)}")
+        print(f"  Tokens: {token_count}")
         print(f"  Optimization: O{optimization_level}")
 
         if warnings:
@@ -271,6 +416,127 @@ class BoogppCompiler:
         return True
 
 
+def _report(label: str, diagnostics: List, stream=None) -> None:
+    """Write a group of diagnostics with a single write call"""
+    if diagnostics:
+        # Resolved at call time so redirected streams (batch builds) are honoured
+        stream = stream or sys.stderr
+        stream.write(''.join(f"{label}: {diagnostic}\n" for diagnostic in diagnostics))
+
+
+def _spawn_tool(cmd: List[str]) -> 'subprocess.Popen[str]':
+    """Start an external tool with its output piped back for _wait_tool"""
+    import subprocess
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, errors='replace')
+
+
+def _wait_tool(proc: 'subprocess.Popen[str]') -> int:
+    """Wait for a tool started by _spawn_tool, forwarding its output to sys.stdout"""
+    # Written through sys.stdout so batch builds capture it with the rest of
+    # the file's output instead of it reaching the terminal out of order
+    output, _ = proc.communicate()
+    if output:
+        sys.stdout.write(output)
+    return proc.returncode
+
+
+def _run_tool(cmd: List[str]) -> int:
+    """Run an external tool to completion, returning its exit code"""
+    return _wait_tool(_spawn_tool(cmd))
+
+
+def _parse_safety_mode(value: str) -> SafetyMode:
+    """Convert a --safety argument to a SafetyMode"""
+    try:
+        return _SAFETY_MAP[value]
+    except KeyError:
+        raise argparse.ArgumentTypeError(
+            f"invalid choice: {value!r} (choose from {', '.join(_SAFETY_MAP)})")
+
+
+def _resolve_input(name: str) -> Path:
+    """Resolve an input path, falling back to locations inside the package"""
+    input_file = Path(name)
+
+    # If the input file doesn't exist as given, try locating it inside the package
+    if not input_file.exists():
+        pkg_root = Path(__file__).resolve().parents[1]
+        candidates = [
+            pkg_root / name,
+            pkg_root / 'examples' / name,
+            pkg_root / 'tests' / name,
+        ]
+        for cand in candidates:
+            if cand.exists():
+                print(f"[boogpp] Resolved input path to {cand}")
+                input_file = cand
+                break
+
+    return input_file
+
+
+def _build_captured(options: Dict, build_args: Tuple) -> Tuple[bool, str]:
+    """Compile one file of a batch, capturing its console output"""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        try:
+            success = BoogppCompiler(**options).compile_file(*build_args)
+        except Exception as e:
+            print(f"Internal compiler error: {e}")
+            success = False
+    return success, buffer.getvalue()
+
+
+def _build_runtime_objects(output_dirs: List[Path], verbose: bool) -> None:
+    """Build the runtime support object for each output directory of a batch"""
+    from .toolchain import find_toolchain
+
+    # Without clang the workers report that linking is skipped
+    clang_path = find_toolchain()['clang']
+    if not clang_path:
+        return
+    compiler = BoogppCompiler(verbose=verbose)
+    started = [compiler._start_runtime_build(clang_path, output_dir) for output_dir in output_dirs]
+    for runtime_obj, runtime_proc in started:
+        compiler._finish_runtime_build(runtime_obj, runtime_proc)
+
+
+def _build_batch(input_files: List[Path], safety_mode: SafetyMode, args) -> int:
+    """Compile several files in one process pool, reporting in input order"""
+    options = {'verbose': args.verbose, 'use_cache': not args.no_cache}
+    if args.link:
+        # Files sharing an output directory share its runtime object; building
+        # it here keeps the workers from compiling over each other's copy
+        _build_runtime_objects(sorted({f.parent for f in input_files}), args.verbose)
+        options['build_runtime'] = False
+    builds = [(input_file, None, safety_mode, args.optimization, args.type, args.link)
+              for input_file in input_files]
+    workers = args.jobs if args.jobs > 1 else (os.cpu_count() or 1)
+    workers = min(workers, len(builds))
+
+    results = None
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        from concurrent.futures.process import BrokenProcessPool
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_build_captured, [options] * len(builds), builds))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"Warning: parallel build unavailable ({e}); building serially", file=sys.stderr)
+    if results is None:
+        results = [_build_captured(options, build) for build in builds]
+
+    succeeded = 0
+    for input_file, (success, output) in zip(input_files, results):
+        print(f"==> {input_file}")
+        print(output, end='')
+        succeeded += success
+
+    print(f"\nBuilt {succeeded}/{len(builds)} file(s)")
+    return 0 if succeeded == len(builds) else 1
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -283,6 +549,7 @@ Examples:
   boogpp build service.bpp --type service   # Compile as Windows service
   boogpp build driver.bpp --type driver     # Compile as kernel driver
   boogpp build app.bpp --safety unsafe -O3  # Compile with UNSAFE mode and O3 optimization
+  boogpp build src/*.bpp                    # Compile several files in one invocation
 
 Output types:
   exe     - Executable (default)
@@ -295,18 +562,23 @@ Output types:
     subparsers = parser.add_subparsers(dest='command', help='Commands')
 
     # Build command
-    build_parser = subparsers.add_parser('build', help='Compile a Boogpp source file')
-    build_parser.add_argument('input', type=str, help='Input source file (.bpp)')
+    build_parser = subparsers.add_parser('build', help='Compile Boogpp source files')
+    build_parser.add_argument('input', type=str, nargs='+', help='Input source file(s) (.bpp)')
     build_parser.add_argument('-o', '--output', type=str, help='Output file name')
-    build_parser.add_argument('--type', choices=['exe', 'dll', 'service', 'driver'],
+    build_parser.add_argument('--type', choices=_OUTPUT_TYPES,
                              default='exe', help='Output type (default: exe)')
-    build_parser.add_argument('--safety', choices=['safe', 'unsafe', 'custom'],
-                             default='safe', help='Safety mode (default: safe)')
+    build_parser.add_argument('--safety', type=_parse_safety_mode, metavar='{safe,unsafe,custom}',
+                             default=SafetyMode.SAFE, help='Safety mode (default: safe)')
     build_parser.add_argument('-O', '--optimization', type=int, choices=[0, 1, 2, 3],
                              default=0, help='Optimization level (default: 0)')
     build_parser.add_argument('-v', '--verbose', action='store_true',
                              help='Verbose output')
     build_parser.add_argument('--link', action='store_true', help='Run llc+clang to produce native binary if available')
+    build_parser.add_argument('--no-cache', action='store_true',
+                             help='Disable the on-disk compilation cache')
+    build_parser.add_argument('-j', '--jobs', type=int, default=1,
+                             help='Parallel jobs: declarations of a single file, or files of a '
+                                  'batch build (default: 1, or one per CPU for batches)')
 
     # Version command
     version_parser = subparsers.add_parser('version', help='Show version information')
@@ -314,8 +586,8 @@ Output types:
     # Check command
     check_parser = subparsers.add_parser('check', help='Check syntax and safety without compiling')
     check_parser.add_argument('input', type=str, help='Input source file (.bpp)')
-    check_parser.add_argument('--safety', choices=['safe', 'unsafe', 'custom'],
-                             default='safe', help='Safety mode (default: safe)')
+    check_parser.add_argument('--safety', type=_parse_safety_mode, metavar='{safe,unsafe,custom}',
+                             default=SafetyMode.SAFE, help='Safety mode (default: safe)')
     check_parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
 
     args = parser.parse_args()
@@ -326,29 +598,21 @@ Output types:
         return 0
 
     elif args.command == 'build':
-        input_file = Path(args.input)
+        if args.output and len(args.input) > 1:
+            build_parser.error("-o/--output cannot be used with multiple inputs")
+
+        input_files = [_resolve_input(name) for name in args.input]
         output_file = Path(args.output) if args.output else None
 
-        # If the input file doesn't exist as given, try locating it inside the package
-        if not input_file.exists():
-            pkg_root = Path(__file__).resolve().parents[1]
-            candidates = [
-                pkg_root / args.input,
-                pkg_root / 'examples' / args.input,
-                pkg_root / 'tests' / args.input,
-            ]
-            for cand in candidates:
-                if cand.exists():
-                    print(f"[boogpp] Resolved input path to {cand}")
-                    input_file = cand
-                    break
-
-        # Convert safety mode string to enum
-        safety_mode = SafetyMode[args.safety.upper()]
+        safety_mode = args.safety
 
-        compiler = BoogppCompiler(verbose=args.verbose)
+        if len(input_files) > 1:
+            return _build_batch(input_files, safety_mode, args)
+
+        compiler = BoogppCompiler(verbose=args.verbose, use_cache=not args.no_cache,
+                                  jobs=args.jobs)
         success = compiler.compile_file(
-            input_file,
+            input_files[0],
             output_file,
             safety_mode,
             args.optimization,
@@ -359,29 +623,14 @@ Output types:
         return 0 if success else 1
 
     elif args.command == 'check':
-        input_file = Path(args.input)
-        safety_mode = SafetyMode[args.safety.upper()]
-
-        # If the input file doesn't exist as given, try locating it inside the package
-        if not input_file.exists():
-            pkg_root = Path(__file__).resolve().parents[1]
-            candidates = [
-                pkg_root / args.input,
-                pkg_root / 'examples' / args.input,
-                pkg_root / 'tests' / args.input,
-            ]
-            for cand in candidates:
-                if cand.exists():
-                    print(f"[boogpp] Resolved input path to {cand}")
-                    input_file = cand
-                    break
+        input_file = _resolve_input(args.input)
+        safety_mode = args.safety
 
         compiler = BoogppCompiler(verbose=args.verbose)
 
         # Read and parse file
         try:
-            with open(input_file, 'r', encoding='utf-8') as f:
-                source_code = f.read()
+            source_code = _load_source(input_file)
 
             tokens = tokenize(source_code, str(input_file))
             ast = parse(tokens)
@@ -390,11 +639,8 @@ Output types:
             errors = [v for v in violations if v.severity == "error"]
             warnings = [v for v in violations if v.severity == "warning"]
 
-            for warning in warnings:
-                print(f"Warning: {warning}")
-
-            for error in errors:
-                print(f"Error: {error}")
+            _report("Warning", warnings, sys.stdout)
+            _report("Error", errors, sys.stdout)
 
             if errors:
                 print(f"\n✗ Check failed with {len(errors)} error(s)")
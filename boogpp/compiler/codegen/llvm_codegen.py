@@ -3,27 +3,396 @@ Boogpp LLVM IR Code Generator
 Generates LLVM IR from the AST.
 """
 
-from typing import Optional, Dict, List, Any
-from ..parser.ast_nodes import *
-from ..typechecker.type_system import Type, TypeKind, PRIMITIVE_TYPES
+import operator
+import re
+from functools import lru_cache
+from typing import Optional, Dict, List, Set, Tuple, Any, BinaryIO, Callable
+# Every concrete node class is a leaf that nothing subclasses, so node kinds
+# are tested by type() identity rather than isinstance's MRO walk
+from ..parser.ast_nodes import (
+    ASTNode, Program, TypeNode, TypeName, TypePtr, TypeArray, TypeSlice, TypeTuple, TypeResult,
+    FunctionDecl, VariableDecl, StructDecl, Statement, Block, ReturnStmt, IfStmt, WhileStmt,
+    ForStmt, MatchStmt, ExprStmt, AssignStmt, PassStmt, BreakStmt, ContinueStmt, DeferStmt,
+    Expression, LiteralExpr, IdentifierExpr, BinaryExpr, UnaryExpr, CallExpr, MemberExpr,
+    IndexExpr, TupleExpr, ArrayExpr, TryChainExpr
+)
+from ..typechecker.type_system import Type, TypeKind, PRIMITIVE_TYPES, SIGNED_KINDS, FLOAT_KINDS
+from ..lexer.tokens import STATUS_CODES
+from .promotion import promotable_locals
 
 try:
-    from ..parser.ast_nodes import TryChainExpr
+    from mypy_extensions import mypyc_attr
 except ImportError:
-    TryChainExpr = None
-
-
+    # Only consulted by the optional mypyc build; see setup.py
+    def mypyc_attr(*attrs: str, **kwattrs: object) -> Callable[[Any], Any]:  # type: ignore[misc]
+        return lambda cls: cls
+
+
+# A fragment's string literal references, renumbered when fragments merge
+_STRING_REF = re.compile(rb'@\.str\.\d+')
+
+# How each byte appears inside an IR c"..." constant, which only understands
+# \XX escapes; printable ASCII other than the quote and backslash stays as is
+_IR_STRING_BYTES = [chr(b) if 0x20 <= b < 0x7f and b not in (0x22, 0x5c) else f"\\{b:02X}"
+                    for b in range(256)]
+
+
+@lru_cache(maxsize=4096)
+def _escape_string_constant(content: str) -> Tuple[str, int]:
+    """A string literal's escaped IR body and its byte length with the NUL"""
+    data = content.encode('utf-8')
+    return "".join([_IR_STRING_BYTES[b] for b in data]), len(data) + 1
+
+
+# Identifiers that generate as constants rather than loads
+_BUILTIN_CONSTANTS = {'SUCCESS': "0", 'true': "1", 'false': "0"}
+
+# Names bpp_status_string returns for the known codes, folded in at compile
+# time when the code is a constant
+_STATUS_NAMES: Dict[int, str] = {code: name for name, code in STATUS_CODES.items()}
+
+# LLVM types of the primitive kinds and type names; everything else is
+# compound and built recursively
+_PRIMITIVE_LLVM: Dict[TypeKind, str] = {
+    TypeKind.I8: 'i8', TypeKind.I16: 'i16', TypeKind.I32: 'i32', TypeKind.I64: 'i64',
+    TypeKind.U8: 'i8', TypeKind.U16: 'i16', TypeKind.U32: 'i32', TypeKind.U64: 'i64',
+    TypeKind.F32: 'float', TypeKind.F64: 'double',
+    TypeKind.BOOL: 'i1', TypeKind.CHAR: 'i8', TypeKind.STRING: 'i8*',
+    TypeKind.VOID: 'void', TypeKind.STATUS: 'i32', TypeKind.HANDLE: 'i64',
+}
+
+_PRIMITIVE_LLVM_NAMES: Dict[str, str] = {
+    'i8': 'i8', 'i16': 'i16', 'i32': 'i32', 'i64': 'i64',
+    'u8': 'i8', 'u16': 'i16', 'u32': 'i32', 'u64': 'i64',
+    'f32': 'float', 'f64': 'double',
+    'bool': 'i1', 'char': 'i8', 'string': 'i8*',
+    'void': 'void', 'status': 'i32', 'handle': 'i64',
+}
+
+# Target every module is generated for
+_TARGET_TRIPLE = "x86_64-pc-windows-msvc"
+
+# Header opening every module, keyed by module name and target triple
+_MODULE_HEADER = (
+    "; ModuleID = '%(name)s'\n"
+    'source_filename = "%(name)s.bpp"\n'
+    "\n"
+    'target triple = "%(triple)s"\n'
+    "\n"
+)
+
+# Runtime and C library declarations closing every module, in emitted form;
+# the module ends without a newline after its last line
+_STDLIB_DECLARATIONS = b"""
+; Boogpp Runtime Library Declarations
+
+declare i32 @bpp_runtime_init()
+declare void @bpp_runtime_cleanup()
+declare i8* @bpp_runtime_version()
+
+declare i8* @bpp_alloc(i64)
+declare void @bpp_free(i8*)
+declare i8* @bpp_realloc(i8*, i64)
+declare void @bpp_refcount_inc(i8*)
+declare void @bpp_refcount_dec(i8*)
+
+%bpp_string_t = type opaque
+declare %bpp_string_t* @bpp_string_new(i8*)
+declare %bpp_string_t* @bpp_string_with_capacity(i64)
+declare void @bpp_string_free(%bpp_string_t*)
+declare %bpp_string_t* @bpp_string_concat(%bpp_string_t*, %bpp_string_t*)
+declare i64 @bpp_string_length(%bpp_string_t*)
+declare i32 @bpp_string_compare(%bpp_string_t*, %bpp_string_t*)
+
+declare i32 @bpp_print(%bpp_string_t*)
+declare i32 @bpp_println(%bpp_string_t*)
+declare i32 @bpp_log(%bpp_string_t*)
+declare %bpp_string_t* @bpp_read_line()
+
+%bpp_array_t = type opaque
+declare %bpp_array_t* @bpp_array_new(i64, i64)
+declare void @bpp_array_free(%bpp_array_t*)
+declare i8* @bpp_array_get(%bpp_array_t*, i64)
+declare i32 @bpp_array_set(%bpp_array_t*, i64, i8*)
+
+%bpp_slice_t = type opaque
+declare %bpp_slice_t* @bpp_slice_new(%bpp_array_t*, i64, i64)
+declare void @bpp_slice_free(%bpp_slice_t*)
+
+declare void @bpp_sleep(i32)
+declare i64 @bpp_timestamp_ms()
+declare i8* @bpp_status_string(i32)
+
+; C Standard Library
+declare void @print(i8*)
+declare i8* @malloc(i64)
+declare void @free(i8*)"""
+
+# Function prologue and epilogue, shared by generate_function and the
+# templates below
+_FN_HEAD = "define %(ret)s %(name)s(%(params)s) {\n  entry:\n"
+_FN_END = "}\n"
+_FN_TAIL = "    %(default)s\n" + _FN_END
+_MAIN_PROLOGUE = "    call i32 @bpp_runtime_init()\n"
+
+# IR templates for function bodies that reduce to a single return, keyed by
+# the shape _emit_simple_fn() detects. Each renders exactly the text the
+# generic statement walk would emit for the same function; a body that ends
+# in a return gets no default return after it.
+
+_SIMPLE_FN_TEMPLATES: Dict[Any, str] = {
+    'pass': _FN_HEAD + _FN_TAIL,
+    'return_void': _FN_HEAD + "    ret void\n" + _FN_END,
+    'return_literal': _FN_HEAD + "    ret %(type)s %(value)s\n" + _FN_END,
+    'return_param': _FN_HEAD + (
+        "    %%1 = load %(type)s, %(type)s* %(value)s\n"
+        "    ret %(type)s %%1\n") + _FN_END,
+    ('binary', True, True): _FN_HEAD + (
+        "    %%1 = load %(ltype)s, %(ltype)s* %(left)s\n"
+        "    %%2 = load %(rtype)s, %(rtype)s* %(right)s\n"
+        "    %%3 = %(op)s %(ltype)s %%1, %%2\n"
+        "    ret %(type)s %%3\n") + _FN_END,
+    ('binary', True, False): _FN_HEAD + (
+        "    %%1 = load %(ltype)s, %(ltype)s* %(left)s\n"
+        "    %%2 = %(op)s %(ltype)s %%1, %(right)s\n"
+        "    ret %(type)s %%2\n") + _FN_END,
+    ('binary', False, True): _FN_HEAD + (
+        "    %%1 = load %(rtype)s, %(rtype)s* %(right)s\n"
+        "    %%2 = %(op)s %(ltype)s %(left)s, %%1\n"
+        "    ret %(type)s %%2\n") + _FN_END,
+    ('binary', False, False): _FN_HEAD + (
+        "    %%1 = %(op)s %(ltype)s %(left)s, %(right)s\n"
+        "    ret %(type)s %%1\n") + _FN_END,
+}
+
+# Instruction for each binary operator by operand category: float, signed
+# integer, or anything else. Bitwise operators, shifts and % on floats fall
+# back to the integer instructions.
+_BINARY_OPCODE_ROWS: Dict[str, Tuple[str, str, str]] = {
+    '+': ('fadd', 'add', 'add'),
+    '-': ('fsub', 'sub', 'sub'),
+    '*': ('fmul', 'mul', 'mul'),
+    '/': ('fdiv', 'sdiv', 'udiv'),
+    '%': ('urem', 'srem', 'urem'),
+    '==': ('fcmp oeq', 'icmp eq', 'icmp eq'),
+    '!=': ('fcmp one', 'icmp ne', 'icmp ne'),
+    '<': ('fcmp olt', 'icmp slt', 'icmp ult'),
+    '>': ('fcmp ogt', 'icmp sgt', 'icmp ugt'),
+    '<=': ('fcmp ole', 'icmp sle', 'icmp ule'),
+    '>=': ('fcmp oge', 'icmp sge', 'icmp uge'),
+    '&': ('and', 'and', 'and'),
+    '|': ('or', 'or', 'or'),
+    '^': ('xor', 'xor', 'xor'),
+    '<<': ('shl', 'shl', 'shl'),
+    '>>': ('lshr', 'ashr', 'lshr'),
+}
+
+_BINARY_OPCODES: Dict[Tuple[str, str], str] = {
+    (operator, category): opcode
+    for operator, row in _BINARY_OPCODE_ROWS.items()
+    for category, opcode in zip('fsu', row)
+}
+
+_LOGICAL_OPCODES = {'and': 'and', 'or': 'or'}
+
+
+# Opcode category of each kind: 'f' (float), 's' (signed integer), else 'u'
+_TYPE_CATEGORIES: Dict[TypeKind, str] = {
+    **{kind: 'f' for kind in FLOAT_KINDS},
+    **{kind: 's' for kind in SIGNED_KINDS},
+}
+
+
+def _type_category(typ: Type) -> str:
+    """Classify a type as 'f' (float), 's' (signed integer) or 'u' (other)"""
+    return _TYPE_CATEGORIES.get(typ.kind, 'u')
+
+
+# Width and signedness of the integer kinds that constants are folded in
+_INTEGER_KINDS: Dict[TypeKind, Tuple[int, bool]] = {
+    TypeKind.I8: (8, True), TypeKind.I16: (16, True), TypeKind.I32: (32, True), TypeKind.I64: (64, True),
+    TypeKind.U8: (8, False), TypeKind.U16: (16, False), TypeKind.U32: (32, False), TypeKind.U64: (64, False),
+}
+
+_COMPARISONS = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt,
+    '>': operator.gt, '<=': operator.le, '>=': operator.ge,
+}
+
+_WRAPPING_OPS = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '&': operator.and_, '|': operator.or_, '^': operator.xor,
+}
+
+
+def _integer_constant(text: str) -> Optional[int]:
+    """The value of an operand that generated as an integer constant, if it did"""
+    if not text or text[0] in '%@':
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _wrap(value: int, bits: int, signed: bool) -> int:
+    """Reduce a value to a bits-wide integer with the given signedness"""
+    value &= (1 << bits) - 1
+    if signed and value >> (bits - 1):
+        value -= 1 << bits
+    return value
+
+
+def _fold_binary(op: str, typ: Type, left: str, right: str) -> Optional[str]:
+    """Evaluate an integer operation on two constant operands, or None if it cannot be folded
+
+    Folding follows LLVM semantics: results wrap to the operand width, and
+    division truncates toward zero. Operations LLVM leaves undefined
+    (division by zero, signed overflow in division, oversized shifts) are
+    left for the emitted instruction.
+    """
+    integer = _INTEGER_KINDS.get(typ.kind)
+    if integer is None:
+        return None
+    a = _integer_constant(left)
+    b = _integer_constant(right)
+    if a is None or b is None:
+        return None
+
+    bits, signed = integer
+    a = _wrap(a, bits, signed)
+    b = _wrap(b, bits, signed)
+
+    if op in _COMPARISONS:
+        return "1" if _COMPARISONS[op](a, b) else "0"
+    if op in _WRAPPING_OPS:
+        result = _WRAPPING_OPS[op](a, b)
+    elif op in ('<<', '>>'):
+        if not 0 <= b < bits:
+            return None
+        result = a << b if op == '<<' else a >> b
+    elif op in ('/', '%'):
+        if b == 0 or (signed and a == -(1 << (bits - 1)) and b == -1):
+            return None
+        quotient = abs(a) // abs(b)
+        if (a < 0) != (b < 0):
+            quotient = -quotient
+        result = quotient if op == '/' else a - b * quotient
+    else:
+        return None
+
+    # Emitted as the two's complement spelling, which LLVM accepts for any width
+    return str(_wrap(result, bits, True))
+
+
+# Integer identities with one constant operand, keyed by (operator, constant,
+# constant is the right operand); the constant is taken unsigned, with -1
+# standing for all ones. 'x' means the result is the other operand
+_SIMPLIFICATIONS: Dict[Tuple[str, int, bool], str] = {
+    ('+', 0, True): 'x', ('+', 0, False): 'x',
+    ('-', 0, True): 'x',
+    ('*', 1, True): 'x', ('*', 1, False): 'x',
+    ('*', 0, True): '0', ('*', 0, False): '0',
+    ('/', 1, True): 'x',
+    ('%', 1, True): '0',
+    ('&', 0, True): '0', ('&', 0, False): '0',
+    ('&', -1, True): 'x', ('&', -1, False): 'x',
+    ('|', 0, True): 'x', ('|', 0, False): 'x',
+    ('^', 0, True): 'x', ('^', 0, False): 'x',
+    ('<<', 0, True): 'x', ('>>', 0, True): 'x',
+}
+
+
+def _simplify_binary(op: str, typ: Type, left: str, right: str) -> Optional[str]:
+    """The result of an integer operation an identity decides from one constant operand, if any"""
+    integer = _INTEGER_KINDS.get(typ.kind)
+    if integer is None:
+        return None
+    mask = (1 << integer[0]) - 1
+    for constant, other, on_right in ((right, left, True), (left, right, False)):
+        value = _integer_constant(constant)
+        if value is None:
+            continue
+        value &= mask
+        result = _SIMPLIFICATIONS.get((op, -1 if value == mask else value, on_right))
+        if result is not None:
+            return other if result == 'x' else result
+    return None
+
+
+def _fold_unary(op: str, typ: Type, operand: str) -> Optional[str]:
+    """Evaluate a unary operation on a constant operand, or None if it cannot be folded"""
+    if op == 'not':
+        return {"1": "0", "0": "1"}.get(operand)
+    integer = _INTEGER_KINDS.get(typ.kind)
+    value = _integer_constant(operand)
+    if integer is None or value is None:
+        return None
+    bits, signed = integer
+    value = _wrap(value, bits, signed)
+    if op == '-':
+        return str(_wrap(-value, bits, True))
+    if op == '~':
+        return str(_wrap(~value, bits, True))
+    return None
+
+
+def _reduce_strength(op: str, typ: Type, right: str) -> Optional[Tuple[str, str]]:
+    """A cheaper (opcode, right operand) for arithmetic by a power of two, if one applies"""
+    integer = _INTEGER_KINDS.get(typ.kind)
+    value = _integer_constant(right)
+    if integer is None or value is None or value <= 1 or value & (value - 1):
+        return None
+
+    bits, signed = integer
+    if value >= 1 << (bits - 1 if signed else bits):
+        return None
+    shift = value.bit_length() - 1
+    if op == '*':
+        return ('shl', str(shift))
+    if not signed:
+        # Signed division rounds toward zero, so only unsigned maps onto shifts and masks
+        if op == '/':
+            return ('lshr', str(shift))
+        if op == '%':
+            return ('and', str(value - 1))
+    return None
+
+
+# Instance attributes of LLVMCodeGenerator. Slot access is an array index
+# rather than an instance-dict lookup; subclasses that add their own still
+# get a __dict__
+_GENERATOR_SLOTS = (
+    'module_name', 'output', 'indent_level', '_indent_bytes', 'out',
+    'global_symbols', 'local_symbols', 'ssa_locals', 'ssa_values', 'functions',
+    'next_register', 'next_label', 'next_string',
+    'current_function', 'current_function_return_type', 'loop_labels',
+    'block_terminated',
+    'string_literals', 'type_annotations', '_llvm_type_cache', '_last_store',
+)
+
+
+@mypyc_attr(allow_interpreted_subclasses=True)
 class LLVMCodeGenerator:
     """Generates LLVM IR code from AST"""
 
+    __slots__ = _GENERATOR_SLOTS
+
     def __init__(self, module_name: str = "main"):
         self.module_name = module_name
-        self.output = []
+        # Emitted lines, each UTF-8 encoded and newline-terminated
+        self.output = bytearray()
         self.indent_level = 0
+        self._indent_bytes = b""
+
+        # Destination when streaming; None collects the whole module in memory
+        self.out: Optional[BinaryIO] = None
 
         # Symbol tables
         self.global_symbols: Dict[str, str] = {}  # name -> LLVM identifier
         self.local_symbols: Dict[str, str] = {}   # name -> LLVM identifier
+        self.ssa_locals: Set[str] = set()         # locals kept in registers
+        self.ssa_values: Dict[str, str] = {}      # promoted name -> value
         self.functions: Dict[str, Dict] = {}      # function name -> metadata
 
         # Register allocation
@@ -32,63 +401,134 @@ class LLVMCodeGenerator:
         self.next_string = 1
 
         # Current function context
-        self.current_function = None
-        self.current_function_return_type = None
+        self.current_function: Optional[str] = None
+        self.current_function_return_type: Optional[str] = None
+        self.loop_labels: List[Tuple[str, str]] = []  # (break, continue) targets, innermost last
+        # Set once the current basic block ends in ret or br, cleared by the
+        # next label; a block takes exactly one terminator, so fallthrough
+        # branches and statements after the terminator are not emitted
+        self.block_terminated = False
 
         # String literals
-        self.string_literals: Dict[str, str] = {}  # content -> global name
+        self.string_literals: Dict[str, Tuple[str, int]] = {}  # content -> (global name, length with NUL)
 
         # Type annotations from type checker
         self.type_annotations: Dict[ASTNode, Type] = {}
 
-    def generate(self, program: Program, type_annotations: Optional[Dict[ASTNode, Type]] = None) -> str:
-        """Generate LLVM IR for a program"""
-        self.output = []
+        # (output length after it, slot, LLVM type, value) of the newest store;
+        # a load of that slot emitted right after it reads the value instead
+        self._last_store: Optional[Tuple[int, str, str, str]] = None
+
+        # Compound Type/TypeNode -> LLVM type, keyed by id(); see _cached_llvm_type
+        self._llvm_type_cache: Dict[int, Tuple[Any, str]] = {}
+
+    def __getstate__(self) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """Pickle without the type cache, whose id() keys do not survive the copy"""
+        slots = {name: getattr(self, name) for name in _GENERATOR_SLOTS if hasattr(self, name)}
+        slots['_llvm_type_cache'] = {}
+        return getattr(self, '__dict__', None), slots
+
+    def generate(self, program: Program, type_annotations: Optional[Dict[ASTNode, Type]] = None,
+                 out: Optional[BinaryIO] = None) -> Optional[str]:
+        """Generate LLVM IR for a program, returning it or writing it to binary stream out"""
+        self.output = bytearray()
         self.type_annotations = type_annotations or {}
+        self.out = out
 
-        # Emit module header
-        self._emit(f"; ModuleID = '{self.module_name}'")
-        self._emit(f'source_filename = "{self.module_name}.bpp"')
-        self._emit('')
+        self.begin_module(program)
+        self._flush()
 
-        # Emit target triple
-        self._emit('target triple = "x86_64-pc-windows-msvc"')
-        self._emit('')
+        # Generate function definitions
+        for decl in program.declarations:
+            self.generate_declaration(decl)
+            self._flush()
+
+        return self.end_module()
+
+    def begin_module(self, program: Program) -> None:
+        """Emit the module header and register functions for forward references"""
+        header = _MODULE_HEADER % {'name': self.module_name, 'triple': _TARGET_TRIPLE}
+        self.output += header.encode('utf-8')
 
         # Generate declarations first
         for decl in program.declarations:
-            if isinstance(decl, FunctionDecl):
+            if type(decl) is FunctionDecl:
                 self._register_function(decl)
 
-        # Generate function definitions
-        for decl in program.declarations:
-            if isinstance(decl, FunctionDecl):
-                self.generate_function(decl)
-            elif isinstance(decl, StructDecl):
-                self.generate_struct(decl)
+    def generate_declaration(self, decl: ASTNode) -> None:
+        """Generate code for a top-level declaration"""
+        if type(decl) is FunctionDecl:
+            self.generate_function(decl)
+        elif type(decl) is StructDecl:
+            self.generate_struct(decl)
+
+    def generate_fragment(self, decl: ASTNode) -> Tuple[bytearray, List[Tuple[str, Tuple[str, int]]]]:
+        """Generate one declaration on its own, returning its IR and string literals"""
+        self.output = bytearray()
+        self.string_literals = {}
+        self.next_string = 1
+        self.generate_declaration(decl)
+        return self.output, list(self.string_literals.items())
+
+    def append_fragment(self, code: bytearray, strings: List[Tuple[str, Tuple[str, int]]]) -> None:
+        """Append a fragment from generate_fragment, renumbering its string literals module-wide"""
+        renames = {name.encode(): self._get_string_literal(content)[0].encode()
+                   for content, (name, _) in strings}
+        if renames:
+            self.output += _STRING_REF.sub(lambda m: renames[m.group(0)], code)
+        else:
+            self.output += code
 
+    def finish_module(self) -> bytearray:
+        """Emit module globals and declarations and return the IR buffer"""
         # Emit string literals at the end
         self._emit_string_literals()
 
         # Emit standard library declarations
         self._emit_stdlib_declarations()
-
-        return '\n'.join(self.output)
+        return self.output
+
+    def end_module(self) -> Optional[str]:
+        """Emit module globals and declarations and return the finished IR"""
+        self.finish_module()
+        if self.out is not None:
+            self._flush()
+            return None
+        return self.output.decode('utf-8')
+
+    def _flush(self) -> None:
+        """Write buffered lines to the output stream, if streaming"""
+        if self.out is None or not self.output:
+            return
+        self.out.write(self.output)
+        self.output = bytearray()
 
     def _emit(self, code: str = "") -> None:
         """Emit a line of code with proper indentation"""
+        # Callers build lines with f-strings; on CPython 3.11 they beat both
+        # "".join of the fragments and preformatted str.format templates.
+        # The per-node generators for expressions, declarations, if and while
+        # inline this, _new_register and _new_label; keep them in step
+        output = self.output
         if code:
-            self.output.append("  " * self.indent_level + code)
-        else:
-            self.output.append("")
+            output += self._indent_bytes
+            output += code.encode('utf-8')
+        output += b"\n"
+
+    def _emit_lines(self, *lines: str) -> None:
+        """Emit consecutive lines at the current indentation as one write"""
+        indent = self._indent_bytes.decode('ascii')
+        self.output += (indent + ("\n" + indent).join(lines) + "\n").encode('utf-8')
 
     def _indent(self) -> None:
         """Increase indentation"""
         self.indent_level += 1
+        self._indent_bytes = b"  " * self.indent_level
 
     def _dedent(self) -> None:
         """Decrease indentation"""
         self.indent_level = max(0, self.indent_level - 1)
+        self._indent_bytes = b"  " * self.indent_level
 
     def _new_register(self) -> str:
         """Allocate a new register"""
@@ -122,66 +562,62 @@ class LLVMCodeGenerator:
         """Convert type annotation to LLVM type"""
         if type_node is None:
             return "void"
+        if type(type_node) is TypeName:
+            return self._get_llvm_primitive_type(type_node.name)
+        return self._cached_llvm_type(type_node, self._build_llvm_type_from_annotation)
 
-        if isinstance(type_node, TypeName):
+    def _build_llvm_type_from_annotation(self, type_node: TypeNode) -> str:
+        """Uncached worker for _get_llvm_type_from_annotation"""
+        if type(type_node) is TypeName:
             return self._get_llvm_primitive_type(type_node.name)
 
-        elif isinstance(type_node, TypePtr):
+        elif type(type_node) is TypePtr:
             element_type = self._get_llvm_type_from_annotation(type_node.element_type)
             return f"{element_type}*"
 
-        elif isinstance(type_node, TypeArray):
+        elif type(type_node) is TypeArray:
             element_type = self._get_llvm_type_from_annotation(type_node.element_type)
             return f"[{type_node.size} x {element_type}]"
 
-        elif isinstance(type_node, TypeSlice):
+        elif type(type_node) is TypeSlice:
             # Slice is represented as {ptr, length}
             element_type = self._get_llvm_type_from_annotation(type_node.element_type)
             return f"{{ {element_type}*, i64 }}"
 
-        elif isinstance(type_node, TypeTuple):
+        elif type(type_node) is TypeTuple:
             element_types = [self._get_llvm_type_from_annotation(t) for t in type_node.element_types]
             types_str = ", ".join(element_types)
             return f"{{ {types_str} }}"
 
-        elif isinstance(type_node, TypeResult):
+        elif type(type_node) is TypeResult:
             # Result is represented as {status, value}
             value_type = self._get_llvm_type_from_annotation(type_node.value_type)
             return f"{{ i32, {value_type} }}"
 
         return "i32"  # Default
 
-    def _get_llvm_type(self, typ: Type) -> str:
+    def _get_llvm_type(self, typ: Optional[Type]) -> str:
         """Convert Boogpp type to LLVM type string"""
-        if typ.kind == TypeKind.I8:
-            return "i8"
-        elif typ.kind == TypeKind.I16:
-            return "i16"
-        elif typ.kind == TypeKind.I32 or typ.kind == TypeKind.STATUS:
-            return "i32"
-        elif typ.kind == TypeKind.I64:
-            return "i64"
-        elif typ.kind == TypeKind.U8:
-            return "i8"
-        elif typ.kind == TypeKind.U16:
-            return "i16"
-        elif typ.kind == TypeKind.U32:
+        if typ is None:
             return "i32"
-        elif typ.kind == TypeKind.U64 or typ.kind == TypeKind.HANDLE:
-            return "i64"
-        elif typ.kind == TypeKind.F32:
-            return "float"
-        elif typ.kind == TypeKind.F64:
-            return "double"
-        elif typ.kind == TypeKind.BOOL:
-            return "i1"
-        elif typ.kind == TypeKind.CHAR:
-            return "i8"
-        elif typ.kind == TypeKind.STRING:
-            return "i8*"
-        elif typ.kind == TypeKind.VOID:
-            return "void"
-        elif typ.kind == TypeKind.POINTER:
+        llvm_type = _PRIMITIVE_LLVM.get(typ.kind)
+        if llvm_type is not None:
+            return llvm_type
+        return self._cached_llvm_type(typ, self._build_llvm_type)
+
+    def _cached_llvm_type(self, typ: Any, build: Callable[[Any], str]) -> str:
+        """Look up a compound type's LLVM string by identity, building it once"""
+        cached = self._llvm_type_cache.get(id(typ))
+        if cached is not None:
+            return cached[1]
+        llvm_type = build(typ)
+        # The object is kept alive with its entry so its id cannot be reused
+        self._llvm_type_cache[id(typ)] = (typ, llvm_type)
+        return llvm_type
+
+    def _build_llvm_type(self, typ: Type) -> str:
+        """Uncached worker for _get_llvm_type"""
+        if typ.kind == TypeKind.POINTER:
             elem_type = self._get_llvm_type(typ.element_type)
             return f"{elem_type}*"
         elif typ.kind == TypeKind.ARRAY:
@@ -191,28 +627,26 @@ class LLVMCodeGenerator:
             elem_type = self._get_llvm_type(typ.element_type)
             return f"{{ {elem_type}*, i64 }}"
         elif typ.kind == TypeKind.TUPLE:
-            elem_types = [self._get_llvm_type(t) for t in typ.element_types]
+            elem_types = [self._get_llvm_type(t) for t in typ.element_types or ()]
             return f"{{ {', '.join(elem_types)} }}"
         else:
             return "i32"  # Default fallback
 
     def _get_llvm_primitive_type(self, name: str) -> str:
         """Get LLVM type for primitive type name"""
-        type_map = {
-            'i8': 'i8', 'i16': 'i16', 'i32': 'i32', 'i64': 'i64',
-            'u8': 'i8', 'u16': 'i16', 'u32': 'i32', 'u64': 'i64',
-            'f32': 'float', 'f64': 'double',
-            'bool': 'i1', 'char': 'i8', 'string': 'i8*',
-            'void': 'void', 'status': 'i32', 'handle': 'i64'
-        }
-        return type_map.get(name, 'i32')
+        return _PRIMITIVE_LLVM_NAMES.get(name, 'i32')
 
     def generate_function(self, func: FunctionDecl) -> None:
         """Generate code for a function"""
         # Reset local context
         self.local_symbols = {}
+        self.ssa_locals = promotable_locals(func)
+        self.ssa_values = {}
         self.next_register = 1
         self.next_label = 1
+        self.loop_labels = []
+        self.block_terminated = False
+        self._last_store = None
         self.current_function = func.name
 
         # Build parameter list
@@ -230,33 +664,99 @@ class LLVMCodeGenerator:
                       if func.return_type else "void")
         self.current_function_return_type = return_type
 
-        # Emit function signature
-        func_name = f"@{func.name}" if func.name != "main" else "@main"
-        self._emit(f"define {return_type} {func_name}({params_str}) {{")
-        self._indent()
+        fields = {
+            'ret': return_type,
+            'name': f"@{func.name}",
+            'params': params_str,
+            # Ensures the function has a return; a missing one should have
+            # been caught by the type checker
+            'default': "ret void" if return_type == "void" else f"ret {return_type} 0  ; default return",
+        }
 
-        # Emit entry label
-        self._emit("entry:")
-        self._indent()
+        # Small bodies are rendered from a template instead of walked
+        if func.name != "main":
+            text = self._emit_simple_fn(fields, func.body)
+            if text is not None:
+                self._emit(text)
+                return
 
-        # Initialize runtime at program start (best-effort)
+        # Signature and entry label; main also initializes the runtime (best-effort)
+        prologue = _FN_HEAD % fields
         if func.name == "main":
-            self._emit("call i32 @bpp_runtime_init()")
+            prologue += _MAIN_PROLOGUE
+        self.output += prologue.encode('utf-8')
+        self._indent()
+        self._indent()
 
         # Generate function body
         self.generate_statement(func.body)
 
-        # Ensure function has a return
-        if return_type == "void":
-            self._emit("ret void")
-        else:
-            # This should have been caught by type checker
-            self._emit(f"ret {return_type} 0  ; default return")
-
         self._dedent()
         self._dedent()
-        self._emit("}")
-        self._emit("")
+        tail = _FN_END if self.block_terminated else _FN_TAIL % fields
+        self.output += (tail + "\n").encode('utf-8')
+
+    def _emit_simple_fn(self, fields: Dict[str, str], body: Statement) -> Optional[str]:
+        """Render a function from _SIMPLE_FN_TEMPLATES, or None if no shape fits"""
+        if self.indent_level or type(body) is not Block:
+            return None
+
+        statements = body.statements
+        if all(type(s) is PassStmt for s in statements):
+            return _SIMPLE_FN_TEMPLATES['pass'] % fields
+        if len(statements) != 1 or type(statements[0]) is not ReturnStmt:
+            return None
+
+        value = statements[0].value
+        if value is None:
+            return _SIMPLE_FN_TEMPLATES['return_void'] % fields
+        fields['type'] = self._get_llvm_type(self._get_expression_type(value))
+
+        if type(value) is not BinaryExpr:
+            operand = self._simple_operand(value)
+            if operand is None:
+                return None
+            fields['value'] = operand[1]
+            shape = 'return_param' if operand[0] else 'return_literal'
+            return _SIMPLE_FN_TEMPLATES[shape] % fields
+
+        left = self._simple_operand(value.left)
+        right = self._simple_operand(value.right)
+        if left is None or right is None:
+            return None
+        left_type = self._get_expression_type(value.left)
+        folded = _fold_binary(value.operator, left_type, left[1], right[1])
+        if folded is not None:
+            fields['value'] = folded
+            return _SIMPLE_FN_TEMPLATES['return_literal'] % fields
+        if _simplify_binary(value.operator, left_type, left[1], right[1]) is not None:
+            # The generic path emits whichever operand or constant is left
+            return None
+
+        opcode = _BINARY_OPCODES.get((value.operator, _type_category(left_type)))
+        if opcode is None:
+            return None
+        right_text = right[1]
+        reduced = _reduce_strength(value.operator, left_type, right_text)
+        if reduced is not None:
+            opcode, right_text = reduced
+
+        fields['op'] = opcode
+        fields['left'] = left[1]
+        fields['right'] = right_text
+        fields['ltype'] = self._get_llvm_type(left_type)
+        fields['rtype'] = self._get_llvm_type(self._get_expression_type(value.right))
+        return _SIMPLE_FN_TEMPLATES[('binary', left[0], right[0])] % fields
+
+    def _simple_operand(self, expr: Expression) -> Optional[tuple]:
+        """Classify a template operand as (is_parameter, text), or None"""
+        if type(expr) is IdentifierExpr:
+            var_reg = self.local_symbols.get(expr.name)
+            if var_reg is not None and expr.name not in _BUILTIN_CONSTANTS:
+                return (True, var_reg)
+        elif type(expr) is LiteralExpr and expr.literal_type != 'string':
+            return (False, self.generate_literal(expr))
+        return None
 
     def generate_struct(self, struct: StructDecl) -> None:
         """Generate code for a struct"""
@@ -266,144 +766,168 @@ class LLVMCodeGenerator:
             field_types.append(field_type)
 
         fields_str = ", ".join(field_types)
-        self._emit(f"%struct.{struct.name} = type {{ {fields_str} }}")
-        self._emit("")
+        # Module level, so no indentation; the blank separator line rides along
+        self.output += f"%struct.{struct.name} = type {{ {fields_str} }}\n\n".encode('utf-8')
 
     def generate_statement(self, stmt: Statement) -> None:
         """Generate code for a statement"""
-        if isinstance(stmt, Block):
-            for s in stmt.statements:
-                self.generate_statement(s)
-
-        elif isinstance(stmt, ReturnStmt):
-            if stmt.value:
-                value_reg = self.generate_expression(stmt.value)
-                value_type = self._get_expression_type(stmt.value)
-                llvm_type = self._get_llvm_type(value_type)
-                self._emit(f"ret {llvm_type} {value_reg}")
-            else:
-                self._emit("ret void")
-
-        elif isinstance(stmt, IfStmt):
-            self.generate_if_statement(stmt)
-
-        elif isinstance(stmt, WhileStmt):
-            self.generate_while_statement(stmt)
-
-        elif isinstance(stmt, ForStmt):
-            self.generate_for_statement(stmt)
-
-        elif isinstance(stmt, ExprStmt):
-            self.generate_expression(stmt.expression)
-
-        elif isinstance(stmt, AssignStmt):
-            self.generate_assignment(stmt)
-
-        elif isinstance(stmt, VariableDecl):
-            self.generate_variable_decl(stmt)
-
-        elif isinstance(stmt, PassStmt):
-            # No-op
-            pass
+        handler = _STATEMENT_GENERATORS.get(type(stmt))
+        if handler is not None:
+            handler(self, stmt)
+
+    def generate_block(self, block: Block) -> None:
+        """Generate code for each statement of a block"""
+        for s in block.statements:
+            # Anything after a return, break or continue is unreachable
+            if self.block_terminated:
+                break
+            self.generate_statement(s)
+
+    def generate_return_statement(self, stmt: ReturnStmt) -> None:
+        """Generate code for return statement"""
+        if stmt.value:
+            value_reg = self.generate_expression(stmt.value)
+            value_type = self._get_expression_type(stmt.value)
+            llvm_type = self._get_llvm_type(value_type)
+            self._emit(f"ret {llvm_type} {value_reg}")
+        else:
+            self._emit("ret void")
+        self.block_terminated = True
 
-        elif isinstance(stmt, BreakStmt):
-            # Would need loop context
-            self._emit("br label %break")
+    def generate_expression_statement(self, stmt: ExprStmt) -> None:
+        """Generate code for an expression evaluated for its effects"""
+        self.generate_expression(stmt.expression)
 
-        elif isinstance(stmt, ContinueStmt):
-            # Would need loop context
-            self._emit("br label %continue")
+    def generate_pass_statement(self, stmt: PassStmt) -> None:
+        """Generate code for pass statement"""
+        # No-op
 
-        elif isinstance(stmt, MatchStmt):
-            self.generate_match_statement(stmt)
+    def generate_break_statement(self, stmt: BreakStmt) -> None:
+        """Generate code for break statement"""
+        # Outside a loop there is nothing to branch to; the type checker reports it
+        if self.loop_labels:
+            self._emit(f"br label %{self.loop_labels[-1][0]}")
+            self.block_terminated = True
 
-        elif isinstance(stmt, DeferStmt):
-            self.generate_defer_statement(stmt)
+    def generate_continue_statement(self, stmt: ContinueStmt) -> None:
+        """Generate code for continue statement"""
+        if self.loop_labels:
+            self._emit(f"br label %{self.loop_labels[-1][1]}")
+            self.block_terminated = True
 
     def generate_if_statement(self, stmt: IfStmt) -> None:
         """Generate code for if statement"""
-        then_label = self._new_label("if.then")
-        else_label = self._new_label("if.else")
-        end_label = self._new_label("if.end")
+        n = self.next_label
+        self.next_label = n + 3
+        then_label = f"if.then.{n}"
+        else_label = f"if.else.{n + 1}"
+        end_label = f"if.end.{n + 2}"
+
+        # Labels sit one level left of the statements around them
+        indent = self._indent_bytes
+        label_indent = indent[2:]
+        output = self.output
 
         # Generate condition
         cond_reg = self.generate_expression(stmt.condition)
 
         # Branch
+        output += indent
         if stmt.else_block or stmt.elif_clauses:
-            self._emit(f"br i1 {cond_reg}, label %{then_label}, label %{else_label}")
+            output += f"br i1 {cond_reg}, label %{then_label}, label %{else_label}\n".encode('utf-8')
         else:
-            self._emit(f"br i1 {cond_reg}, label %{then_label}, label %{end_label}")
+            output += f"br i1 {cond_reg}, label %{then_label}, label %{end_label}\n".encode('utf-8')
 
         # Then block
-        self._dedent()
-        self._emit(f"{then_label}:")
-        self._indent()
+        output += label_indent
+        output += f"{then_label}:\n".encode('utf-8')
+        self.block_terminated = False
         self.generate_statement(stmt.then_block)
-        self._emit(f"br label %{end_label}")
+        if not self.block_terminated:
+            output += indent
+            output += f"br label %{end_label}\n".encode('utf-8')
 
         # Else/elif blocks
         if stmt.elif_clauses or stmt.else_block:
-            self._dedent()
-            self._emit(f"{else_label}:")
-            self._indent()
+            output += label_indent
+            output += f"{else_label}:\n".encode('utf-8')
+            self.block_terminated = False
 
             # Handle elif clauses
             for cond, block in stmt.elif_clauses:
-                elif_then = self._new_label("elif.then")
-                elif_else = self._new_label("elif.else")
+                n = self.next_label
+                self.next_label = n + 2
+                elif_then = f"elif.then.{n}"
+                elif_else = f"elif.else.{n + 1}"
 
                 elif_cond_reg = self.generate_expression(cond)
-                self._emit(f"br i1 {elif_cond_reg}, label %{elif_then}, label %{elif_else}")
+                output += indent
+                output += f"br i1 {elif_cond_reg}, label %{elif_then}, label %{elif_else}\n".encode('utf-8')
 
-                self._dedent()
-                self._emit(f"{elif_then}:")
-                self._indent()
+                output += label_indent
+                output += f"{elif_then}:\n".encode('utf-8')
+                self.block_terminated = False
                 self.generate_statement(block)
-                self._emit(f"br label %{end_label}")
+                if not self.block_terminated:
+                    output += indent
+                    output += f"br label %{end_label}\n".encode('utf-8')
 
-                self._dedent()
-                self._emit(f"{elif_else}:")
-                self._indent()
+                output += label_indent
+                output += f"{elif_else}:\n".encode('utf-8')
+                self.block_terminated = False
 
             # Handle final else
             if stmt.else_block:
                 self.generate_statement(stmt.else_block)
 
-            self._emit(f"br label %{end_label}")
+            if not self.block_terminated:
+                output += indent
+                output += f"br label %{end_label}\n".encode('utf-8')
 
         # End block
-        self._dedent()
-        self._emit(f"{end_label}:")
-        self._indent()
+        output += label_indent
+        output += f"{end_label}:\n".encode('utf-8')
+        self.block_terminated = False
 
     def generate_while_statement(self, stmt: WhileStmt) -> None:
         """Generate code for while statement"""
-        cond_label = self._new_label("while.cond")
-        body_label = self._new_label("while.body")
-        end_label = self._new_label("while.end")
+        n = self.next_label
+        self.next_label = n + 3
+        cond_label = f"while.cond.{n}"
+        body_label = f"while.body.{n + 1}"
+        end_label = f"while.end.{n + 2}"
+
+        # Labels sit one level left of the statements around them
+        indent = self._indent_bytes
+        label_indent = indent[2:]
+        output = self.output
 
         # Jump to condition
-        self._emit(f"br label %{cond_label}")
+        output += indent
+        output += f"br label %{cond_label}\n".encode('utf-8')
 
         # Condition block
-        self._dedent()
-        self._emit(f"{cond_label}:")
-        self._indent()
+        output += label_indent
+        output += f"{cond_label}:\n".encode('utf-8')
         cond_reg = self.generate_expression(stmt.condition)
-        self._emit(f"br i1 {cond_reg}, label %{body_label}, label %{end_label}")
+        output += indent
+        output += f"br i1 {cond_reg}, label %{body_label}, label %{end_label}\n".encode('utf-8')
 
         # Body block
-        self._dedent()
-        self._emit(f"{body_label}:")
-        self._indent()
+        output += label_indent
+        output += f"{body_label}:\n".encode('utf-8')
+        self.block_terminated = False
+        self.loop_labels.append((end_label, cond_label))
         self.generate_statement(stmt.body)
-        self._emit(f"br label %{cond_label}")
+        self.loop_labels.pop()
+        if not self.block_terminated:
+            output += indent
+            output += f"br label %{cond_label}\n".encode('utf-8')
 
         # End block
-        self._dedent()
-        self._emit(f"{end_label}:")
-        self._indent()
+        output += label_indent
+        output += f"{end_label}:\n".encode('utf-8')
+        self.block_terminated = False
 
     def generate_for_statement(self, stmt: ForStmt) -> None:
         """Generate code for for statement"""
@@ -432,7 +956,7 @@ class LLVMCodeGenerator:
             pattern_reg = self.generate_expression(case.pattern)
             cmp_reg = self._new_register()
 
-            if value_type.is_float():
+            if value_type.kind in FLOAT_KINDS:
                 self._emit(f"{cmp_reg} = fcmp oeq {llvm_type} {value_reg}, {pattern_reg}")
             else:
                 self._emit(f"{cmp_reg} = icmp eq {llvm_type} {value_reg}, {pattern_reg}")
@@ -447,19 +971,23 @@ class LLVMCodeGenerator:
             self._dedent()
             self._emit(f"{body_label}:")
             self._indent()
+            self.block_terminated = False
             self.generate_statement(case.body)
-            self._emit(f"br label %{end_label}")
+            if not self.block_terminated:
+                self._emit(f"br label %{end_label}")
 
             # Next case
             if i < len(next_labels):
                 self._dedent()
                 self._emit(f"{next_labels[i]}:")
                 self._indent()
+                self.block_terminated = False
 
         # End of match
         self._dedent()
         self._emit(f"{end_label}:")
         self._indent()
+        self.block_terminated = False
 
     def generate_defer_statement(self, stmt) -> None:
         """Generate code for defer statement"""
@@ -473,72 +1001,57 @@ class LLVMCodeGenerator:
     def generate_assignment(self, stmt: AssignStmt) -> None:
         """Generate code for assignment"""
         # Get target (must be an identifier for now)
-        if isinstance(stmt.target, IdentifierExpr):
+        if type(stmt.target) is IdentifierExpr:
             value_reg = self.generate_expression(stmt.value)
-            target_name = stmt.target.name
+            target_reg = self.local_symbols.get(stmt.target.name)
 
-            if target_name in self.local_symbols:
-                target_reg = self.local_symbols[target_name]
+            if target_reg is not None:
                 value_type = self._get_expression_type(stmt.value)
                 llvm_type = self._get_llvm_type(value_type)
 
                 # Store to alloca'd location
                 self._emit(f"store {llvm_type} {value_reg}, {llvm_type}* {target_reg}")
+                self._last_store = (len(self.output), target_reg, llvm_type, value_reg)
 
     def generate_variable_decl(self, decl: VariableDecl) -> None:
         """Generate code for variable declaration"""
+        if decl.name in self.ssa_locals and decl.initializer is not None:
+            value = self.generate_expression(decl.initializer)
+            self.local_symbols.pop(decl.name, None)
+            self.ssa_values[decl.name] = value
+            return
+
         # Allocate stack space
         if decl.type_annotation:
             llvm_type = self._get_llvm_type_from_annotation(decl.type_annotation)
-        else:
+        elif decl.initializer is not None:
             # Infer from initializer
             init_type = self._get_expression_type(decl.initializer)
             llvm_type = self._get_llvm_type(init_type)
+        else:
+            llvm_type = "i32"
 
-        var_reg = self._new_register()
-        self._emit(f"{var_reg} = alloca {llvm_type}")
+        var_reg = f"%{self.next_register}"
+        self.next_register += 1
+        output = self.output
+        output += self._indent_bytes
+        output += f"{var_reg} = alloca {llvm_type}\n".encode('utf-8')
         self.local_symbols[decl.name] = var_reg
 
         # Initialize if present
         if decl.initializer:
             init_reg = self.generate_expression(decl.initializer)
-            self._emit(f"store {llvm_type} {init_reg}, {llvm_type}* {var_reg}")
+            output += self._indent_bytes
+            output += f"store {llvm_type} {init_reg}, {llvm_type}* {var_reg}\n".encode('utf-8')
+            self._last_store = (len(output), var_reg, llvm_type, init_reg)
 
     def generate_expression(self, expr: Expression) -> str:
         """Generate code for an expression and return the register holding the result"""
-        if isinstance(expr, LiteralExpr):
-            return self.generate_literal(expr)
-
-        elif isinstance(expr, IdentifierExpr):
-            return self.generate_identifier(expr)
-
-        elif isinstance(expr, BinaryExpr):
-            return self.generate_binary_expr(expr)
-
-        elif isinstance(expr, UnaryExpr):
-            return self.generate_unary_expr(expr)
-
-        elif isinstance(expr, CallExpr):
-            return self.generate_call_expr(expr)
-
-        elif isinstance(expr, MemberExpr):
-            return self.generate_member_expr(expr)
-
-        elif isinstance(expr, IndexExpr):
-            return self.generate_index_expr(expr)
-
-        elif isinstance(expr, TupleExpr):
-            return self.generate_tuple_expr(expr)
-
-        elif isinstance(expr, ArrayExpr):
-            return self.generate_array_expr(expr)
-
-        elif TryChainExpr and isinstance(expr, TryChainExpr):
-            return self.generate_try_chain_expr(expr)
-
-        else:
-            # Default fallback
-            return "0"
+        handler = _EXPRESSION_GENERATORS.get(type(expr))
+        if handler is not None:
+            return handler(self, expr)
+        # Default fallback
+        return "0"
 
     def generate_literal(self, literal: LiteralExpr) -> str:
         """Generate code for a literal"""
@@ -547,7 +1060,7 @@ class LLVMCodeGenerator:
         elif literal.literal_type == 'float':
             return str(literal.value)
         elif literal.literal_type == 'string':
-            return self._get_string_literal(str(literal.value))
+            return self._get_string_literal(str(literal.value))[0]
         elif literal.literal_type in ('bool', 'boolean'):
             return "1" if literal.value else "0"
         elif literal.literal_type == 'char':
@@ -557,21 +1070,32 @@ class LLVMCodeGenerator:
     def generate_identifier(self, ident: IdentifierExpr) -> str:
         """Generate code for an identifier"""
         # Handle built-in constants
-        if ident.name == 'SUCCESS':
-            return "0"
-        elif ident.name == 'true':
-            return "1"
-        elif ident.name == 'false':
-            return "0"
+        constant = _BUILTIN_CONSTANTS.get(ident.name)
+        if constant is not None:
+            return constant
 
-        if ident.name in self.local_symbols:
-            var_reg = self.local_symbols[ident.name]
-            result_reg = self._new_register()
+        # Promoted locals are their initializer's value
+        value = self.ssa_values.get(ident.name)
+        if value is not None:
+            return value
 
-            # Load from memory
+        var_reg = self.local_symbols.get(ident.name)
+        if var_reg is not None:
             var_type = self._get_expression_type(ident)
             llvm_type = self._get_llvm_type(var_type)
-            self._emit(f"{result_reg} = load {llvm_type}, {llvm_type}* {var_reg}")
+
+            # Nothing emitted since a store to this slot: reuse the stored value
+            output = self.output
+            last_store = self._last_store
+            if (last_store is not None and last_store[0] == len(output)
+                    and last_store[1] == var_reg and last_store[2] == llvm_type):
+                return last_store[3]
+
+            # Load from memory
+            result_reg = f"%{self.next_register}"
+            self.next_register += 1
+            output += self._indent_bytes
+            output += f"{result_reg} = load {llvm_type}, {llvm_type}* {var_reg}\n".encode('utf-8')
             return result_reg
 
         return "0"  # Unknown identifier
@@ -580,122 +1104,72 @@ class LLVMCodeGenerator:
         """Generate code for binary expression"""
         left_reg = self.generate_expression(expr.left)
         right_reg = self.generate_expression(expr.right)
-        result_reg = self._new_register()
 
         left_type = self._get_expression_type(expr.left)
-        llvm_type = self._get_llvm_type(left_type)
 
-        # Arithmetic operators
-        if expr.operator == '+':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fadd {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = add {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '-':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fsub {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = sub {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '*':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fmul {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = mul {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '/':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fdiv {llvm_type} {left_reg}, {right_reg}")
-            elif left_type.is_signed():
-                self._emit(f"{result_reg} = sdiv {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = udiv {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '%':
-            if left_type.is_signed():
-                self._emit(f"{result_reg} = srem {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = urem {llvm_type} {left_reg}, {right_reg}")
+        # Logical operators always work on i1
+        logical = _LOGICAL_OPCODES.get(expr.operator)
+        if logical is not None:
+            result_reg = f"%{self.next_register}"
+            self.next_register += 1
+            output = self.output
+            output += self._indent_bytes
+            output += f"{result_reg} = {logical} i1 {left_reg}, {right_reg}\n".encode('utf-8')
+            return result_reg
 
-        # Comparison operators
-        elif expr.operator == '==':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp oeq {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp eq {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '!=':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp one {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp ne {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '<':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp olt {llvm_type} {left_reg}, {right_reg}")
-            elif left_type.is_signed():
-                self._emit(f"{result_reg} = icmp slt {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp ult {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '>':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp ogt {llvm_type} {left_reg}, {right_reg}")
-            elif left_type.is_signed():
-                self._emit(f"{result_reg} = icmp sgt {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp ugt {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '<=':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp ole {llvm_type} {left_reg}, {right_reg}")
-            elif left_type.is_signed():
-                self._emit(f"{result_reg} = icmp sle {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp ule {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '>=':
-            if left_type.is_float():
-                self._emit(f"{result_reg} = fcmp oge {llvm_type} {left_reg}, {right_reg}")
-            elif left_type.is_signed():
-                self._emit(f"{result_reg} = icmp sge {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = icmp uge {llvm_type} {left_reg}, {right_reg}")
-
-        # Logical operators
-        elif expr.operator == 'and':
-            self._emit(f"{result_reg} = and i1 {left_reg}, {right_reg}")
-        elif expr.operator == 'or':
-            self._emit(f"{result_reg} = or i1 {left_reg}, {right_reg}")
-
-        # Bitwise operators
-        elif expr.operator == '&':
-            self._emit(f"{result_reg} = and {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '|':
-            self._emit(f"{result_reg} = or {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '^':
-            self._emit(f"{result_reg} = xor {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '<<':
-            self._emit(f"{result_reg} = shl {llvm_type} {left_reg}, {right_reg}")
-        elif expr.operator == '>>':
-            if left_type.is_signed():
-                self._emit(f"{result_reg} = ashr {llvm_type} {left_reg}, {right_reg}")
-            else:
-                self._emit(f"{result_reg} = lshr {llvm_type} {left_reg}, {right_reg}")
+        # Constant operands are evaluated here instead of emitted; two
+        # registers, the common case, can neither fold nor simplify
+        if left_reg[0] != '%' or right_reg[0] != '%':
+            folded = _fold_binary(expr.operator, left_type, left_reg, right_reg)
+            if folded is None:
+                folded = _simplify_binary(expr.operator, left_type, left_reg, right_reg)
+            if folded is not None:
+                return folded
+
+        llvm_type = self._get_llvm_type(left_type)
+        opcode = _BINARY_OPCODES.get((expr.operator, _TYPE_CATEGORIES.get(left_type.kind, 'u')))
+        result_reg = f"%{self.next_register}"
+        self.next_register += 1
+        output = self.output
+        output += self._indent_bytes
+        if opcode is None:
+            output += f"{result_reg} = add {llvm_type} {left_reg}, {right_reg}  ; unknown operator\n".encode('utf-8')
         else:
-            self._emit(f"{result_reg} = add {llvm_type} {left_reg}, {right_reg}  ; unknown operator")
+            if right_reg[0] != '%':
+                reduced = _reduce_strength(expr.operator, left_type, right_reg)
+                if reduced is not None:
+                    opcode, right_reg = reduced
+            output += f"{result_reg} = {opcode} {llvm_type} {left_reg}, {right_reg}\n".encode('utf-8')
 
         return result_reg
 
     def generate_unary_expr(self, expr: UnaryExpr) -> str:
         """Generate code for unary expression"""
         operand_reg = self.generate_expression(expr.operand)
-        result_reg = self._new_register()
-
         operand_type = self._get_expression_type(expr.operand)
+
+        folded = _fold_unary(expr.operator, operand_type, operand_reg)
+        if folded is not None:
+            return folded
+
+        result_reg = f"%{self.next_register}"
+        self.next_register += 1
         llvm_type = self._get_llvm_type(operand_type)
 
         if expr.operator == '-':
-            if operand_type.is_float():
-                self._emit(f"{result_reg} = fneg {llvm_type} {operand_reg}")
+            if operand_type.kind in FLOAT_KINDS:
+                line = f"{result_reg} = fneg {llvm_type} {operand_reg}\n"
             else:
-                self._emit(f"{result_reg} = sub {llvm_type} 0, {operand_reg}")
+                line = f"{result_reg} = sub {llvm_type} 0, {operand_reg}\n"
         elif expr.operator == 'not':
-            self._emit(f"{result_reg} = xor i1 {operand_reg}, 1")
+            line = f"{result_reg} = xor i1 {operand_reg}, 1\n"
         elif expr.operator == '~':
-            self._emit(f"{result_reg} = xor {llvm_type} {operand_reg}, -1")
+            line = f"{result_reg} = xor {llvm_type} {operand_reg}, -1\n"
+        else:
+            return result_reg
+        output = self.output
+        output += self._indent_bytes
+        output += line.encode('utf-8')
 
         return result_reg
 
@@ -703,12 +1177,16 @@ class LLVMCodeGenerator:
         """Generate code for function call"""
         # Get function name
         func_name = None
-        if isinstance(expr.callee, IdentifierExpr):
+        if type(expr.callee) is IdentifierExpr:
             func_name = expr.callee.name
 
         if not func_name:
             return "0"
 
+        # Built-ins evaluate their own arguments
+        if func_name not in self.functions:
+            return self.generate_builtin_call(func_name, expr.arguments)
+
         # Generate arguments
         args = []
         for arg in expr.arguments:
@@ -720,74 +1198,68 @@ class LLVMCodeGenerator:
         args_str = ", ".join(args) if args else ""
 
         # Get function info
-        if func_name in self.functions:
-            func_info = self.functions[func_name]
-            return_type = func_info['return_type']
+        func_info = self.functions[func_name]
+        return_type = func_info['return_type']
 
-            if return_type == "void":
-                self._emit(f"call void @{func_name}({args_str})")
-                return "0"
-            else:
-                result_reg = self._new_register()
-                self._emit(f"{result_reg} = call {return_type} @{func_name}({args_str})")
-                return result_reg
+        output = self.output
+        output += self._indent_bytes
+        if return_type == "void":
+            output += f"call void @{func_name}({args_str})\n".encode('utf-8')
+            return "0"
         else:
-            # Built-in or external function
-            return self.generate_builtin_call(func_name, expr.arguments)
+            result_reg = f"%{self.next_register}"
+            self.next_register += 1
+            output += f"{result_reg} = call {return_type} @{func_name}({args_str})\n".encode('utf-8')
+            return result_reg
 
     def generate_builtin_call(self, func_name: str, args: List[Expression]) -> str:
         """Generate code for built-in/stdlib-like functions (println/print/log)."""
         if not args:
             return "0"
 
-        # Helper: turn a string literal into i8* using GEP
-        def _emit_cstr_ptr(lit: LiteralExpr) -> Optional[str]:
-            if lit.literal_type != 'string':
-                return None
-            content = str(lit.value)
-            global_name = self._get_string_literal(content)
-            length = len(content) + 1
-            reg = self._new_register()
-            self._emit(f"{reg} = getelementptr inbounds ([{length} x i8], [{length} x i8]* {global_name}, i32 0, i32 0)")
-            return reg
-
         first = args[0]
 
         # println -> bpp_println(bpp_string_new(cstr))
         if func_name in ("println", "print", "log"):
             cstr_ptr = None
-            if isinstance(first, LiteralExpr):
-                cstr_ptr = _emit_cstr_ptr(first)
+            if type(first) is LiteralExpr and first.literal_type == 'string':
+                cstr_ptr = self._cstr_ptr(str(first.value))
             else:
                 # Fallback: try evaluating expression and hope it's already i8*
                 maybe_ptr = self.generate_expression(first)
                 cstr_ptr = maybe_ptr
 
-            if func_name == "println":
-                # Build bpp_string and call println
-                sreg = self._new_register()
-                self._emit(f"{sreg} = call %bpp_string_t* @bpp_string_new(i8* {cstr_ptr})")
-                self._emit(f"call i32 @bpp_println(%bpp_string_t* {sreg})")
-                return "0"
-            elif func_name == "print":
-                sreg = self._new_register()
-                self._emit(f"{sreg} = call %bpp_string_t* @bpp_string_new(i8* {cstr_ptr})")
-                self._emit(f"call i32 @bpp_print(%bpp_string_t* {sreg})")
-                return "0"
-            elif func_name == "log":
-                sreg = self._new_register()
-                self._emit(f"{sreg} = call %bpp_string_t* @bpp_string_new(i8* {cstr_ptr})")
-                self._emit(f"call i32 @bpp_log(%bpp_string_t* {sreg})")
-                return "0"
+            # Build bpp_string and hand it to bpp_println/bpp_print/bpp_log;
+            # the status result is named so it does not take an implicit number
+            sreg = self._new_register()
+            status_reg = self._new_register()
+            self._emit_lines(
+                f"{sreg} = call %bpp_string_t* @bpp_string_new(i8* {cstr_ptr})",
+                f"{status_reg} = call i32 @bpp_{func_name}(%bpp_string_t* {sreg})",
+            )
+            return "0"
 
         # read_line(): wait for user input; free returned string to avoid leaks
         if func_name == "read_line":
             tmp = self._new_register()
-            self._emit(f"{tmp} = call %bpp_string_t* @bpp_read_line()")
             # Free immediately if used as statement
-            self._emit(f"call void @bpp_string_free(%bpp_string_t* {tmp})")
+            self._emit_lines(
+                f"{tmp} = call %bpp_string_t* @bpp_read_line()",
+                f"call void @bpp_string_free(%bpp_string_t* {tmp})",
+            )
             return "0"
 
+        # status_string(code): a constant known code becomes its name directly
+        if func_name == "status_string":
+            code_reg = self.generate_expression(first)
+            if code_reg.lstrip('-').isdigit():
+                name = _STATUS_NAMES.get(int(code_reg))
+                if name is not None:
+                    return self._cstr_ptr(name)
+            result_reg = self._new_register()
+            self._emit(f"{result_reg} = call i8* @bpp_status_string(i32 {code_reg})")
+            return result_reg
+
         # sleep(ms): call runtime sleep
         if func_name == "sleep":
             ms_reg = self.generate_expression(first)
@@ -805,17 +1277,15 @@ class LLVMCodeGenerator:
         # Get struct type and field index
         obj_type = self._get_expression_type(expr.object)
 
-        if obj_type.kind == TypeKind.STRUCT:
-            # Find field index
+        if obj_type.kind == TypeKind.STRUCT and obj_type.fields:
+            # Find field index; fields are kept in declaration order
             field_idx = 0
-            for i, field in enumerate(obj_type.fields):
-                if field.name == expr.member:
+            for i, name in enumerate(obj_type.fields):
+                if name == expr.member:
                     field_idx = i
                     break
 
             # Extract field from struct
-            field_type = obj_type.fields[field_idx].type
-            llvm_field_type = self._get_llvm_type(field_type)
             self._emit(f"{result_reg} = extractvalue {self._get_llvm_type(obj_type)} {obj_reg}, {field_idx}")
             return result_reg
 
@@ -835,10 +1305,11 @@ class LLVMCodeGenerator:
             llvm_array_type = self._get_llvm_type(obj_type)
 
             ptr_reg = self._new_register()
-            self._emit(f"{ptr_reg} = getelementptr {llvm_array_type}, {llvm_array_type}* {obj_reg}, i32 0, i32 {index_reg}")
-
             result_reg = self._new_register()
-            self._emit(f"{result_reg} = load {llvm_elem_type}, {llvm_elem_type}* {ptr_reg}")
+            self._emit_lines(
+                f"{ptr_reg} = getelementptr {llvm_array_type}, {llvm_array_type}* {obj_reg}, i32 0, i32 {index_reg}",
+                f"{result_reg} = load {llvm_elem_type}, {llvm_elem_type}* {ptr_reg}",
+            )
             return result_reg
 
         elif obj_type.kind == TypeKind.SLICE:
@@ -846,17 +1317,15 @@ class LLVMCodeGenerator:
             elem_type = obj_type.element_type
             llvm_elem_type = self._get_llvm_type(elem_type)
 
-            # Extract data pointer from slice
+            # Extract data pointer from slice, GEP with index, load element
             ptr_reg = self._new_register()
-            self._emit(f"{ptr_reg} = extractvalue {self._get_llvm_type(obj_type)} {obj_reg}, 0")
-
-            # GEP with index
             elem_ptr_reg = self._new_register()
-            self._emit(f"{elem_ptr_reg} = getelementptr {llvm_elem_type}, {llvm_elem_type}* {ptr_reg}, i64 {index_reg}")
-
-            # Load element
             result_reg = self._new_register()
-            self._emit(f"{result_reg} = load {llvm_elem_type}, {llvm_elem_type}* {elem_ptr_reg}")
+            self._emit_lines(
+                f"{ptr_reg} = extractvalue {self._get_llvm_type(obj_type)} {obj_reg}, 0",
+                f"{elem_ptr_reg} = getelementptr {llvm_elem_type}, {llvm_elem_type}* {ptr_reg}, i64 {index_reg}",
+                f"{result_reg} = load {llvm_elem_type}, {llvm_elem_type}* {elem_ptr_reg}",
+            )
             return result_reg
 
         return "0"
@@ -880,17 +1349,18 @@ class LLVMCodeGenerator:
 
         # Allocate tuple on stack
         tuple_reg = self._new_register()
-        self._emit(f"{tuple_reg} = alloca {tuple_type}")
+        lines = [f"{tuple_reg} = alloca {tuple_type}"]
 
         # Insert each element
-        for i, (elem_reg, elem_type) in enumerate(zip(element_regs, element_types)):
+        for i, (elem_reg, llvm_elem_type) in enumerate(zip(element_regs, element_types)):
             field_ptr = self._new_register()
-            self._emit(f"{field_ptr} = getelementptr {tuple_type}, {tuple_type}* {tuple_reg}, i32 0, i32 {i}")
-            self._emit(f"store {elem_type} {elem_reg}, {elem_type}* {field_ptr}")
+            lines.append(f"{field_ptr} = getelementptr {tuple_type}, {tuple_type}* {tuple_reg}, i32 0, i32 {i}")
+            lines.append(f"store {llvm_elem_type} {elem_reg}, {llvm_elem_type}* {field_ptr}")
 
         # Load the completed tuple
         result_reg = self._new_register()
-        self._emit(f"{result_reg} = load {tuple_type}, {tuple_type}* {tuple_reg}")
+        lines.append(f"{result_reg} = load {tuple_type}, {tuple_type}* {tuple_reg}")
+        self._emit_lines(*lines)
         return result_reg
 
     def generate_array_expr(self, expr: ArrayExpr) -> str:
@@ -913,17 +1383,18 @@ class LLVMCodeGenerator:
 
         # Allocate array on stack
         array_reg = self._new_register()
-        self._emit(f"{array_reg} = alloca {array_type}")
+        lines = [f"{array_reg} = alloca {array_type}"]
 
         # Store each element
         for i, elem_reg in enumerate(element_regs):
             elem_ptr = self._new_register()
-            self._emit(f"{elem_ptr} = getelementptr {array_type}, {array_type}* {array_reg}, i32 0, i32 {i}")
-            self._emit(f"store {llvm_elem_type} {elem_reg}, {llvm_elem_type}* {elem_ptr}")
+            lines.append(f"{elem_ptr} = getelementptr {array_type}, {array_type}* {array_reg}, i32 0, i32 {i}")
+            lines.append(f"store {llvm_elem_type} {elem_reg}, {llvm_elem_type}* {elem_ptr}")
 
         # Load the completed array
         result_reg = self._new_register()
-        self._emit(f"{result_reg} = load {array_type}, {array_type}* {array_reg}")
+        lines.append(f"{result_reg} = load {array_type}, {array_type}* {array_reg}")
+        self._emit_lines(*lines)
         return result_reg
 
     def generate_try_chain_expr(self, expr) -> str:
@@ -980,8 +1451,10 @@ class LLVMCodeGenerator:
             self._emit(f"{fallback_label}:")
             self._indent()
             fallback_reg = self.generate_expression(expr.fallback)
-            self._emit(f"store {llvm_type} {fallback_reg}, {llvm_type}* {result_ptr}")
-            self._emit(f"br label %{end_label}")
+            self._emit_lines(
+                f"store {llvm_type} {fallback_reg}, {llvm_type}* {result_ptr}",
+                f"br label %{end_label}",
+            )
 
         # End
         self._dedent()
@@ -994,11 +1467,16 @@ class LLVMCodeGenerator:
 
     def _get_expression_type(self, expr: Expression) -> Type:
         """Get the type of an expression"""
-        if expr in self.type_annotations:
-            return self.type_annotations[expr]
+        typ = expr.resolved_type
+        if typ is not None:
+            return typ
+        # Annotations handed in without checking this tree
+        typ = self.type_annotations.get(expr)
+        if typ is not None:
+            return typ
 
         # Fallback type inference
-        if isinstance(expr, LiteralExpr):
+        if type(expr) is LiteralExpr:
             if expr.literal_type in ('int', 'integer'):
                 return PRIMITIVE_TYPES['i32']
             elif expr.literal_type == 'float':
@@ -1010,91 +1488,73 @@ class LLVMCodeGenerator:
 
         return PRIMITIVE_TYPES['i32']  # Default
 
-    def _get_string_literal(self, content: str) -> str:
-        """Get or create a global string literal"""
-        if content in self.string_literals:
-            return self.string_literals[content]
+    def _get_string_literal(self, content: str) -> Tuple[str, int]:
+        """Get or create a global string literal, returning its name and length"""
+        literal = self.string_literals.get(content)
+        if literal is not None:
+            return literal
 
-        # Create new string literal
-        str_name = f"@.str.{self.next_string}"
+        # Create new string literal; each distinct content gets one global
+        literal = (f"@.str.{self.next_string}", _escape_string_constant(content)[1])
         self.next_string += 1
-        self.string_literals[content] = str_name
+        self.string_literals[content] = literal
+
+        return literal
 
-        return str_name
+    def _cstr_ptr(self, content: str) -> str:
+        """A string literal's i8* as a constant GEP operand"""
+        # Needs no instruction of its own and folds to the bare global once
+        # pointers are opaque
+        global_name, length = self._get_string_literal(content)
+        return f"getelementptr inbounds ([{length} x i8], [{length} x i8]* {global_name}, i32 0, i32 0)"
 
     def _emit_string_literals(self) -> None:
         """Emit all string literals as globals"""
-        for content, name in self.string_literals.items():
-            escaped = content.replace('\\', '\\\\').replace('"', '\\"')
-            length = len(content) + 1  # +1 for null terminator
-            self._emit(f"{name} = private unnamed_addr constant [{length} x i8] c\"{escaped}\\00\"")
+        lines = []
+        for content, (name, length) in self.string_literals.items():
+            escaped = _escape_string_constant(content)[0]
+            lines.append(f"{name} = private unnamed_addr constant [{length} x i8] c\"{escaped}\\00\"\n")
+        self.output += "".join(lines).encode('utf-8')
 
     def _emit_stdlib_declarations(self) -> None:
         """Emit standard library function declarations"""
-        self._emit("")
-        self._emit("; Boogpp Runtime Library Declarations")
-        self._emit("")
-
-        # Runtime initialization
-        self._emit("declare i32 @bpp_runtime_init()")
-        self._emit("declare void @bpp_runtime_cleanup()")
-        self._emit("declare i8* @bpp_runtime_version()")
-        self._emit("")
-
-        # Memory management
-        self._emit("declare i8* @bpp_alloc(i64)")
-        self._emit("declare void @bpp_free(i8*)")
-        self._emit("declare i8* @bpp_realloc(i8*, i64)")
-        self._emit("declare void @bpp_refcount_inc(i8*)")
-        self._emit("declare void @bpp_refcount_dec(i8*)")
-        self._emit("")
-
-        # String operations (opaque type)
-        self._emit("%bpp_string_t = type opaque")
-        self._emit("declare %bpp_string_t* @bpp_string_new(i8*)")
-        self._emit("declare %bpp_string_t* @bpp_string_with_capacity(i64)")
-        self._emit("declare void @bpp_string_free(%bpp_string_t*)")
-        self._emit("declare %bpp_string_t* @bpp_string_concat(%bpp_string_t*, %bpp_string_t*)")
-        self._emit("declare i64 @bpp_string_length(%bpp_string_t*)")
-        self._emit("declare i32 @bpp_string_compare(%bpp_string_t*, %bpp_string_t*)")
-        self._emit("")
-
-        # I/O operations
-        self._emit("declare i32 @bpp_print(%bpp_string_t*)")
-        self._emit("declare i32 @bpp_println(%bpp_string_t*)")
-        self._emit("declare i32 @bpp_log(%bpp_string_t*)")
-        self._emit("declare %bpp_string_t* @bpp_read_line()")
-        self._emit("")
-
-        # Array operations (opaque type)
-        self._emit("%bpp_array_t = type opaque")
-        self._emit("declare %bpp_array_t* @bpp_array_new(i64, i64)")
-        self._emit("declare void @bpp_array_free(%bpp_array_t*)")
-        self._emit("declare i8* @bpp_array_get(%bpp_array_t*, i64)")
-        self._emit("declare i32 @bpp_array_set(%bpp_array_t*, i64, i8*)")
-        self._emit("")
-
-        # Slice operations (opaque type)
-        self._emit("%bpp_slice_t = type opaque")
-        self._emit("declare %bpp_slice_t* @bpp_slice_new(%bpp_array_t*, i64, i64)")
-        self._emit("declare void @bpp_slice_free(%bpp_slice_t*)")
-        self._emit("")
-
-        # Utility functions
-        self._emit("declare void @bpp_sleep(i32)")
-        self._emit("declare i64 @bpp_timestamp_ms()")
-        self._emit("declare i8* @bpp_status_string(i32)")
-        self._emit("")
-
-        # C standard library (for compatibility)
-        self._emit("; C Standard Library")
-        self._emit("declare void @print(i8*)")
-        self._emit("declare i8* @malloc(i64)")
-        self._emit("declare void @free(i8*)")
+        self.output += _STDLIB_DECLARATIONS
+
+
+# Dispatch tables, keyed by the concrete AST class (every node class is a leaf)
+_STATEMENT_GENERATORS: Dict[type, Callable[[LLVMCodeGenerator, Any], None]] = {
+    Block: LLVMCodeGenerator.generate_block,
+    ReturnStmt: LLVMCodeGenerator.generate_return_statement,
+    ExprStmt: LLVMCodeGenerator.generate_expression_statement,
+    VariableDecl: LLVMCodeGenerator.generate_variable_decl,
+    AssignStmt: LLVMCodeGenerator.generate_assignment,
+    IfStmt: LLVMCodeGenerator.generate_if_statement,
+    WhileStmt: LLVMCodeGenerator.generate_while_statement,
+    ForStmt: LLVMCodeGenerator.generate_for_statement,
+    PassStmt: LLVMCodeGenerator.generate_pass_statement,
+    BreakStmt: LLVMCodeGenerator.generate_break_statement,
+    ContinueStmt: LLVMCodeGenerator.generate_continue_statement,
+    MatchStmt: LLVMCodeGenerator.generate_match_statement,
+    DeferStmt: LLVMCodeGenerator.generate_defer_statement,
+}
+
+_EXPRESSION_GENERATORS: Dict[type, Callable[[LLVMCodeGenerator, Any], str]] = {
+    LiteralExpr: LLVMCodeGenerator.generate_literal,
+    CallExpr: LLVMCodeGenerator.generate_call_expr,
+    IdentifierExpr: LLVMCodeGenerator.generate_identifier,
+    BinaryExpr: LLVMCodeGenerator.generate_binary_expr,
+    UnaryExpr: LLVMCodeGenerator.generate_unary_expr,
+    MemberExpr: LLVMCodeGenerator.generate_member_expr,
+    IndexExpr: LLVMCodeGenerator.generate_index_expr,
+    TupleExpr: LLVMCodeGenerator.generate_tuple_expr,
+    ArrayExpr: LLVMCodeGenerator.generate_array_expr,
+    TryChainExpr: LLVMCodeGenerator.generate_try_chain_expr,
+}
 
 
 def generate_code(program: Program, module_name: str = "main",
-                 type_annotations: Optional[Dict[ASTNode, Type]] = None) -> str:
+                 type_annotations: Optional[Dict[ASTNode, Type]] = None,
+                 out: Optional[BinaryIO] = None) -> Optional[str]:
     """Convenience function to generate LLVM IR code"""
     codegen = LLVMCodeGenerator(module_name)
-    return codegen.generate(program, type_annotations)
+    return codegen.generate(program, type_annotations, out)
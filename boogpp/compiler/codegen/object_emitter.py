@@ -0,0 +1,73 @@
+"""
+Boogpp Object Emitter
+Emits native object files from LLVM IR in-process through llvmlite.
+"""
+
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+
+# llvmlite.binding is loaded on first use; importing it costs more than
+# the rest of the compiler's start-up
+llvm: Any = None
+
+
+def llvmlite_available() -> bool:
+    """Check whether in-process object emission is available"""
+    return llvm is not None or importlib.util.find_spec('llvmlite') is not None
+
+
+def _initialize() -> None:
+    """Import llvmlite and register LLVM targets once per process"""
+    global llvm
+    if llvm is not None:
+        return
+    import llvmlite.binding as binding
+    try:
+        binding.initialize()
+    except RuntimeError:
+        # Newer llvmlite releases initialize the core automatically
+        pass
+    binding.initialize_all_targets()
+    binding.initialize_all_asmprinters()
+    llvm = binding
+
+
+@lru_cache(maxsize=None)
+def _target_machine(triple: str, optimization_level: int):
+    """Create the target machine for a triple and level once per process"""
+    target = llvm.Target.from_triple(triple)
+    return target.create_target_machine(opt=optimization_level)
+
+
+def _optimize(module, machine, optimization_level: int) -> None:
+    """Run LLVM's standard optimization pipeline for the given level"""
+    if hasattr(llvm, 'create_pass_builder'):
+        tuning = llvm.create_pipeline_tuning_options(speed_level=optimization_level)
+        pass_builder = llvm.create_pass_builder(machine, tuning)
+        pass_builder.getModulePassManager().run(module, pass_builder)
+    else:
+        # llvmlite releases before the new pass manager
+        builder = llvm.PassManagerBuilder()
+        builder.opt_level = optimization_level
+        pass_manager = llvm.ModulePassManager()
+        builder.populate(pass_manager)
+        pass_manager.run(module)
+
+
+def emit_object(llvm_file: Path, obj_file: Path, optimization_level: int = 0) -> None:
+    """Compile a textual LLVM IR file to a native object file"""
+    _initialize()
+
+    module = llvm.parse_assembly(Path(llvm_file).read_text(encoding='utf-8'))
+    module.verify()
+
+    machine = _target_machine(module.triple or llvm.get_default_triple(), optimization_level)
+
+    # O0 is the edit-compile loop: no IR pipeline, straight to codegen
+    if optimization_level > 0:
+        _optimize(module, machine, optimization_level)
+
+    Path(obj_file).write_bytes(machine.emit_object(module))
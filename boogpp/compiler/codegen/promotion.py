@@ -0,0 +1,77 @@
+"""
+Boogpp Local Promotion
+Finds function locals that can live in SSA registers instead of stack slots.
+"""
+
+from typing import Optional, Set
+
+from ..parser.ast_nodes import (
+    Statement, Expression, FunctionDecl, VariableDecl, Block, AssignStmt, IfStmt,
+    WhileStmt, ForStmt, MatchStmt, DeferStmt, MemberExpr, IndexExpr, IdentifierExpr
+)
+
+
+def promotable_locals(func: FunctionDecl) -> Set[str]:
+    """Names of locals that can be bound directly to their initializer's value
+
+    A local qualifies when every declaration of it sits in the function's
+    outermost block, has an initializer, and the name is never assigned.
+    Such a declaration dominates every later use, and the value it binds
+    never changes, so no stack slot or phi node is needed. The language has
+    no address-of operator, so no local is address-taken.
+    """
+    if not isinstance(func.body, Block):
+        return set()
+
+    candidates = set()
+    disqualified = set()
+    for stmt in func.body.statements:
+        if isinstance(stmt, VariableDecl):
+            if stmt.initializer is None:
+                disqualified.add(stmt.name)
+            else:
+                candidates.add(stmt.name)
+        else:
+            _collect_rebound(stmt, disqualified)
+
+    return candidates - disqualified
+
+
+def _collect_rebound(stmt: Optional[Statement], names: Set[str]) -> None:
+    """Add the names a statement assigns or declares in a nested scope"""
+    if stmt is None:
+        return
+
+    if isinstance(stmt, Block):
+        for s in stmt.statements:
+            _collect_rebound(s, names)
+    elif isinstance(stmt, VariableDecl):
+        names.add(stmt.name)
+    elif isinstance(stmt, AssignStmt):
+        root = _root_name(stmt.target)
+        if root is not None:
+            names.add(root)
+    elif isinstance(stmt, IfStmt):
+        _collect_rebound(stmt.then_block, names)
+        for _, block in stmt.elif_clauses:
+            _collect_rebound(block, names)
+        _collect_rebound(stmt.else_block, names)
+    elif isinstance(stmt, WhileStmt):
+        _collect_rebound(stmt.body, names)
+    elif isinstance(stmt, ForStmt):
+        names.add(stmt.variable)
+        _collect_rebound(stmt.body, names)
+    elif isinstance(stmt, MatchStmt):
+        for case in stmt.cases:
+            _collect_rebound(case.body, names)
+    elif isinstance(stmt, DeferStmt):
+        _collect_rebound(stmt.statement, names)
+
+
+def _root_name(target: Expression) -> Optional[str]:
+    """Name of the variable an assignment target writes into, if any"""
+    while isinstance(target, (MemberExpr, IndexExpr)):
+        target = target.object
+    if isinstance(target, IdentifierExpr):
+        return target.name
+    return None
@@ -3,6 +3,7 @@ Boogpp Lexer Module
 """
 
 from .lexer import Lexer, LexerError, tokenize
-from .tokens import Token, TokenType, KEYWORDS
+from .tokens import Token, TokenStream, TokenType, KEYWORDS, KEYWORDS_GET
 
-__all__ = ['Lexer', 'LexerError', 'tokenize', 'Token', 'TokenType', 'KEYWORDS']
+__all__ = ['Lexer', 'LexerError', 'tokenize', 'Token', 'TokenStream', 'TokenType', 'KEYWORDS',
+           'KEYWORDS_GET']
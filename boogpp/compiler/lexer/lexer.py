@@ -3,11 +3,27 @@ Boogpp Lexer
 Tokenizes Boogpp source code with support for whitespace-based indentation.
 """
 
-from typing import List, Optional
-from .tokens import Token, TokenType, KEYWORDS
+import mmap
+import sys
+from typing import Optional, Union
+from .tokens import TokenStream, TokenType, KEYWORDS_GET
 import re
 
 
+# Compiled scanners for the hot paths; the regex engine walks runs of
+# characters in C instead of one peek()/advance() pair per character.
+# None of these can match a newline, so only the column needs updating.
+_IDENTIFIER = re.compile(r'\w+')
+_DECIMAL = re.compile(r'\d[\d_]*(?:\.\d[\d_]*(?:[eE][+-]?\d*)?)?')
+_HEX = re.compile(r'0[xX][0-9a-fA-F_]*')
+_BINARY = re.compile(r'0[bB][01_]*')
+_INLINE_WHITESPACE = re.compile(r'[ \t\r]+')
+_STRING_CHUNK = {
+    '"': re.compile(r'[^"\\\n]+'),
+    "'": re.compile(r"[^'\\\n]+"),
+}
+
+
 class LexerError(Exception):
     """Raised when lexer encounters an error"""
     def __init__(self, message: str, line: int, column: int, filename: Optional[str] = None):
@@ -21,13 +37,15 @@ class LexerError(Exception):
 class Lexer:
     """Tokenizes Boogpp source code"""
 
-    def __init__(self, source: str, filename: Optional[str] = None):
+    def __init__(self, source: Union[str, bytes, mmap.mmap], filename: Optional[str] = None):
+        if not isinstance(source, str):
+            source = str(source, 'utf-8')
         self.source = source
         self.filename = filename
         self.pos = 0
         self.line = 1
         self.column = 1
-        self.tokens: List[Token] = []
+        self.tokens = TokenStream(filename)
         self.indent_stack = [0]  # Track indentation levels
 
     def error(self, message: str) -> LexerError:
@@ -57,13 +75,20 @@ class Lexer:
 
         return char
 
+    def advance_to(self, end: int) -> str:
+        """Advance to end within the current line and return the skipped text"""
+        text = self.source[self.pos:end]
+        self.column += end - self.pos
+        self.pos = end
+        return text
+
     def skip_whitespace(self, include_newlines: bool = False) -> None:
         """Skip whitespace characters"""
-        while self.peek():
-            char = self.peek()
-            if char == '\n' and not include_newlines:
-                break
-            if char in ' \t\r' or (char == '\n' and include_newlines):
+        while True:
+            match = _INLINE_WHITESPACE.match(self.source, self.pos)
+            if match:
+                self.advance_to(match.end())
+            if include_newlines and self.peek() == '\n':
                 self.advance()
             else:
                 break
@@ -87,135 +112,121 @@ class Lexer:
                     self.advance()
             else:
                 # Single line comment
-                while self.peek() and self.peek() != '\n':
-                    self.advance()
+                end = self.source.find('\n', self.pos)
+                self.advance_to(len(self.source) if end == -1 else end)
 
     def read_string(self, quote: str) -> str:
         """Read a string literal"""
-        value = ""
+        parts = []
+        chunk = _STRING_CHUNK[quote]
         self.advance()  # Skip opening quote
 
         while self.peek() and self.peek() != quote:
+            match = chunk.match(self.source, self.pos)
+            if match:
+                parts.append(self.advance_to(match.end()))
+                continue
             char = self.peek()
             if char == '\\':
                 self.advance()
                 next_char = self.peek()
                 if next_char == 'n':
-                    value += '\n'
+                    parts.append('\n')
                 elif next_char == 't':
-                    value += '\t'
+                    parts.append('\t')
                 elif next_char == 'r':
-                    value += '\r'
+                    parts.append('\r')
                 elif next_char == '\\':
-                    value += '\\'
+                    parts.append('\\')
                 elif next_char == quote:
-                    value += quote
+                    parts.append(quote)
                 elif next_char == '0':
-                    value += '\0'
+                    parts.append('\0')
                 else:
-                    value += next_char
+                    parts.append(next_char)
                 self.advance()
             else:
-                value += char
+                parts.append(char)
                 self.advance()
 
         if self.peek() != quote:
             raise self.error(f"Unterminated string literal")
 
         self.advance()  # Skip closing quote
-        return value
+        return ''.join(parts)
 
-    def read_number(self) -> Token:
+    def read_number(self) -> None:
         """Read a number (integer or float)"""
         start_line = self.line
         start_column = self.column
-        value = ""
 
         # Handle hex numbers
-        if self.peek() == '0' and self.peek(1) in 'xX':
-            value += self.advance()  # 0
-            value += self.advance()  # x
-            while self.peek() and self.peek() in '0123456789abcdefABCDEF_':
-                if self.peek() != '_':
-                    value += self.advance()
-                else:
-                    self.advance()
-            return Token(TokenType.INTEGER_LITERAL, int(value, 16), start_line, start_column, self.filename)
+        match = _HEX.match(self.source, self.pos)
+        if match:
+            value = self.advance_to(match.end()).replace('_', '')
+            self.tokens.append(TokenType.INTEGER_LITERAL, int(value, 16), start_line, start_column)
+            return
 
         # Handle binary numbers
-        if self.peek() == '0' and self.peek(1) in 'bB':
-            value += self.advance()  # 0
-            value += self.advance()  # b
-            while self.peek() and self.peek() in '01_':
-                if self.peek() != '_':
-                    value += self.advance()
-                else:
-                    self.advance()
-            return Token(TokenType.INTEGER_LITERAL, int(value, 2), start_line, start_column, self.filename)
-
-        # Regular decimal number
-        while self.peek() and (self.peek().isdigit() or self.peek() == '_'):
-            if self.peek() != '_':
-                value += self.advance()
-            else:
-                self.advance()
-
-        # Check for float
-        if self.peek() == '.' and self.peek(1) and self.peek(1).isdigit():
-            value += self.advance()  # .
-            while self.peek() and (self.peek().isdigit() or self.peek() == '_'):
-                if self.peek() != '_':
-                    value += self.advance()
-                else:
-                    self.advance()
-
-            # Scientific notation
-            if self.peek() and self.peek() in 'eE':
-                value += self.advance()
-                if self.peek() and self.peek() in '+-':
-                    value += self.advance()
-                while self.peek() and self.peek().isdigit():
-                    value += self.advance()
-
-            return Token(TokenType.FLOAT_LITERAL, float(value), start_line, start_column, self.filename)
-
-        return Token(TokenType.INTEGER_LITERAL, int(value), start_line, start_column, self.filename)
-
-    def read_identifier(self) -> Token:
+        match = _BINARY.match(self.source, self.pos)
+        if match:
+            value = self.advance_to(match.end()).replace('_', '')
+            self.tokens.append(TokenType.INTEGER_LITERAL, int(value, 2), start_line, start_column)
+            return
+
+        # Regular decimal number, with optional fraction and exponent
+        match = _DECIMAL.match(self.source, self.pos)
+        if not match:
+            raise self.error(f"Invalid number literal: {self.peek()}")
+        value = self.advance_to(match.end()).replace('_', '')
+        if '.' in value:
+            self.tokens.append(TokenType.FLOAT_LITERAL, float(value), start_line, start_column)
+            return
+
+        self.tokens.append(TokenType.INTEGER_LITERAL, int(value), start_line, start_column)
+
+    def read_identifier(self) -> None:
         """Read an identifier or keyword"""
         start_line = self.line
         start_column = self.column
-        value = ""
 
-        while self.peek() and (self.peek().isalnum() or self.peek() == '_'):
-            value += self.advance()
+        # advance_to, inlined: identifiers are the most common token
+        pos = self.pos
+        end = _IDENTIFIER.match(self.source, pos).end()
+        self.column += end - pos
+        self.pos = end
+
+        # Every word is interned, so keyword tokens share the keyword string,
+        # and later name comparisons and symbol-table lookups (the keyword
+        # table's included) hit the identity fast path; the interned string
+        # also carries its hash, so the keyword probe never rehashes it
+        value = sys.intern(self.source[pos:end])
 
         # Check if it's a keyword
-        token_type = KEYWORDS.get(value, TokenType.IDENTIFIER)
+        token_type = KEYWORDS_GET(value)
+        if token_type is None:
+            token_type = TokenType.IDENTIFIER
 
-        return Token(token_type, value, start_line, start_column, self.filename)
+        self.tokens.append(token_type, value, start_line, start_column)
 
-    def handle_indentation(self, spaces: int) -> List[Token]:
+    def handle_indentation(self, spaces: int) -> None:
         """Handle indentation at start of line"""
-        tokens = []
         current_indent = self.indent_stack[-1]
 
         if spaces > current_indent:
             # INDENT
             self.indent_stack.append(spaces)
-            tokens.append(Token(TokenType.INDENT, spaces, self.line, 1, self.filename))
+            self.tokens.append(TokenType.INDENT, spaces, self.line, 1)
         elif spaces < current_indent:
             # DEDENT (possibly multiple)
             while self.indent_stack and self.indent_stack[-1] > spaces:
                 self.indent_stack.pop()
-                tokens.append(Token(TokenType.DEDENT, spaces, self.line, 1, self.filename))
+                self.tokens.append(TokenType.DEDENT, spaces, self.line, 1)
 
             if self.indent_stack[-1] != spaces:
                 raise self.error("Indentation error: mismatched indentation")
 
-        return tokens
-
-    def tokenize(self) -> List[Token]:
+    def tokenize(self) -> TokenStream:
         """Tokenize the entire source code"""
         at_line_start = True
 
@@ -242,8 +253,7 @@ class Lexer:
 
                 # Only process indentation if line is not empty
                 if self.peek() and self.peek() not in '\n\r#':
-                    indent_tokens = self.handle_indentation(spaces)
-                    self.tokens.extend(indent_tokens)
+                    self.handle_indentation(spaces)
 
                 at_line_start = False
                 continue
@@ -257,26 +267,24 @@ class Lexer:
                 if char == '\r' and self.peek(1) == '\n':
                     self.advance()
                 self.advance()
-                self.tokens.append(Token(TokenType.NEWLINE, '\\n', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.NEWLINE, '\\n', start_line, start_column)
                 at_line_start = True
                 continue
 
             # String literals
             if char in '"\'':
                 value = self.read_string(char)
-                self.tokens.append(Token(TokenType.STRING_LITERAL, value, start_line, start_column, self.filename))
+                self.tokens.append(TokenType.STRING_LITERAL, value, start_line, start_column)
                 continue
 
             # Numbers
             if char.isdigit():
-                token = self.read_number()
-                self.tokens.append(token)
+                self.read_number()
                 continue
 
             # Identifiers and keywords
             if char.isalpha() or char == '_':
-                token = self.read_identifier()
-                self.tokens.append(token)
+                self.read_identifier()
                 continue
 
             # Operators and delimiters
@@ -284,67 +292,67 @@ class Lexer:
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.PLUS_ASSIGN, '+=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.PLUS_ASSIGN, '+=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.PLUS, '+', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.PLUS, '+', start_line, start_column)
                 continue
 
             if char == '-':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.MINUS_ASSIGN, '-=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.MINUS_ASSIGN, '-=', start_line, start_column)
                 elif self.peek() == '>':
                     self.advance()
-                    self.tokens.append(Token(TokenType.ARROW, '->', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.ARROW, '->', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.MINUS, '-', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.MINUS, '-', start_line, start_column)
                 continue
 
             if char == '*':
                 self.advance()
                 if self.peek() == '*':
                     self.advance()
-                    self.tokens.append(Token(TokenType.POWER, '**', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.POWER, '**', start_line, start_column)
                 elif self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.STAR_ASSIGN, '*=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.STAR_ASSIGN, '*=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.STAR, '*', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.STAR, '*', start_line, start_column)
                 continue
 
             if char == '/':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.SLASH_ASSIGN, '/=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.SLASH_ASSIGN, '/=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.SLASH, '/', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.SLASH, '/', start_line, start_column)
                 continue
 
             if char == '%':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.PERCENT_ASSIGN, '%=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.PERCENT_ASSIGN, '%=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.PERCENT, '%', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.PERCENT, '%', start_line, start_column)
                 continue
 
             if char == '=':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.EQ, '==', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.EQ, '==', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.ASSIGN, '=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.ASSIGN, '=', start_line, start_column)
                 continue
 
             if char == '!':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.NE, '!=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.NE, '!=', start_line, start_column)
                 else:
                     raise self.error(f"Unexpected character: {char}")
                 continue
@@ -353,119 +361,119 @@ class Lexer:
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.LE, '<=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.LE, '<=', start_line, start_column)
                 elif self.peek() == '<':
                     self.advance()
-                    self.tokens.append(Token(TokenType.LSHIFT, '<<', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.LSHIFT, '<<', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.LT, '<', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.LT, '<', start_line, start_column)
                 continue
 
             if char == '>':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.GE, '>=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.GE, '>=', start_line, start_column)
                 elif self.peek() == '>':
                     self.advance()
-                    self.tokens.append(Token(TokenType.RSHIFT, '>>', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.RSHIFT, '>>', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.GT, '>', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.GT, '>', start_line, start_column)
                 continue
 
             if char == '&':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.AND_ASSIGN, '&=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.AND_ASSIGN, '&=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.AMPERSAND, '&', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.AMPERSAND, '&', start_line, start_column)
                 continue
 
             if char == '|':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.OR_ASSIGN, '|=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.OR_ASSIGN, '|=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.PIPE, '|', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.PIPE, '|', start_line, start_column)
                 continue
 
             if char == '^':
                 self.advance()
                 if self.peek() == '=':
                     self.advance()
-                    self.tokens.append(Token(TokenType.XOR_ASSIGN, '^=', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.XOR_ASSIGN, '^=', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.CARET, '^', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.CARET, '^', start_line, start_column)
                 continue
 
             if char == '~':
                 self.advance()
-                self.tokens.append(Token(TokenType.TILDE, '~', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.TILDE, '~', start_line, start_column)
                 continue
 
             if char == '(':
                 self.advance()
-                self.tokens.append(Token(TokenType.LPAREN, '(', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.LPAREN, '(', start_line, start_column)
                 continue
 
             if char == ')':
                 self.advance()
-                self.tokens.append(Token(TokenType.RPAREN, ')', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.RPAREN, ')', start_line, start_column)
                 continue
 
             if char == '[':
                 self.advance()
-                self.tokens.append(Token(TokenType.LBRACKET, '[', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.LBRACKET, '[', start_line, start_column)
                 continue
 
             if char == ']':
                 self.advance()
-                self.tokens.append(Token(TokenType.RBRACKET, ']', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.RBRACKET, ']', start_line, start_column)
                 continue
 
             if char == '{':
                 self.advance()
-                self.tokens.append(Token(TokenType.LBRACE, '{', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.LBRACE, '{', start_line, start_column)
                 continue
 
             if char == '}':
                 self.advance()
-                self.tokens.append(Token(TokenType.RBRACE, '}', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.RBRACE, '}', start_line, start_column)
                 continue
 
             if char == ',':
                 self.advance()
-                self.tokens.append(Token(TokenType.COMMA, ',', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.COMMA, ',', start_line, start_column)
                 continue
 
             if char == '.':
                 self.advance()
                 if self.peek() == '.':
                     self.advance()
-                    self.tokens.append(Token(TokenType.RANGE, '..', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.RANGE, '..', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.DOT, '.', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.DOT, '.', start_line, start_column)
                 continue
 
             if char == ':':
                 self.advance()
                 if self.peek() == ':':
                     self.advance()
-                    self.tokens.append(Token(TokenType.DOUBLE_COLON, '::', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.DOUBLE_COLON, '::', start_line, start_column)
                 else:
-                    self.tokens.append(Token(TokenType.COLON, ':', start_line, start_column, self.filename))
+                    self.tokens.append(TokenType.COLON, ':', start_line, start_column)
                 continue
 
             if char == ';':
                 self.advance()
-                self.tokens.append(Token(TokenType.SEMICOLON, ';', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.SEMICOLON, ';', start_line, start_column)
                 continue
 
             if char == '@':
                 self.advance()
-                self.tokens.append(Token(TokenType.AT, '@', start_line, start_column, self.filename))
+                self.tokens.append(TokenType.AT, '@', start_line, start_column)
                 continue
 
             raise self.error(f"Unexpected character: {char}")
@@ -473,15 +481,15 @@ class Lexer:
         # Handle remaining dedents
         while len(self.indent_stack) > 1:
             self.indent_stack.pop()
-            self.tokens.append(Token(TokenType.DEDENT, 0, self.line, self.column, self.filename))
+            self.tokens.append(TokenType.DEDENT, 0, self.line, self.column)
 
         # Add EOF token
-        self.tokens.append(Token(TokenType.EOF, None, self.line, self.column, self.filename))
+        self.tokens.append(TokenType.EOF, None, self.line, self.column)
 
         return self.tokens
 
 
-def tokenize(source: str, filename: Optional[str] = None) -> List[Token]:
+def tokenize(source: Union[str, bytes, mmap.mmap], filename: Optional[str] = None) -> TokenStream:
     """Convenience function to tokenize source code"""
     lexer = Lexer(source, filename)
     return lexer.tokenize()
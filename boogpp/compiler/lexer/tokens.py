@@ -3,12 +3,16 @@ Boogpp Token Definitions
 Defines all token types used by the lexer.
 """
 
-from enum import Enum, auto
-from dataclasses import dataclass
-from typing import Any, Optional
+from array import array
+from collections.abc import Sequence
+from enum import IntEnum, auto
+from types import MappingProxyType
+from typing import Any, List, Optional
 
 
-class TokenType(Enum):
+# IntEnum so members hash as ints in C rather than through Enum.__hash__,
+# which runs in Python on every dict or set probe keyed by a token type
+class TokenType(IntEnum):
     """All token types in Boogpp language"""
 
     # Keywords
@@ -130,14 +134,25 @@ class TokenType(Enum):
     COMMENT = auto()
 
 
-@dataclass
 class Token:
     """Represents a single token in the source code"""
-    type: TokenType
-    value: Any
-    line: int
-    column: int
-    filename: Optional[str] = None
+
+    # Written out rather than a dataclass: slots=True needs Python 3.10
+    __slots__ = ('type', 'value', 'line', 'column', 'filename')
+
+    def __init__(self, type: TokenType, value: Any, line: int, column: int,
+                 filename: Optional[str] = None):
+        self.type = type
+        self.value = value
+        self.line = line
+        self.column = column
+        self.filename = filename
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return ((self.type, self.value, self.line, self.column, self.filename) ==
+                (other.type, other.value, other.line, other.column, other.filename))
 
     def __repr__(self) -> str:
         return f"Token({self.type.name}, {repr(self.value)}, {self.line}:{self.column})"
@@ -146,6 +161,38 @@ class Token:
         return f"{self.type.name}({self.value})"
 
 
+class TokenStream(Sequence):
+    """Token sequence stored as parallel columns; Token objects are built on access"""
+
+    __slots__ = ('types', 'values', 'lines', 'columns', 'filename')
+
+    def __init__(self, filename: Optional[str] = None):
+        self.types: List[TokenType] = []
+        self.values: List[Any] = []
+        self.lines = array('i')
+        self.columns = array('i')
+        self.filename = filename
+
+    def append(self, token_type: TokenType, value: Any, line: int, column: int) -> None:
+        """Append a token"""
+        self.types.append(token_type)
+        self.values.append(value)
+        self.lines.append(line)
+        self.columns.append(column)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.types)))]
+        return Token(self.types[index], self.values[index], self.lines[index],
+                     self.columns[index], self.filename)
+
+    def __repr__(self) -> str:
+        return f"TokenStream({len(self.types)} tokens, {self.filename!r})"
+
+
 # Keyword mapping
 KEYWORDS = {
     'func': TokenType.FUNC,
@@ -204,6 +251,11 @@ KEYWORDS = {
     'result': TokenType.RESULT,
 }
 
+# The lexer probes every identifier through this bound method, saving an
+# attribute lookup per call; the public mapping itself is read-only
+KEYWORDS_GET = KEYWORDS.get
+KEYWORDS = MappingProxyType(KEYWORDS)
+
 
 # Safety-related constants
 SAFETY_MODES = ['SAFE', 'UNSAFE', 'CUSTOM']
@@ -0,0 +1,115 @@
+"""
+Boogpp Parallel Analysis
+Runs safety checking, type checking and code generation per top-level
+declaration on a process pool, then merges the results in source order.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from .parser.ast_nodes import ASTNode, Program
+from .safety import SafetyChecker, SafetyMode, SafetyViolation
+from .typechecker import TypeChecker, Type
+from .codegen import LLVMCodeGenerator
+
+
+# Below this many declarations, process start-up costs more than it saves
+PARALLEL_MIN_DECLS = 4
+
+# Per-process checker state, installed once by _init_worker
+_worker_state: Optional[Tuple[SafetyChecker, TypeChecker, LLVMCodeGenerator]] = None
+
+
+class ParallelResult:
+    """Merged per-declaration results"""
+
+    def __init__(self):
+        self.violations: List[SafetyViolation] = []
+        self.type_errors: List = []
+        self.type_annotations: Dict[ASTNode, Type] = {}
+        self.llvm_ir: Optional[bytearray] = None
+
+
+def _init_worker(safety_checker: SafetyChecker, type_checker: TypeChecker,
+                 code_generator: LLVMCodeGenerator) -> None:
+    """Install the prepared checkers in a worker process"""
+    global _worker_state
+    _worker_state = (safety_checker, type_checker, code_generator)
+
+
+def _process_declaration(decl: ASTNode) -> Tuple:
+    """Check and generate code for one declaration inside a worker"""
+    if _worker_state is None:
+        raise RuntimeError("parallel worker used without _init_worker; start the pool with it as initializer")
+    safety_checker, type_checker, code_generator = _worker_state
+
+    safety_checker.violations = []
+    safety_checker.check_declaration(decl)
+
+    type_checker.errors = []
+    type_checker.type_annotations = {}
+    type_checker.check_declaration(decl)
+
+    # Code generation only matters when the checks pass; failures are
+    # reproduced by the serial generator so the error surfaces normally
+    try:
+        code_generator.type_annotations = type_checker.type_annotations
+        fragment = code_generator.generate_fragment(decl)
+    except Exception:
+        fragment = None
+
+    # The declaration is returned with its results so that node identity
+    # (annotation keys, violation nodes) survives the trip back
+    return (decl, safety_checker.violations, type_checker.errors,
+            type_checker.type_annotations, fragment)
+
+
+def analyze_parallel(program: Program, module_name: str,
+                     safety_mode: SafetyMode, jobs: int) -> ParallelResult:
+    """Run safety checking, type checking and code generation per declaration"""
+    result = ParallelResult()
+
+    safety_checker = SafetyChecker(safety_mode)
+    safety_checker.apply_file_decorators(program)
+    # Workers start from an empty list, so file-level violations are kept here
+    result.violations.extend(safety_checker.violations)
+
+    type_checker = TypeChecker()
+    type_checker.register_declarations(program)
+    result.type_errors.extend(type_checker.errors)
+
+    code_generator = LLVMCodeGenerator(module_name)
+    code_generator.begin_module(program)
+    header = code_generator.output
+    code_generator.output = bytearray()
+
+    workers = min(jobs, len(program.declarations))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(safety_checker, type_checker, code_generator)) as pool:
+        outputs = list(pool.map(_process_declaration, program.declarations))
+
+    fragments = []
+    for i, (decl, violations, type_errors, annotations, fragment) in enumerate(outputs):
+        program.declarations[i] = decl
+        result.violations.extend(violations)
+        result.type_errors.extend(type_errors)
+        result.type_annotations.update(annotations)
+        fragments.append(fragment)
+
+    if all(fragment is not None for fragment in fragments):
+        result.llvm_ir = _merge_fragments(code_generator, header, fragments)
+
+    return result
+
+
+def _merge_fragments(code_generator: LLVMCodeGenerator, header: bytearray,
+                     fragments: List[Tuple[bytearray, List[Tuple[str, Tuple[str, int]]]]]) -> bytearray:
+    """Join per-declaration IR, renumbering string literals module-wide"""
+    code_generator.output = header
+    code_generator.string_literals = {}
+    code_generator.next_string = 1
+
+    for code, strings in fragments:
+        code_generator.append_fragment(code, strings)
+
+    return code_generator.finish_module()
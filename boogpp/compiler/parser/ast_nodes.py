@@ -2,12 +2,16 @@
 Boogpp Abstract Syntax Tree Node Definitions
 """
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Any, Union
-from enum import Enum, auto
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Any, Union
+from enum import IntEnum, auto
 
+if TYPE_CHECKING:
+    from ..typechecker.type_system import Type
 
-class NodeType(Enum):
+
+# IntEnum so members hash as ints in C rather than through Enum.__hash__,
+# which runs in Python on every dict or set probe keyed by a node type
+class NodeType(IntEnum):
     """AST Node Types"""
     # Program structure
     PROGRAM = auto()
@@ -67,21 +71,30 @@ class NodeType(Enum):
 
 class ASTNode:
     """Base class for all AST nodes"""
+    # Every node class lists the attributes it adds, so no node carries a
+    # per-instance __dict__. The expression nodes built most often (literal,
+    # identifier, binary, call, member) assign these fields inline rather
+    # than through super().__init__; keep them in step
+    __slots__ = ('line', 'column', 'filename', 'resolved_type')
+    node_type: Optional[NodeType] = None  # a per-class constant on each concrete node
+
     def __init__(self, line: int, column: int, filename: Optional[str] = None):
         self.line = line
         self.column = column
         self.filename = filename
-        self.node_type = None
+        self.resolved_type: Optional['Type'] = None  # set by the type checker
 
 
 # ===== Program Structure =====
 
 class Program(ASTNode):
     """Root node of the AST"""
+    __slots__ = ('decorators', 'module_decl', 'imports', 'declarations')
+    node_type = NodeType.PROGRAM
+
     def __init__(self, decorators: List, module_decl: Optional['ModuleDecl'],
                  imports: List, declarations: List, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.PROGRAM
         self.decorators = decorators
         self.module_decl = module_decl
         self.imports = imports
@@ -90,26 +103,32 @@ class Program(ASTNode):
 
 class ModuleDecl(ASTNode):
     """Module declaration: module my_module"""
+    __slots__ = ('name',)
+    node_type = NodeType.MODULE
+
     def __init__(self, name: str, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.MODULE
         self.name = name
 
 
 class ImportStmt(ASTNode):
     """Import statement: import windows.registry"""
+    __slots__ = ('module_path', 'alias')
+    node_type = NodeType.IMPORT
+
     def __init__(self, module_path: List[str], alias: Optional[str], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.IMPORT
         self.module_path = module_path
         self.alias = alias
 
 
 class FromImportStmt(ASTNode):
     """From import: from windows.user32 import MessageBoxW"""
+    __slots__ = ('module_path', 'names')
+    node_type = NodeType.FROM_IMPORT
+
     def __init__(self, module_path: List[str], names: List[str], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.FROM_IMPORT
         self.module_path = module_path
         self.names = names
 
@@ -118,55 +137,67 @@ class FromImportStmt(ASTNode):
 
 class TypeNode(ASTNode):
     """Base class for type nodes"""
-    pass
+    __slots__ = ()
 
 
 class TypeName(TypeNode):
     """Simple type name: i32, string, etc."""
+    __slots__ = ('name',)
+    node_type = NodeType.TYPE_NAME
+
     def __init__(self, name: str, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_NAME
         self.name = name
 
 
 class TypePtr(TypeNode):
     """Pointer type: ptr[T]"""
+    __slots__ = ('element_type',)
+    node_type = NodeType.TYPE_PTR
+
     def __init__(self, element_type: TypeNode, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_PTR
         self.element_type = element_type
 
 
 class TypeArray(TypeNode):
     """Array type: array[T, N]"""
+    __slots__ = ('element_type', 'size')
+    node_type = NodeType.TYPE_ARRAY
+
     def __init__(self, element_type: TypeNode, size: int, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_ARRAY
         self.element_type = element_type
         self.size = size
 
 
 class TypeSlice(TypeNode):
     """Slice type: slice[T]"""
+    __slots__ = ('element_type',)
+    node_type = NodeType.TYPE_SLICE
+
     def __init__(self, element_type: TypeNode, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_SLICE
         self.element_type = element_type
 
 
 class TypeTuple(TypeNode):
     """Tuple type: tuple(T1, T2, ...)"""
+    __slots__ = ('element_types',)
+    node_type = NodeType.TYPE_TUPLE
+
     def __init__(self, element_types: List[TypeNode], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_TUPLE
         self.element_types = element_types
 
 
 class TypeResult(TypeNode):
     """Result type: result[T]"""
+    __slots__ = ('value_type',)
+    node_type = NodeType.TYPE_RESULT
+
     def __init__(self, value_type: TypeNode, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TYPE_RESULT
         self.value_type = value_type
 
 
@@ -174,9 +205,11 @@ class TypeResult(TypeNode):
 
 class Decorator(ASTNode):
     """Decorator: @hook(event: PROCESS_CREATION)"""
+    __slots__ = ('name', 'arguments')
+    node_type = NodeType.DECORATOR
+
     def __init__(self, name: str, arguments: dict, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.DECORATOR
         self.name = name
         self.arguments = arguments
 
@@ -185,10 +218,12 @@ class Decorator(ASTNode):
 
 class Parameter(ASTNode):
     """Function parameter"""
+    __slots__ = ('name', 'type_annotation', 'default_value')
+    node_type = NodeType.PARAMETER
+
     def __init__(self, name: str, type_annotation: TypeNode, default_value: Optional['Expression'],
                  line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.PARAMETER
         self.name = name
         self.type_annotation = type_annotation
         self.default_value = default_value
@@ -196,31 +231,37 @@ class Parameter(ASTNode):
 
 class FunctionDecl(ASTNode):
     """Function declaration"""
+    __slots__ = ('name', 'parameters', 'return_type', 'body', 'decorators', 'has_calls')
+    node_type = NodeType.FUNCTION_DECL
+
     def __init__(self, name: str, parameters: List[Parameter], return_type: Optional[TypeNode],
-                 body: 'Block', decorators: List[Decorator], line: int, column: int, filename: Optional[str] = None):
+                 body: 'Block', decorators: List[Decorator], line: int, column: int, filename: Optional[str] = None,
+                 has_calls: bool = True):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.FUNCTION_DECL
         self.name = name
         self.parameters = parameters
         self.return_type = return_type
         self.body = body
         self.decorators = decorators
+        self.has_calls = has_calls  # False only when the parser saw no call in the body
 
 
 class VariableDecl(ASTNode):
     """Variable declaration: let/var name: type = value"""
+    __slots__ = ('name', 'type_annotation', 'initializer', 'is_mutable')
+    node_type = NodeType.VARIABLE_DECL
+
     def __init__(self, name: str, type_annotation: Optional[TypeNode], initializer: Optional['Expression'],
                  is_mutable: bool, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.VARIABLE_DECL
         self.name = name
         self.type_annotation = type_annotation
         self.initializer = initializer
         self.is_mutable = is_mutable
 
 
-@dataclass
-class StructField:
+# Fields and variants are plain records, so tuples rather than node objects
+class StructField(NamedTuple):
     """Struct field"""
     name: str
     type_annotation: TypeNode
@@ -228,15 +269,16 @@ class StructField:
 
 class StructDecl(ASTNode):
     """Struct declaration"""
+    __slots__ = ('name', 'fields')
+    node_type = NodeType.STRUCT_DECL
+
     def __init__(self, name: str, fields: List[StructField], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.STRUCT_DECL
         self.name = name
         self.fields = fields
 
 
-@dataclass
-class EnumVariant:
+class EnumVariant(NamedTuple):
     """Enum variant"""
     name: str
     value: Optional[int] = None
@@ -244,9 +286,11 @@ class EnumVariant:
 
 class EnumDecl(ASTNode):
     """Enum declaration"""
+    __slots__ = ('name', 'variants')
+    node_type = NodeType.ENUM_DECL
+
     def __init__(self, name: str, variants: List[EnumVariant], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.ENUM_DECL
         self.name = name
         self.variants = variants
 
@@ -255,31 +299,37 @@ class EnumDecl(ASTNode):
 
 class Statement(ASTNode):
     """Base class for statements"""
-    pass
+    __slots__ = ()
 
 
 class Block(Statement):
     """Block of statements"""
+    __slots__ = ('statements',)
+    node_type = NodeType.BLOCK
+
     def __init__(self, statements: List[Statement], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.BLOCK
         self.statements = statements
 
 
 class ReturnStmt(Statement):
     """Return statement"""
+    __slots__ = ('value',)
+    node_type = NodeType.RETURN_STMT
+
     def __init__(self, value: Optional['Expression'], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.RETURN_STMT
         self.value = value
 
 
 class IfStmt(Statement):
     """If statement"""
+    __slots__ = ('condition', 'then_block', 'elif_clauses', 'else_block')
+    node_type = NodeType.IF_STMT
+
     def __init__(self, condition: 'Expression', then_block: Block, elif_clauses: List,
                  else_block: Optional[Block], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.IF_STMT
         self.condition = condition
         self.then_block = then_block
         self.elif_clauses = elif_clauses
@@ -288,19 +338,23 @@ class IfStmt(Statement):
 
 class WhileStmt(Statement):
     """While statement"""
+    __slots__ = ('condition', 'body')
+    node_type = NodeType.WHILE_STMT
+
     def __init__(self, condition: 'Expression', body: Block, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.WHILE_STMT
         self.condition = condition
         self.body = body
 
 
 class ForStmt(Statement):
     """For statement"""
+    __slots__ = ('variable', 'iterable', 'body')
+    node_type = NodeType.FOR_STMT
+
     def __init__(self, variable: str, iterable: 'Expression', body: Block,
                  line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.FOR_STMT
         self.variable = variable
         self.iterable = iterable
         self.body = body
@@ -308,36 +362,44 @@ class ForStmt(Statement):
 
 class CaseClause(ASTNode):
     """Match case clause"""
+    __slots__ = ('pattern', 'body')
+    node_type = NodeType.CASE_CLAUSE
+
     def __init__(self, pattern: 'Expression', body: Block, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.CASE_CLAUSE
         self.pattern = pattern
         self.body = body
 
 
 class MatchStmt(Statement):
     """Match statement"""
+    __slots__ = ('value', 'cases')
+    node_type = NodeType.MATCH_STMT
+
     def __init__(self, value: 'Expression', cases: List[CaseClause], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.MATCH_STMT
         self.value = value
         self.cases = cases
 
 
 class ExprStmt(Statement):
     """Expression statement"""
+    __slots__ = ('expression',)
+    node_type = NodeType.EXPR_STMT
+
     def __init__(self, expression: 'Expression', line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.EXPR_STMT
         self.expression = expression
 
 
 class AssignStmt(Statement):
     """Assignment statement"""
+    __slots__ = ('target', 'value', 'operator')
+    node_type = NodeType.ASSIGN_STMT
+
     def __init__(self, target: 'Expression', value: 'Expression', operator: str,
                  line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.ASSIGN_STMT
         self.target = target
         self.value = value
         self.operator = operator
@@ -345,30 +407,38 @@ class AssignStmt(Statement):
 
 class PassStmt(Statement):
     """Pass statement"""
+    __slots__ = ()
+    node_type = NodeType.PASS_STMT
+
     def __init__(self, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.PASS_STMT
 
 
 class BreakStmt(Statement):
     """Break statement"""
+    __slots__ = ()
+    node_type = NodeType.BREAK_STMT
+
     def __init__(self, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.BREAK_STMT
 
 
 class ContinueStmt(Statement):
     """Continue statement"""
+    __slots__ = ()
+    node_type = NodeType.CONTINUE_STMT
+
     def __init__(self, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.CONTINUE_STMT
 
 
 class DeferStmt(Statement):
     """Defer statement"""
+    __slots__ = ('statement',)
+    node_type = NodeType.DEFER_STMT
+
     def __init__(self, statement: Statement, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.DEFER_STMT
         self.statement = statement
 
 
@@ -376,32 +446,47 @@ class DeferStmt(Statement):
 
 class Expression(ASTNode):
     """Base class for expressions"""
-    pass
+    __slots__ = ()
 
 
 class LiteralExpr(Expression):
     """Literal expression"""
+    __slots__ = ('value', 'literal_type')
+    node_type = NodeType.LITERAL_EXPR
+
     def __init__(self, value: Any, literal_type: str, line: int, column: int, filename: Optional[str] = None):
-        super().__init__(line, column, filename)
-        self.node_type = NodeType.LITERAL_EXPR
+        self.line = line
+        self.column = column
+        self.filename = filename
+        self.resolved_type = None
         self.value = value
         self.literal_type = literal_type
 
 
 class IdentifierExpr(Expression):
     """Identifier expression"""
+    __slots__ = ('name',)
+    node_type = NodeType.IDENTIFIER_EXPR
+
     def __init__(self, name: str, line: int, column: int, filename: Optional[str] = None):
-        super().__init__(line, column, filename)
-        self.node_type = NodeType.IDENTIFIER_EXPR
+        self.line = line
+        self.column = column
+        self.filename = filename
+        self.resolved_type = None
         self.name = name
 
 
 class BinaryExpr(Expression):
     """Binary expression"""
+    __slots__ = ('left', 'operator', 'right')
+    node_type = NodeType.BINARY_EXPR
+
     def __init__(self, left: Expression, operator: str, right: Expression,
                  line: int, column: int, filename: Optional[str] = None):
-        super().__init__(line, column, filename)
-        self.node_type = NodeType.BINARY_EXPR
+        self.line = line
+        self.column = column
+        self.filename = filename
+        self.resolved_type = None
         self.left = left
         self.operator = operator
         self.right = right
@@ -409,63 +494,86 @@ class BinaryExpr(Expression):
 
 class UnaryExpr(Expression):
     """Unary expression"""
+    __slots__ = ('operator', 'operand')
+    node_type = NodeType.UNARY_EXPR
+
     def __init__(self, operator: str, operand: Expression, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.UNARY_EXPR
         self.operator = operator
         self.operand = operand
 
 
 class CallExpr(Expression):
     """Function call expression"""
+    # call_name is left unset here; the safety checkers fill it in on first
+    # use with the callee's dotted name (see resolve_call_name)
+    __slots__ = ('callee', 'arguments', 'call_name')
+    node_type = NodeType.CALL_EXPR
+    call_name: Optional[str]
+
     def __init__(self, callee: Expression, arguments: List[Expression],
                  line: int, column: int, filename: Optional[str] = None):
-        super().__init__(line, column, filename)
-        self.node_type = NodeType.CALL_EXPR
+        self.line = line
+        self.column = column
+        self.filename = filename
+        self.resolved_type = None
         self.callee = callee
         self.arguments = arguments
 
 
 class MemberExpr(Expression):
     """Member access expression: obj.member"""
+    __slots__ = ('object', 'member')
+    node_type = NodeType.MEMBER_EXPR
+
     def __init__(self, object: Expression, member: str, line: int, column: int, filename: Optional[str] = None):
-        super().__init__(line, column, filename)
-        self.node_type = NodeType.MEMBER_EXPR
+        self.line = line
+        self.column = column
+        self.filename = filename
+        self.resolved_type = None
         self.object = object
         self.member = member
 
 
 class IndexExpr(Expression):
     """Index expression: arr[index]"""
+    __slots__ = ('object', 'index')
+    node_type = NodeType.INDEX_EXPR
+
     def __init__(self, object: Expression, index: Expression, line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.INDEX_EXPR
         self.object = object
         self.index = index
 
 
 class TupleExpr(Expression):
     """Tuple expression"""
+    __slots__ = ('elements',)
+    node_type = NodeType.TUPLE_EXPR
+
     def __init__(self, elements: List[Expression], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TUPLE_EXPR
         self.elements = elements
 
 
 class ArrayExpr(Expression):
     """Array literal expression"""
+    __slots__ = ('elements',)
+    node_type = NodeType.ARRAY_EXPR
+
     def __init__(self, elements: List[Expression], line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.ARRAY_EXPR
         self.elements = elements
 
 
 class TryChainExpr(Expression):
     """try_chain expression"""
+    __slots__ = ('primary', 'secondary', 'fallback')
+    node_type = NodeType.TRY_CHAIN_EXPR
+
     def __init__(self, primary: Expression, secondary: Optional[Expression], fallback: Optional[Expression],
                  line: int, column: int, filename: Optional[str] = None):
         super().__init__(line, column, filename)
-        self.node_type = NodeType.TRY_CHAIN_EXPR
         self.primary = primary
         self.secondary = secondary
         self.fallback = fallback
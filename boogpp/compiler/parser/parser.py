@@ -3,9 +3,35 @@ Boogpp Parser
 Builds an Abstract Syntax Tree from tokens.
 """
 
-from typing import List, Optional, Union
-from ..lexer.tokens import Token, TokenType
-from .ast_nodes import *
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union, cast
+from ..lexer.tokens import Token, TokenStream, TokenType
+from .ast_nodes import (
+    ASTNode, Program, ModuleDecl, ImportStmt, FromImportStmt, Decorator, Parameter,
+    TypeNode, TypeName, TypePtr, TypeArray, TypeSlice, TypeTuple, TypeResult,
+    FunctionDecl, VariableDecl, Statement, Block, ReturnStmt, IfStmt, WhileStmt, ForStmt,
+    MatchStmt, CaseClause, ExprStmt, AssignStmt, PassStmt, BreakStmt, ContinueStmt, DeferStmt,
+    Expression, LiteralExpr, IdentifierExpr, BinaryExpr, UnaryExpr, CallExpr, MemberExpr,
+    IndexExpr, TupleExpr, ArrayExpr, TryChainExpr
+)
+
+
+# EnumType.__getattr__ sends every TokenType.X lookup through a Python-level
+# hook on the interpreters we support, several times the cost of a global;
+# the token types tested on nearly every statement and expression are bound
+# once here
+_EOF = TokenType.EOF
+_NEWLINE = TokenType.NEWLINE
+_INDENT = TokenType.INDENT
+_DEDENT = TokenType.DEDENT
+_COMMA = TokenType.COMMA
+_COLON = TokenType.COLON
+_LPAREN = TokenType.LPAREN
+_RPAREN = TokenType.RPAREN
+_LBRACKET = TokenType.LBRACKET
+_RBRACKET = TokenType.RBRACKET
+_DOT = TokenType.DOT
+_IDENTIFIER = TokenType.IDENTIFIER
+_TRUE = TokenType.TRUE
 
 
 class ParseError(Exception):
@@ -13,15 +39,51 @@ class ParseError(Exception):
     def __init__(self, message: str, token: Token):
         self.message = message
         self.token = token
-        super().__init__(f"{token.filename or '<input>'}:{token.line}:{token.column}: {message}")
+        # Formatted in __str__, only when the error is actually shown
+        super().__init__(message, token)
 
+    def __str__(self) -> str:
+        token = self.token
+        return f"{token.filename or '<input>'}:{token.line}:{token.column}: {self.message}"
 
-class Parser:
-    """Parses Boogpp tokens into an AST"""
 
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
-        self.pos = 0
+class Parser:
+    """Parses Boogpp tokens into an AST
+
+    Predictive recursive descent on the current token only; no production
+    backtracks, so no memo table is kept and memory stays linear in the
+    size of the AST.
+    """
+
+    def __init__(self, tokens: Union[TokenStream, List[Token]]):
+        # The parser walks the stream's columns by index; the hot productions
+        # read node positions from the columns too, and a Token is only built
+        # for the less frequent nodes and for errors
+        if isinstance(tokens, TokenStream):
+            self.types: List[TokenType] = tokens.types
+            self.values: List[Any] = tokens.values
+            self.lines: Sequence[int] = tokens.lines
+            self.columns: Sequence[int] = tokens.columns
+            self.filename: Optional[str] = tokens.filename
+        else:
+            # The lexer always ends a stream with EOF, which is never
+            # consumed, so the position never runs past the last token
+            if not tokens or tokens[-1].type != _EOF:
+                last = tokens[-1] if tokens else None
+                tokens = list(tokens) + [Token(_EOF, None, last.line if last else 1,
+                                               last.column if last else 1,
+                                               last.filename if last else None)]
+            self.types = [token.type for token in tokens]
+            self.values = [token.value for token in tokens]
+            self.lines = [token.line for token in tokens]
+            self.columns = [token.column for token in tokens]
+            # One lexer run produces every token, so they share a filename
+            self.filename = tokens[0].filename
+        self.tokens: Union[TokenStream, List[Token]] = tokens
+        self.pos: int = 0
+        # CallExpr nodes built so far, so a function can tell whether its
+        # body contains any
+        self.call_count: int = 0
 
     def error(self, message: str) -> ParseError:
         """Create a parse error at current position"""
@@ -29,9 +91,7 @@ class Parser:
 
     def current(self) -> Token:
         """Get current token"""
-        if self.pos < len(self.tokens):
-            return self.tokens[self.pos]
-        return self.tokens[-1]  # Return EOF token
+        return self.tokens[self.pos]
 
     def peek(self, offset: int = 0) -> Token:
         """Peek at token at current position + offset"""
@@ -40,122 +100,179 @@ class Parser:
             return self.tokens[pos]
         return self.tokens[-1]
 
+    def current_type(self) -> TokenType:
+        """Get current token type"""
+        return self.types[self.pos]
+
     def advance(self) -> Token:
         """Advance to next token and return current"""
-        token = self.current()
-        if token.type != TokenType.EOF:
+        pos = self.pos
+        if self.types[pos] != _EOF:
+            self.pos = pos + 1
+        return self.tokens[pos]
+
+    def skip(self) -> None:
+        """Advance past the current token without building it"""
+        if self.types[self.pos] != _EOF:
             self.pos += 1
-        return token
+
+    def advance_value(self) -> Any:
+        """Advance to next token and return the current token's value"""
+        pos = self.pos
+        if self.types[pos] != _EOF:
+            self.pos = pos + 1
+        return self.values[pos]
+
+    # The expect family steps past the matched token inline rather than
+    # through advance()/skip(), saving a frame on every expected token;
+    # like them it never steps past EOF
 
     def expect(self, token_type: TokenType) -> Token:
         """Expect a specific token type and consume it"""
-        token = self.current()
-        if token.type != token_type:
-            raise self.error(f"Expected {token_type.name}, got {token.type.name}")
-        return self.advance()
-
-    def match(self, *token_types: TokenType) -> bool:
-        """Check if current token matches any of the given types"""
-        return self.current().type in token_types
+        pos = self.pos
+        current_type = self.types[pos]
+        if current_type != token_type:
+            raise self.error(f"Expected {token_type.name}, got {current_type.name}")
+        if current_type != _EOF:
+            self.pos = pos + 1
+        return self.tokens[pos]
+
+    def consume(self, token_type: TokenType) -> None:
+        """Expect a specific token type and consume it without building it"""
+        pos = self.pos
+        current_type = self.types[pos]
+        if current_type != token_type:
+            raise self.error(f"Expected {token_type.name}, got {current_type.name}")
+        if current_type != _EOF:
+            self.pos = pos + 1
+
+    def expect_value(self, token_type: TokenType) -> Any:
+        """Expect a specific token type, consume it and return its value"""
+        pos = self.pos
+        current_type = self.types[pos]
+        if current_type != token_type:
+            raise self.error(f"Expected {token_type.name}, got {current_type.name}")
+        if current_type != _EOF:
+            self.pos = pos + 1
+        return self.values[pos]
+
+    def match(self, token_type: TokenType) -> bool:
+        """Check if the current token is of the given type"""
+        # Multi-type tests go through the module-level frozensets instead,
+        # so no call builds a varargs tuple
+        return self.types[self.pos] == token_type
 
     def skip_newlines(self) -> None:
         """Skip newline tokens"""
-        while self.match(TokenType.NEWLINE):
-            self.advance()
+        # Scan the type column directly; the stream always ends with EOF,
+        # so the scan stops without a bounds check
+        types = self.types
+        newline = _NEWLINE
+        pos = self.pos
+        while types[pos] == newline:
+            pos += 1
+        self.pos = pos
 
     def consume_newlines(self) -> None:
         """Consume at least one newline"""
-        if not self.match(TokenType.NEWLINE):
+        types = self.types
+        newline = _NEWLINE
+        pos = self.pos
+        if types[pos] != newline:
             raise self.error("Expected newline")
-        self.skip_newlines()
+        pos += 1
+        while types[pos] == newline:
+            pos += 1
+        self.pos = pos
 
     # ===== Type Parsing =====
 
     def parse_type(self) -> TypeNode:
         """Parse a type annotation"""
-        token = self.current()
-
-        # Simple type names
-        if self.match(TokenType.I8, TokenType.I16, TokenType.I32, TokenType.I64,
-                     TokenType.U8, TokenType.U16, TokenType.U32, TokenType.U64,
-                     TokenType.F32, TokenType.F64, TokenType.BOOL, TokenType.STRING,
-                     TokenType.CHAR, TokenType.VOID, TokenType.STATUS, TokenType.HANDLE):
-            name = self.advance().value
-            return TypeName(name, token.line, token.column, token.filename)
-
-        # Identifier (custom types)
-        if self.match(TokenType.IDENTIFIER):
-            name = self.advance().value
-            return TypeName(name, token.line, token.column, token.filename)
-
-        # Pointer type: ptr[T]
-        if self.match(TokenType.PTR):
-            self.advance()
-            self.expect(TokenType.LBRACKET)
-            element_type = self.parse_type()
-            self.expect(TokenType.RBRACKET)
-            return TypePtr(element_type, token.line, token.column, token.filename)
-
-        # Array type: array[T, N]
-        if self.match(TokenType.ARRAY):
-            self.advance()
-            self.expect(TokenType.LBRACKET)
-            element_type = self.parse_type()
-            self.expect(TokenType.COMMA)
-            size_token = self.expect(TokenType.INTEGER_LITERAL)
-            self.expect(TokenType.RBRACKET)
-            return TypeArray(element_type, size_token.value, token.line, token.column, token.filename)
-
-        # Slice type: slice[T]
-        if self.match(TokenType.SLICE):
-            self.advance()
-            self.expect(TokenType.LBRACKET)
-            element_type = self.parse_type()
-            self.expect(TokenType.RBRACKET)
-            return TypeSlice(element_type, token.line, token.column, token.filename)
-
-        # Tuple type: tuple(T1, T2, ...)
-        if self.match(TokenType.TUPLE):
-            self.advance()
-            self.expect(TokenType.LPAREN)
-            element_types = []
-            while not self.match(TokenType.RPAREN):
-                element_types.append(self.parse_type())
-                if not self.match(TokenType.RPAREN):
-                    self.expect(TokenType.COMMA)
-            self.expect(TokenType.RPAREN)
-            return TypeTuple(element_types, token.line, token.column, token.filename)
-
-        # Result type: result[T]
-        if self.match(TokenType.RESULT):
-            self.advance()
-            self.expect(TokenType.LBRACKET)
-            value_type = self.parse_type()
-            self.expect(TokenType.RBRACKET)
-            return TypeResult(value_type, token.line, token.column, token.filename)
-
-        raise self.error(f"Expected type, got {token.type.name}")
+        # One table lookup on the leading token picks the production
+        handler = _TYPE_PARSERS.get(self.types[self.pos])
+        if handler is not None:
+            return handler(self)
+        raise self.error(f"Expected type, got {self.current_type().name}")
+
+    # The leaders dispatched to below are never EOF, so these step past
+    # them without the EOF guard
+
+    def parse_named_type(self) -> TypeName:
+        """Parse a primitive or custom type name"""
+        pos = self.pos
+        self.pos = pos + 1
+        return TypeName(self.values[pos], self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_type_argument(self) -> TypeNode:
+        """Parse a bracketed type argument: [T]"""
+        self.consume(_LBRACKET)
+        argument = self.parse_type()
+        self.consume(_RBRACKET)
+        return argument
+
+    def parse_ptr_type(self) -> TypePtr:
+        """Parse a pointer type: ptr[T]"""
+        pos = self.pos
+        self.pos = pos + 1
+        return TypePtr(self.parse_type_argument(), self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_array_type(self) -> TypeArray:
+        """Parse an array type: array[T, N]"""
+        pos = self.pos
+        self.pos = pos + 1
+        self.consume(_LBRACKET)
+        element_type = self.parse_type()
+        self.consume(_COMMA)
+        size = self.expect_value(TokenType.INTEGER_LITERAL)
+        self.consume(_RBRACKET)
+        return TypeArray(element_type, size, self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_slice_type(self) -> TypeSlice:
+        """Parse a slice type: slice[T]"""
+        pos = self.pos
+        self.pos = pos + 1
+        return TypeSlice(self.parse_type_argument(), self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_tuple_type(self) -> TypeTuple:
+        """Parse a tuple type: tuple(T1, T2, ...)"""
+        pos = self.pos
+        self.pos = pos + 1
+        self.consume(_LPAREN)
+        element_types = []
+        while not self.match(_RPAREN):
+            element_types.append(self.parse_type())
+            if not self.match(_RPAREN):
+                self.consume(_COMMA)
+        self.consume(_RPAREN)
+        return TypeTuple(element_types, self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_result_type(self) -> TypeResult:
+        """Parse a result type: result[T]"""
+        pos = self.pos
+        self.pos = pos + 1
+        return TypeResult(self.parse_type_argument(), self.lines[pos], self.columns[pos], self.filename)
 
     # ===== Decorator Parsing =====
 
     def parse_decorator(self) -> Decorator:
         """Parse a decorator: @name(arg1: val1, arg2: val2)"""
         token = self.expect(TokenType.AT)
-        name_token = self.expect(TokenType.IDENTIFIER)
+        name_token = self.expect(_IDENTIFIER)
         name = name_token.value
 
         arguments = {}
-        if self.match(TokenType.LPAREN):
-            self.advance()
-            while not self.match(TokenType.RPAREN):
-                arg_name = self.expect(TokenType.IDENTIFIER).value
-                self.expect(TokenType.COLON)
+        if self.match(_LPAREN):
+            self.skip()
+            while not self.match(_RPAREN):
+                arg_name = self.expect_value(_IDENTIFIER)
+                self.consume(_COLON)
                 arg_value = self.parse_primary_expr()
                 arguments[arg_name] = arg_value
 
-                if not self.match(TokenType.RPAREN):
-                    self.expect(TokenType.COMMA)
-            self.expect(TokenType.RPAREN)
+                if not self.match(_RPAREN):
+                    self.consume(_COMMA)
+            self.consume(_RPAREN)
 
         self.skip_newlines()
         return Decorator(name, arguments, token.line, token.column, token.filename)
@@ -164,185 +281,192 @@ class Parser:
 
     def parse_primary_expr(self) -> Expression:
         """Parse primary expressions"""
-        token = self.current()
-
-        # Literals
-        if self.match(TokenType.INTEGER_LITERAL):
-            value = self.advance().value
-            return LiteralExpr(value, "int", token.line, token.column, token.filename)
-
-        if self.match(TokenType.FLOAT_LITERAL):
-            value = self.advance().value
-            return LiteralExpr(value, "float", token.line, token.column, token.filename)
-
-        if self.match(TokenType.STRING_LITERAL):
-            value = self.advance().value
-            return LiteralExpr(value, "string", token.line, token.column, token.filename)
-
-        if self.match(TokenType.TRUE, TokenType.FALSE):
-            value = self.advance().type == TokenType.TRUE
-            return LiteralExpr(value, "bool", token.line, token.column, token.filename)
-
-        # Identifier
-        if self.match(TokenType.IDENTIFIER):
-            name = self.advance().value
-            return IdentifierExpr(name, token.line, token.column, token.filename)
-
-        # Parenthesized expression or tuple
-        if self.match(TokenType.LPAREN):
-            self.advance()
-            if self.match(TokenType.RPAREN):
-                # Empty tuple
-                self.advance()
-                return TupleExpr([], token.line, token.column, token.filename)
-
-            first_expr = self.parse_expression()
-
-            if self.match(TokenType.COMMA):
-                # Tuple
-                elements = [first_expr]
-                while self.match(TokenType.COMMA):
-                    self.advance()
-                    if self.match(TokenType.RPAREN):
-                        break
-                    elements.append(self.parse_expression())
-                self.expect(TokenType.RPAREN)
-                return TupleExpr(elements, token.line, token.column, token.filename)
-            else:
-                # Just parenthesized
-                self.expect(TokenType.RPAREN)
-                return first_expr
-
-        # Array literal
-        if self.match(TokenType.LBRACKET):
-            self.advance()
-            elements = []
-            while not self.match(TokenType.RBRACKET):
+        # One table lookup on the leading token picks the production
+        handler = _PRIMARY_PARSERS.get(self.types[self.pos])
+        if handler is not None:
+            return handler(self)
+        raise self.error(f"Expected expression, got {self.current_type().name}")
+
+    # The leaders dispatched to below are never EOF, so these step past
+    # them without the EOF guard
+
+    def parse_literal_expr(self) -> LiteralExpr:
+        """Parse an integer, float or string literal"""
+        pos = self.pos
+        self.pos = pos + 1
+        return LiteralExpr(self.values[pos], _LITERAL_KINDS[self.types[pos]], self.lines[pos], self.columns[pos],
+                           self.filename)
+
+    def parse_bool_literal(self) -> LiteralExpr:
+        """Parse a true or false literal"""
+        pos = self.pos
+        self.pos = pos + 1
+        return LiteralExpr(self.types[pos] == _TRUE, "bool", self.lines[pos], self.columns[pos],
+                           self.filename)
+
+    def parse_identifier_expr(self) -> IdentifierExpr:
+        """Parse an identifier"""
+        pos = self.pos
+        self.pos = pos + 1
+        return IdentifierExpr(self.values[pos], self.lines[pos], self.columns[pos], self.filename)
+
+    def parse_paren_expr(self) -> Expression:
+        """Parse a parenthesized expression or tuple"""
+        pos = self.pos
+        line = self.lines[pos]
+        column = self.columns[pos]
+        self.pos = pos + 1
+        if self.match(_RPAREN):
+            # Empty tuple
+            self.skip()
+            return TupleExpr([], line, column, self.filename)
+
+        first_expr = self.parse_expression()
+
+        if self.match(_COMMA):
+            # Tuple
+            elements = [first_expr]
+            while self.match(_COMMA):
+                self.skip()
+                if self.match(_RPAREN):
+                    break
                 elements.append(self.parse_expression())
-                if not self.match(TokenType.RBRACKET):
-                    self.expect(TokenType.COMMA)
-            self.expect(TokenType.RBRACKET)
-            return ArrayExpr(elements, token.line, token.column, token.filename)
-
-        # try_chain
-        if self.match(TokenType.TRY_CHAIN):
-            return self.parse_try_chain()
+            self.consume(_RPAREN)
+            return TupleExpr(elements, line, column, self.filename)
+        else:
+            # Just parenthesized
+            self.consume(_RPAREN)
+            return first_expr
+
+    def parse_array_literal(self) -> ArrayExpr:
+        """Parse an array literal"""
+        pos = self.pos
+        line = self.lines[pos]
+        column = self.columns[pos]
+        self.pos = pos + 1
+        elements = self.parse_expression_list(_RBRACKET)
+        return ArrayExpr(elements, line, column, self.filename)
+
+    def parse_expression_list(self, closing: TokenType) -> List[Expression]:
+        """Parse comma-separated expressions up to and including the closing token"""
+        types = self.types
+        parse_expression = self.parse_expression
+        elements = []
+        while types[self.pos] != closing:
+            elements.append(parse_expression())
+            if types[self.pos] != closing:
+                self.consume(_COMMA)
+        # The loop only ends on the closing token, which is never EOF
+        self.pos += 1
+        return elements
 
-        raise self.error(f"Expected expression, got {token.type.name}")
+    def parse_unary_expr(self) -> Expression:
+        """Parse unary expressions, including the postfix operations on their operand"""
+        types = self.types
+        pos = self.pos
+        token_type = types[pos]
+        if token_type in _UNARY_OPERATORS:
+            # Operators are never EOF, so step past without the guard
+            self.pos = pos + 1
+            operand = self.parse_unary_expr()
+            return UnaryExpr(self.values[pos], operand, self.lines[pos], self.columns[pos], self.filename)
 
-    def parse_postfix_expr(self) -> Expression:
-        """Parse postfix expressions (calls, member access, indexing)"""
-        expr = self.parse_primary_expr()
+        # The primary dispatch and the postfix loop run inline, saving two
+        # frames on every operand
+        handler = _PRIMARY_PARSERS.get(token_type)
+        if handler is None:
+            raise self.error(f"Expected expression, got {token_type.name}")
+        expr = handler(self)
 
         while True:
-            token = self.current()
+            # Re-read the position each round: the branches parse nested
+            # expressions that move it
+            pos = self.pos
+            token_type = types[pos]
 
             # Function call
-            if self.match(TokenType.LPAREN):
-                self.advance()
-                arguments = []
-                while not self.match(TokenType.RPAREN):
-                    arguments.append(self.parse_expression())
-                    if not self.match(TokenType.RPAREN):
-                        self.expect(TokenType.COMMA)
-                self.expect(TokenType.RPAREN)
-                expr = CallExpr(expr, arguments, token.line, token.column, token.filename)
+            if token_type == _LPAREN:
+                line = self.lines[pos]
+                column = self.columns[pos]
+                self.pos = pos + 1
+                arguments = self.parse_expression_list(_RPAREN)
+                expr = CallExpr(expr, arguments, line, column, self.filename)
+                self.call_count += 1
 
             # Member access
-            elif self.match(TokenType.DOT):
-                self.advance()
-                member = self.expect(TokenType.IDENTIFIER).value
-                expr = MemberExpr(expr, member, token.line, token.column, token.filename)
+            elif token_type == _DOT:
+                line = self.lines[pos]
+                column = self.columns[pos]
+                self.pos = pos + 1
+                member = self.expect_value(_IDENTIFIER)
+                expr = MemberExpr(expr, member, line, column, self.filename)
 
             # Indexing
-            elif self.match(TokenType.LBRACKET):
-                self.advance()
+            elif token_type == _LBRACKET:
+                line = self.lines[pos]
+                column = self.columns[pos]
+                self.pos = pos + 1
                 index = self.parse_expression()
-                self.expect(TokenType.RBRACKET)
-                expr = IndexExpr(expr, index, token.line, token.column, token.filename)
+                self.consume(_RBRACKET)
+                expr = IndexExpr(expr, index, line, column, self.filename)
 
             else:
-                break
-
-        return expr
-
-    def parse_unary_expr(self) -> Expression:
-        """Parse unary expressions"""
-        token = self.current()
-
-        if self.match(TokenType.MINUS, TokenType.NOT, TokenType.TILDE):
-            op = self.advance().value
-            operand = self.parse_unary_expr()
-            return UnaryExpr(op, operand, token.line, token.column, token.filename)
-
-        return self.parse_postfix_expr()
+                return expr
 
     def parse_binary_expr(self, min_precedence: int = 0) -> Expression:
         """Parse binary expressions using precedence climbing"""
-        left = self.parse_unary_expr()
+        return self.parse_binary_operators(self.parse_unary_expr(), min_precedence)
+
+    def parse_binary_operators(self, left: Expression, min_precedence: int) -> Expression:
+        """Fold the operators following left that bind at least min_precedence"""
+        # Iterates along each run of equal or falling precedence and only
+        # recurses where the next operator binds tighter than the current one
+        types = self.types
 
         while True:
-            token = self.current()
-            precedence = self.get_precedence(token.type)
+            pos = self.pos
+            precedence = _PRECEDENCE[types[pos]]
 
             if precedence < min_precedence:
-                break
-
-            op_token = self.advance()
-            right = self.parse_binary_expr(precedence + 1)
-            left = BinaryExpr(left, op_token.value, right, token.line, token.column, token.filename)
+                return left
 
-        return left
+            # Operators are never EOF, so step past without the guard
+            self.pos = pos + 1
+            right = self.parse_unary_expr()
+            if _PRECEDENCE[types[self.pos]] > precedence:
+                right = self.parse_binary_operators(right, precedence + 1)
+            left = BinaryExpr(left, self.values[pos], right, self.lines[pos], self.columns[pos], self.filename)
 
     def get_precedence(self, token_type: TokenType) -> int:
         """Get operator precedence"""
-        precedence_map = {
-            TokenType.OR: 1,
-            TokenType.AND: 2,
-            TokenType.EQ: 3,
-            TokenType.NE: 3,
-            TokenType.LT: 4,
-            TokenType.GT: 4,
-            TokenType.LE: 4,
-            TokenType.GE: 4,
-            TokenType.PIPE: 5,
-            TokenType.CARET: 6,
-            TokenType.AMPERSAND: 7,
-            TokenType.LSHIFT: 8,
-            TokenType.RSHIFT: 8,
-            TokenType.PLUS: 9,
-            TokenType.MINUS: 9,
-            TokenType.STAR: 10,
-            TokenType.SLASH: 10,
-            TokenType.PERCENT: 10,
-            TokenType.POWER: 11,
-        }
-        return precedence_map.get(token_type, -1)
+        return _PRECEDENCE[token_type]
 
     def parse_expression(self) -> Expression:
         """Parse an expression"""
-        return self.parse_binary_expr()
+        # Same as parse_binary_expr(), one frame shorter: every nesting level
+        # of an expression passes through here
+        return self.parse_binary_operators(self.parse_unary_expr(), 0)
 
     def parse_try_chain(self) -> TryChainExpr:
         """Parse try_chain expression"""
         token = self.expect(TokenType.TRY_CHAIN)
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
 
         # Primary
-        self.expect(TokenType.INDENT)
-        self.expect(TokenType.PRIMARY)
-        self.expect(TokenType.COLON)
+        self.consume(_INDENT)
+        self.consume(TokenType.PRIMARY)
+        self.consume(_COLON)
         self.skip_newlines()
         primary = self.parse_expression()
         self.skip_newlines()
-        self.expect(TokenType.DEDENT)
+        self.consume(_DEDENT)
 
         # Secondary (optional)
         secondary = None
         if self.match(TokenType.SECONDARY):
-            self.advance()
-            self.expect(TokenType.COLON)
+            self.skip()
+            self.consume(_COLON)
             self.skip_newlines()
             secondary = self.parse_expression()
             self.skip_newlines()
@@ -350,8 +474,8 @@ class Parser:
         # Fallback (optional)
         fallback = None
         if self.match(TokenType.FALLBACK):
-            self.advance()
-            self.expect(TokenType.COLON)
+            self.skip()
+            self.consume(_COLON)
             self.skip_newlines()
             fallback = self.parse_expression()
             self.skip_newlines()
@@ -362,112 +486,103 @@ class Parser:
 
     def parse_block(self) -> Block:
         """Parse a block of statements"""
-        token = self.current()
+        line = self.lines[self.pos]
+        column = self.columns[self.pos]
         statements = []
+        types = self.types
+        parse_statement = self.parse_statement
+        skip_newlines = self.skip_newlines
 
-        self.expect(TokenType.INDENT)
-        self.skip_newlines()
+        self.consume(_INDENT)
+        skip_newlines()
 
-        while not self.match(TokenType.DEDENT):
-            statements.append(self.parse_statement())
-            self.skip_newlines()
+        while types[self.pos] != _DEDENT:
+            statements.append(parse_statement())
+            skip_newlines()
 
-        self.expect(TokenType.DEDENT)
+        self.consume(_DEDENT)
 
-        return Block(statements, token.line, token.column, token.filename)
+        return Block(statements, line, column, self.filename)
 
     def parse_statement(self) -> Statement:
         """Parse a statement"""
-        token = self.current()
-
-        # Return statement
-        if self.match(TokenType.RETURN):
-            self.advance()
-            value = None
-            if not self.match(TokenType.NEWLINE):
-                value = self.parse_expression()
-            self.skip_newlines()
-            return ReturnStmt(value, token.line, token.column, token.filename)
-
-        # If statement
-        if self.match(TokenType.IF):
-            return self.parse_if_stmt()
-
-        # While statement
-        if self.match(TokenType.WHILE):
-            return self.parse_while_stmt()
-
-        # For statement
-        if self.match(TokenType.FOR):
-            return self.parse_for_stmt()
-
-        # Match statement
-        if self.match(TokenType.MATCH):
-            return self.parse_match_stmt()
-
-        # Pass statement
-        if self.match(TokenType.PASS):
-            self.advance()
-            self.skip_newlines()
-            return PassStmt(token.line, token.column, token.filename)
-
-        # Break statement
-        if self.match(TokenType.BREAK):
-            self.advance()
-            self.skip_newlines()
-            return BreakStmt(token.line, token.column, token.filename)
-
-        # Continue statement
-        if self.match(TokenType.CONTINUE):
-            self.advance()
-            self.skip_newlines()
-            return ContinueStmt(token.line, token.column, token.filename)
+        # One table lookup on the leading token picks the production
+        handler = _STATEMENT_PARSERS.get(self.types[self.pos])
+        if handler is not None:
+            # let/var yield VariableDecl nodes, which blocks hold alongside statements
+            return cast(Statement, handler(self))
+        return self.parse_expression_stmt()
+
+    def parse_return_stmt(self) -> ReturnStmt:
+        """Parse return statement"""
+        token = self.expect(TokenType.RETURN)
+        value = None
+        if not self.match(_NEWLINE):
+            value = self.parse_expression()
+        self.skip_newlines()
+        return ReturnStmt(value, token.line, token.column, token.filename)
 
-        # Defer statement
-        if self.match(TokenType.DEFER):
-            self.advance()
-            stmt = self.parse_statement()
-            return DeferStmt(stmt, token.line, token.column, token.filename)
+    def parse_pass_stmt(self) -> PassStmt:
+        """Parse pass statement"""
+        token = self.expect(TokenType.PASS)
+        self.skip_newlines()
+        return PassStmt(token.line, token.column, token.filename)
 
-        # Variable declaration
-        if self.match(TokenType.LET, TokenType.VAR):
-            return self.parse_variable_decl()
+    def parse_break_stmt(self) -> BreakStmt:
+        """Parse break statement"""
+        token = self.expect(TokenType.BREAK)
+        self.skip_newlines()
+        return BreakStmt(token.line, token.column, token.filename)
 
-        # Assignment or expression statement
+    def parse_continue_stmt(self) -> ContinueStmt:
+        """Parse continue statement"""
+        token = self.expect(TokenType.CONTINUE)
+        self.skip_newlines()
+        return ContinueStmt(token.line, token.column, token.filename)
+
+    def parse_defer_stmt(self) -> DeferStmt:
+        """Parse defer statement"""
+        token = self.expect(TokenType.DEFER)
+        stmt = self.parse_statement()
+        return DeferStmt(stmt, token.line, token.column, token.filename)
+
+    def parse_expression_stmt(self) -> Statement:
+        """Parse assignment or expression statement"""
+        line = self.lines[self.pos]
+        column = self.columns[self.pos]
         expr = self.parse_expression()
 
         # Check for assignment
-        if self.match(TokenType.ASSIGN, TokenType.PLUS_ASSIGN, TokenType.MINUS_ASSIGN,
-                     TokenType.STAR_ASSIGN, TokenType.SLASH_ASSIGN, TokenType.PERCENT_ASSIGN):
-            op = self.advance().value
+        if self.types[self.pos] in _ASSIGN_OPERATORS:
+            op = self.advance_value()
             value = self.parse_expression()
             self.skip_newlines()
-            return AssignStmt(expr, value, op, token.line, token.column, token.filename)
+            return AssignStmt(expr, value, op, line, column, self.filename)
 
         self.skip_newlines()
-        return ExprStmt(expr, token.line, token.column, token.filename)
+        return ExprStmt(expr, line, column, self.filename)
 
     def parse_if_stmt(self) -> IfStmt:
         """Parse if statement"""
         token = self.expect(TokenType.IF)
         condition = self.parse_expression()
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
         then_block = self.parse_block()
 
         elif_clauses = []
         while self.match(TokenType.ELIF):
-            self.advance()
+            self.skip()
             elif_cond = self.parse_expression()
-            self.expect(TokenType.COLON)
+            self.consume(_COLON)
             self.consume_newlines()
             elif_block = self.parse_block()
             elif_clauses.append((elif_cond, elif_block))
 
         else_block = None
         if self.match(TokenType.ELSE):
-            self.advance()
-            self.expect(TokenType.COLON)
+            self.skip()
+            self.consume(_COLON)
             self.consume_newlines()
             else_block = self.parse_block()
 
@@ -477,7 +592,7 @@ class Parser:
         """Parse while statement"""
         token = self.expect(TokenType.WHILE)
         condition = self.parse_expression()
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
         body = self.parse_block()
         return WhileStmt(condition, body, token.line, token.column, token.filename)
@@ -485,10 +600,10 @@ class Parser:
     def parse_for_stmt(self) -> ForStmt:
         """Parse for statement"""
         token = self.expect(TokenType.FOR)
-        variable = self.expect(TokenType.IDENTIFIER).value
-        self.expect(TokenType.IN)
+        variable = self.expect_value(_IDENTIFIER)
+        self.consume(TokenType.IN)
         iterable = self.parse_expression()
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
         body = self.parse_block()
         return ForStmt(variable, iterable, body, token.line, token.column, token.filename)
@@ -497,23 +612,23 @@ class Parser:
         """Parse match statement"""
         token = self.expect(TokenType.MATCH)
         value = self.parse_expression()
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
 
-        self.expect(TokenType.INDENT)
+        self.consume(_INDENT)
         self.skip_newlines()
 
         cases = []
         while self.match(TokenType.CASE):
-            self.advance()
+            self.skip()
             pattern = self.parse_expression()
-            self.expect(TokenType.COLON)
+            self.consume(_COLON)
             self.consume_newlines()
             case_body = self.parse_block()
             cases.append(CaseClause(pattern, case_body, token.line, token.column, token.filename))
             self.skip_newlines()
 
-        self.expect(TokenType.DEDENT)
+        self.consume(_DEDENT)
 
         return MatchStmt(value, cases, token.line, token.column, token.filename)
 
@@ -521,18 +636,18 @@ class Parser:
         """Parse variable declaration"""
         token = self.current()
         is_mutable = self.match(TokenType.VAR)
-        self.advance()
+        self.skip()
 
-        name = self.expect(TokenType.IDENTIFIER).value
+        name = self.expect_value(_IDENTIFIER)
 
         type_annotation = None
-        if self.match(TokenType.COLON):
-            self.advance()
+        if self.match(_COLON):
+            self.skip()
             type_annotation = self.parse_type()
 
         initializer = None
         if self.match(TokenType.ASSIGN):
-            self.advance()
+            self.skip()
             initializer = self.parse_expression()
 
         self.skip_newlines()
@@ -541,41 +656,43 @@ class Parser:
 
     # ===== Declaration Parsing =====
 
-    def parse_function_decl(self, decorators: List[Decorator] = None) -> FunctionDecl:
+    def parse_function_decl(self, decorators: Optional[List[Decorator]] = None) -> FunctionDecl:
         """Parse function declaration"""
         if decorators is None:
             decorators = []
 
         token = self.expect(TokenType.FUNC)
-        name = self.expect(TokenType.IDENTIFIER).value
+        name = self.expect_value(_IDENTIFIER)
 
         # Parameters
-        self.expect(TokenType.LPAREN)
+        self.consume(_LPAREN)
         parameters = []
-        while not self.match(TokenType.RPAREN):
+        while not self.match(_RPAREN):
             param_token = self.current()
-            param_name = self.expect(TokenType.IDENTIFIER).value
-            self.expect(TokenType.COLON)
+            param_name = self.expect_value(_IDENTIFIER)
+            self.consume(_COLON)
             param_type = self.parse_type()
             parameters.append(Parameter(param_name, param_type, None, param_token.line, param_token.column, param_token.filename))
 
-            if not self.match(TokenType.RPAREN):
-                self.expect(TokenType.COMMA)
-        self.expect(TokenType.RPAREN)
+            if not self.match(_RPAREN):
+                self.consume(_COMMA)
+        self.consume(_RPAREN)
 
         # Return type
         return_type = None
         if self.match(TokenType.ARROW):
-            self.advance()
+            self.skip()
             return_type = self.parse_type()
 
-        self.expect(TokenType.COLON)
+        self.consume(_COLON)
         self.consume_newlines()
 
         # Body
+        calls_before = self.call_count
         body = self.parse_block()
 
-        return FunctionDecl(name, parameters, return_type, body, decorators, token.line, token.column, token.filename)
+        return FunctionDecl(name, parameters, return_type, body, decorators, token.line, token.column, token.filename,
+                            has_calls=self.call_count != calls_before)
 
     def parse_import_stmt(self) -> Union[ImportStmt, FromImportStmt]:
         """Parse import statement"""
@@ -583,35 +700,35 @@ class Parser:
 
         if self.match(TokenType.FROM):
             # from import
-            self.advance()
-            module_path = [self.expect(TokenType.IDENTIFIER).value]
+            self.skip()
+            module_path = [self.expect_value(_IDENTIFIER)]
 
-            while self.match(TokenType.DOT):
-                self.advance()
-                module_path.append(self.expect(TokenType.IDENTIFIER).value)
+            while self.match(_DOT):
+                self.skip()
+                module_path.append(self.expect_value(_IDENTIFIER))
 
-            self.expect(TokenType.IMPORT)
+            self.consume(TokenType.IMPORT)
 
-            names = [self.expect(TokenType.IDENTIFIER).value]
-            while self.match(TokenType.COMMA):
-                self.advance()
-                names.append(self.expect(TokenType.IDENTIFIER).value)
+            names = [self.expect_value(_IDENTIFIER)]
+            while self.match(_COMMA):
+                self.skip()
+                names.append(self.expect_value(_IDENTIFIER))
 
             self.skip_newlines()
             return FromImportStmt(module_path, names, token.line, token.column, token.filename)
         else:
             # regular import
-            self.expect(TokenType.IMPORT)
-            module_path = [self.expect(TokenType.IDENTIFIER).value]
+            self.consume(TokenType.IMPORT)
+            module_path = [self.expect_value(_IDENTIFIER)]
 
-            while self.match(TokenType.DOT):
-                self.advance()
-                module_path.append(self.expect(TokenType.IDENTIFIER).value)
+            while self.match(_DOT):
+                self.skip()
+                module_path.append(self.expect_value(_IDENTIFIER))
 
             alias = None
-            if self.match(TokenType.IDENTIFIER) and self.current().value == "as":
-                self.advance()
-                alias = self.expect(TokenType.IDENTIFIER).value
+            if self.match(_IDENTIFIER) and self.values[self.pos] == "as":
+                self.skip()
+                alias = self.expect_value(_IDENTIFIER)
 
             self.skip_newlines()
             return ImportStmt(module_path, alias, token.line, token.column, token.filename)
@@ -619,7 +736,7 @@ class Parser:
     def parse_module_decl(self) -> ModuleDecl:
         """Parse module declaration"""
         token = self.expect(TokenType.MODULE)
-        name = self.expect(TokenType.IDENTIFIER).value
+        name = self.expect_value(_IDENTIFIER)
         self.skip_newlines()
         return ModuleDecl(name, token.line, token.column, token.filename)
 
@@ -640,15 +757,15 @@ class Parser:
 
         # Parse imports
         imports = []
-        while self.match(TokenType.IMPORT, TokenType.FROM):
+        while self.types[self.pos] in _IMPORT_LEADERS:
             imports.append(self.parse_import_stmt())
 
         # Parse declarations
         declarations = []
-        while not self.match(TokenType.EOF):
+        while not self.match(_EOF):
             self.skip_newlines()
 
-            if self.match(TokenType.EOF):
+            if self.match(_EOF):
                 break
 
             # Check for decorators
@@ -656,19 +773,116 @@ class Parser:
             while self.match(TokenType.AT):
                 decl_decorators.append(self.parse_decorator())
 
-            # Function declaration
-            if self.match(TokenType.FUNC):
-                declarations.append(self.parse_function_decl(decl_decorators))
-            else:
+            handler = _DECLARATION_PARSERS.get(self.current_type())
+            if handler is None:
                 if decl_decorators:
                     raise self.error("Decorators can only be applied to functions")
-                # Other declarations can be added here
-                self.skip_newlines()
+                raise self.error(f"Expected declaration, got {self.current_type().name}")
+            declarations.append(handler(self, decl_decorators))
 
         return Program(decorators, module_decl, imports, declarations, token.line, token.column, token.filename)
 
 
-def parse(tokens: List[Token]) -> Program:
+# FIRST-set dispatch tables, keyed by the leading token of each production
+_STATEMENT_PARSERS: Dict[TokenType, Callable[[Parser], ASTNode]] = {
+    TokenType.RETURN: Parser.parse_return_stmt,
+    TokenType.IF: Parser.parse_if_stmt,
+    TokenType.WHILE: Parser.parse_while_stmt,
+    TokenType.FOR: Parser.parse_for_stmt,
+    TokenType.MATCH: Parser.parse_match_stmt,
+    TokenType.PASS: Parser.parse_pass_stmt,
+    TokenType.BREAK: Parser.parse_break_stmt,
+    TokenType.CONTINUE: Parser.parse_continue_stmt,
+    TokenType.DEFER: Parser.parse_defer_stmt,
+    TokenType.LET: Parser.parse_variable_decl,
+    TokenType.VAR: Parser.parse_variable_decl,
+}
+
+_PRIMARY_PARSERS: Dict[TokenType, Callable[[Parser], Expression]] = {
+    TokenType.INTEGER_LITERAL: Parser.parse_literal_expr,
+    TokenType.FLOAT_LITERAL: Parser.parse_literal_expr,
+    TokenType.STRING_LITERAL: Parser.parse_literal_expr,
+    TokenType.TRUE: Parser.parse_bool_literal,
+    TokenType.FALSE: Parser.parse_bool_literal,
+    TokenType.IDENTIFIER: Parser.parse_identifier_expr,
+    TokenType.LPAREN: Parser.parse_paren_expr,
+    TokenType.LBRACKET: Parser.parse_array_literal,
+    TokenType.TRY_CHAIN: Parser.parse_try_chain,
+}
+
+_TYPE_PARSERS: Dict[TokenType, Callable[[Parser], TypeNode]] = {
+    TokenType.I8: Parser.parse_named_type,
+    TokenType.I16: Parser.parse_named_type,
+    TokenType.I32: Parser.parse_named_type,
+    TokenType.I64: Parser.parse_named_type,
+    TokenType.U8: Parser.parse_named_type,
+    TokenType.U16: Parser.parse_named_type,
+    TokenType.U32: Parser.parse_named_type,
+    TokenType.U64: Parser.parse_named_type,
+    TokenType.F32: Parser.parse_named_type,
+    TokenType.F64: Parser.parse_named_type,
+    TokenType.BOOL: Parser.parse_named_type,
+    TokenType.STRING: Parser.parse_named_type,
+    TokenType.CHAR: Parser.parse_named_type,
+    TokenType.VOID: Parser.parse_named_type,
+    TokenType.STATUS: Parser.parse_named_type,
+    TokenType.HANDLE: Parser.parse_named_type,
+    TokenType.IDENTIFIER: Parser.parse_named_type,
+    TokenType.PTR: Parser.parse_ptr_type,
+    TokenType.ARRAY: Parser.parse_array_type,
+    TokenType.SLICE: Parser.parse_slice_type,
+    TokenType.TUPLE: Parser.parse_tuple_type,
+    TokenType.RESULT: Parser.parse_result_type,
+}
+
+_DECLARATION_PARSERS: Dict[TokenType, Callable[[Parser, List[Decorator]], ASTNode]] = {
+    TokenType.FUNC: Parser.parse_function_decl,
+}
+
+# Token classes tested against the current token; frozensets so each test
+# is one hash probe instead of building and scanning a varargs tuple
+_UNARY_OPERATORS = frozenset({TokenType.MINUS, TokenType.NOT, TokenType.TILDE})
+
+_ASSIGN_OPERATORS = frozenset({
+    TokenType.ASSIGN, TokenType.PLUS_ASSIGN, TokenType.MINUS_ASSIGN,
+    TokenType.STAR_ASSIGN, TokenType.SLASH_ASSIGN, TokenType.PERCENT_ASSIGN,
+})
+
+_IMPORT_LEADERS = frozenset({TokenType.IMPORT, TokenType.FROM})
+
+# Binary operator precedence indexed by token type (an IntEnum), -1 for
+# tokens that are not binary operators
+_BINARY_PRECEDENCE: Dict[int, int] = {
+    TokenType.OR: 1,
+    TokenType.AND: 2,
+    TokenType.EQ: 3,
+    TokenType.NE: 3,
+    TokenType.LT: 4,
+    TokenType.GT: 4,
+    TokenType.LE: 4,
+    TokenType.GE: 4,
+    TokenType.PIPE: 5,
+    TokenType.CARET: 6,
+    TokenType.AMPERSAND: 7,
+    TokenType.LSHIFT: 8,
+    TokenType.RSHIFT: 8,
+    TokenType.PLUS: 9,
+    TokenType.MINUS: 9,
+    TokenType.STAR: 10,
+    TokenType.SLASH: 10,
+    TokenType.PERCENT: 10,
+    TokenType.POWER: 11,
+}
+_PRECEDENCE: Tuple[int, ...] = tuple(_BINARY_PRECEDENCE.get(value, -1) for value in range(max(TokenType) + 1))
+
+_LITERAL_KINDS = {
+    TokenType.INTEGER_LITERAL: "int",
+    TokenType.FLOAT_LITERAL: "float",
+    TokenType.STRING_LITERAL: "string",
+}
+
+
+def parse(tokens: Union[TokenStream, List[Token]]) -> Program:
     """Convenience function to parse tokens into an AST"""
     parser = Parser(tokens)
     return parser.parse_program()
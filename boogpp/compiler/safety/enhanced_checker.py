@@ -6,6 +6,7 @@ Integrates detailed safety rules with comprehensive checking.
 from enum import Enum, auto
 from typing import List, Optional, Dict, Set
 from ..parser.ast_nodes import *
+from .safety_checker import resolve_call_name, walk_nodes
 from .safety_rules import SAFETY_RULES, SafetyCategory, OperationRisk
 
 
@@ -16,8 +17,16 @@ class SafetyMode(Enum):
     CUSTOM = auto()
 
 
+# @safety_level mode names, looked up without going through EnumMeta
+_MODE_BY_NAME = {mode.name: mode for mode in SafetyMode}
+
+
 class SafetyViolation:
     """Represents a safety violation"""
+    # The location stays on the node rather than being copied onto every
+    # violation; line, column and filename read it from there
+    __slots__ = ('message', 'node', 'severity', 'category', 'risk', 'suggestion')
+
     def __init__(self, message: str, node: ASTNode, severity: str = "error",
                  category: Optional[SafetyCategory] = None,
                  risk: Optional[OperationRisk] = None,
@@ -28,12 +37,22 @@ class SafetyViolation:
         self.category = category
         self.risk = risk
         self.suggestion = suggestion
-        self.line = node.line
-        self.column = node.column
-        self.filename = node.filename
+
+    @property
+    def line(self) -> int:
+        return self.node.line
+
+    @property
+    def column(self) -> int:
+        return self.node.column
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self.node.filename
 
     def __str__(self):
-        location = f"{self.filename or '<input>'}:{self.line}:{self.column}"
+        node = self.node
+        location = f"{node.filename or '<input>'}:{node.line}:{node.column}"
         result = f"{location}: [{self.severity}] {self.message}"
         if self.suggestion:
             result += f"\n  Suggestion: {self.suggestion}"
@@ -77,14 +96,15 @@ class EnhancedSafetyChecker:
             if decorator.name == "safety_level":
                 mode_arg = decorator.arguments.get("mode")
                 if mode_arg and isinstance(mode_arg, IdentifierExpr):
-                    try:
-                        self.mode = SafetyMode[mode_arg.name]
-                    except KeyError:
+                    mode = _MODE_BY_NAME.get(mode_arg.name)
+                    if mode is None:
                         self.violations.append(SafetyViolation(
                             f"Unknown safety mode '{mode_arg.name}'. Valid modes: SAFE, UNSAFE, CUSTOM",
                             decorator,
                             "error"
                         ))
+                    else:
+                        self.mode = mode
 
         # Check all declarations
         for decl in program.declarations:
@@ -182,89 +202,17 @@ class EnhancedSafetyChecker:
 
     def check_statement(self, stmt: Statement) -> None:
         """Check a statement"""
-        if isinstance(stmt, Block):
-            for s in stmt.statements:
-                self.check_statement(s)
-
-        elif isinstance(stmt, ReturnStmt):
-            if stmt.value:
-                self.check_expression(stmt.value)
-
-        elif isinstance(stmt, IfStmt):
-            self.check_expression(stmt.condition)
-            self.check_statement(stmt.then_block)
-            for cond, block in stmt.elif_clauses:
-                self.check_expression(cond)
-                self.check_statement(block)
-            if stmt.else_block:
-                self.check_statement(stmt.else_block)
-
-        elif isinstance(stmt, WhileStmt):
-            self.check_expression(stmt.condition)
-            self.check_statement(stmt.body)
-
-        elif isinstance(stmt, ForStmt):
-            self.check_expression(stmt.iterable)
-            self.check_statement(stmt.body)
-
-        elif isinstance(stmt, MatchStmt):
-            self.check_expression(stmt.value)
-            for case in stmt.cases:
-                self.check_expression(case.pattern)
-                self.check_statement(case.body)
-
-        elif isinstance(stmt, ExprStmt):
-            self.check_expression(stmt.expression)
-
-        elif isinstance(stmt, AssignStmt):
-            self.check_expression(stmt.target)
-            self.check_expression(stmt.value)
-
-        elif isinstance(stmt, DeferStmt):
-            self.check_statement(stmt.statement)
-
-        elif isinstance(stmt, VariableDecl):
-            if stmt.initializer:
-                self.check_expression(stmt.initializer)
+        walk_nodes(stmt, {CallExpr: self.check_call, IndexExpr: self.check_index})
 
     def check_expression(self, expr: Expression) -> None:
         """Check an expression"""
-        if isinstance(expr, BinaryExpr):
-            self.check_expression(expr.left)
-            self.check_expression(expr.right)
-
-        elif isinstance(expr, UnaryExpr):
-            self.check_expression(expr.operand)
-
-        elif isinstance(expr, CallExpr):
-            self.check_call(expr)
-            for arg in expr.arguments:
-                self.check_expression(arg)
-
-        elif isinstance(expr, MemberExpr):
-            self.check_expression(expr.object)
-
-        elif isinstance(expr, IndexExpr):
-            self.check_expression(expr.object)
-            self.check_expression(expr.index)
-            # Check for potential out-of-bounds access
-            if self.mode == SafetyMode.SAFE:
-                self.statistics['total_operations'] += 1
-
-        elif isinstance(expr, TupleExpr):
-            for elem in expr.elements:
-                self.check_expression(elem)
-
-        elif isinstance(expr, ArrayExpr):
-            for elem in expr.elements:
-                self.check_expression(elem)
+        walk_nodes(expr, {CallExpr: self.check_call, IndexExpr: self.check_index})
 
-        elif isinstance(expr, TryChainExpr):
-            self.check_expression(expr.primary)
-            if expr.secondary:
-                self.check_expression(expr.secondary)
-            if expr.fallback:
-                self.check_expression(expr.fallback)
+    def check_index(self, expr: IndexExpr) -> None:
+        """Count an index expression as an operation in SAFE mode"""
+        # Check for potential out-of-bounds access
+        if self.mode == SafetyMode.SAFE:
+            self.statistics['total_operations'] += 1
 
     def check_call(self, call: CallExpr) -> None:
         """Check a function call for safety violations"""
@@ -343,19 +291,7 @@ class EnhancedSafetyChecker:
 
     def get_call_name(self, call: CallExpr) -> Optional[str]:
         """Extract function name from call expression"""
-        if isinstance(call.callee, IdentifierExpr):
-            return call.callee.name
-        elif isinstance(call.callee, MemberExpr):
-            # Build full path like "kernel32.VirtualAlloc"
-            parts = []
-            expr = call.callee
-            while isinstance(expr, MemberExpr):
-                parts.insert(0, expr.member)
-                expr = expr.object
-            if isinstance(expr, IdentifierExpr):
-                parts.insert(0, expr.name)
-            return ".".join(parts)
-        return None
+        return resolve_call_name(call)
 
     def add_custom_rule(self, operation: str, allowed: bool) -> None:
         """Add a custom safety rule"""
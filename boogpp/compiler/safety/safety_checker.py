@@ -4,8 +4,9 @@ Enforces safety rules based on mode (SAFE, UNSAFE, CUSTOM).
 """
 
 from enum import Enum, auto
-from typing import Set, List, Optional
+from typing import Any, Callable, Dict, Set, List, Optional, Tuple
 from ..parser.ast_nodes import *
+from .safety_rules import index_by_leaf, matching_operations
 
 
 class SafetyMode(Enum):
@@ -15,6 +16,10 @@ class SafetyMode(Enum):
     CUSTOM = auto()
 
 
+# @safety_level mode names, looked up without going through EnumMeta
+_MODE_BY_NAME = {mode.name: mode for mode in SafetyMode}
+
+
 class SafetyLevel(Enum):
     """Safety level for operations"""
     SAFE = auto()           # Always allowed
@@ -24,16 +29,30 @@ class SafetyLevel(Enum):
 
 class SafetyViolation:
     """Represents a safety violation"""
+    # The location stays on the node rather than being copied onto every
+    # violation; line, column and filename read it from there
+    __slots__ = ('message', 'node', 'severity')
+
     def __init__(self, message: str, node: ASTNode, severity: str = "error"):
         self.message = message
         self.node = node
         self.severity = severity
-        self.line = node.line
-        self.column = node.column
-        self.filename = node.filename
+
+    @property
+    def line(self) -> int:
+        return self.node.line
+
+    @property
+    def column(self) -> int:
+        return self.node.column
+
+    @property
+    def filename(self) -> Optional[str]:
+        return self.node.filename
 
     def __str__(self):
-        location = f"{self.filename or '<input>'}:{self.line}:{self.column}"
+        node = self.node
+        location = f"{node.filename or '<input>'}:{node.line}:{node.column}"
         return f"{location}: [{self.severity}] {self.message}"
 
 
@@ -101,13 +120,12 @@ class SafetyChecker:
     def check_program(self, program: Program) -> List[SafetyViolation]:
         """Check entire program for safety violations"""
         self.violations = []
+        self.apply_file_decorators(program)
 
-        # Check file-level safety decorator
-        for decorator in program.decorators:
-            if decorator.name == "safety_level":
-                mode_arg = decorator.arguments.get("mode")
-                if mode_arg and isinstance(mode_arg, IdentifierExpr):
-                    self.mode = SafetyMode[mode_arg.name]
+        # Only SAFE mode restricts calls, and no function can switch back to
+        # it, so in any other mode there is nothing to find
+        if self.mode != SafetyMode.SAFE:
+            return self.violations
 
         # Check all declarations
         for decl in program.declarations:
@@ -115,6 +133,22 @@ class SafetyChecker:
 
         return self.violations
 
+    def apply_file_decorators(self, program: Program) -> None:
+        """Apply file-level decorators such as @safety_level to the checker mode"""
+        for decorator in program.decorators:
+            if decorator.name == "safety_level":
+                mode_arg = decorator.arguments.get("mode")
+                if mode_arg and isinstance(mode_arg, IdentifierExpr):
+                    mode = _MODE_BY_NAME.get(mode_arg.name)
+                    if mode is None:
+                        self.violations.append(SafetyViolation(
+                            f"Unknown safety mode '{mode_arg.name}'. Valid modes: SAFE, UNSAFE, CUSTOM",
+                            decorator,
+                            "error"
+                        ))
+                    else:
+                        self.mode = mode
+
     def check_declaration(self, decl: ASTNode) -> None:
         """Check a declaration"""
         if isinstance(decl, FunctionDecl):
@@ -122,172 +156,80 @@ class SafetyChecker:
 
     def check_function(self, func: FunctionDecl) -> None:
         """Check function for safety violations"""
-        # Check if function has @unsafe decorator
-        function_mode = self.mode
+        # An @unsafe function allows every call in its body, so only other
+        # bodies are walked; they run in the program's mode, so self.mode
+        # needs no save and restore around them
         for decorator in func.decorators:
             if decorator.name == "unsafe":
-                function_mode = SafetyMode.UNSAFE
-                break
+                return
 
-        # Save current mode and switch to function mode
-        saved_mode = self.mode
-        self.mode = function_mode
+        # Only calls are restricted; a body without any has nothing to find
+        if not func.has_calls:
+            return
 
         # Check function body
         self.check_statement(func.body)
 
-        # Restore mode
-        self.mode = saved_mode
-
     def check_statement(self, stmt: Statement) -> None:
         """Check a statement"""
-        if isinstance(stmt, Block):
-            for s in stmt.statements:
-                self.check_statement(s)
-
-        elif isinstance(stmt, ReturnStmt):
-            if stmt.value:
-                self.check_expression(stmt.value)
-
-        elif isinstance(stmt, IfStmt):
-            self.check_expression(stmt.condition)
-            self.check_statement(stmt.then_block)
-            for cond, block in stmt.elif_clauses:
-                self.check_expression(cond)
-                self.check_statement(block)
-            if stmt.else_block:
-                self.check_statement(stmt.else_block)
-
-        elif isinstance(stmt, WhileStmt):
-            self.check_expression(stmt.condition)
-            self.check_statement(stmt.body)
-
-        elif isinstance(stmt, ForStmt):
-            self.check_expression(stmt.iterable)
-            self.check_statement(stmt.body)
-
-        elif isinstance(stmt, MatchStmt):
-            self.check_expression(stmt.value)
-            for case in stmt.cases:
-                self.check_expression(case.pattern)
-                self.check_statement(case.body)
-
-        elif isinstance(stmt, ExprStmt):
-            self.check_expression(stmt.expression)
-
-        elif isinstance(stmt, AssignStmt):
-            self.check_expression(stmt.target)
-            self.check_expression(stmt.value)
-
-        elif isinstance(stmt, DeferStmt):
-            self.check_statement(stmt.statement)
-
-        elif isinstance(stmt, VariableDecl):
-            if stmt.initializer:
-                self.check_expression(stmt.initializer)
+        walk_nodes(stmt, {CallExpr: self.check_call})
 
     def check_expression(self, expr: Expression) -> None:
         """Check an expression"""
-        if isinstance(expr, BinaryExpr):
-            self.check_expression(expr.left)
-            self.check_expression(expr.right)
-
-        elif isinstance(expr, UnaryExpr):
-            self.check_expression(expr.operand)
-
-        elif isinstance(expr, CallExpr):
-            self.check_call(expr)
-            for arg in expr.arguments:
-                self.check_expression(arg)
-
-        elif isinstance(expr, MemberExpr):
-            self.check_expression(expr.object)
-
-        elif isinstance(expr, IndexExpr):
-            self.check_expression(expr.object)
-            self.check_expression(expr.index)
-
-        elif isinstance(expr, TupleExpr):
-            for elem in expr.elements:
-                self.check_expression(elem)
-
-        elif isinstance(expr, ArrayExpr):
-            for elem in expr.elements:
-                self.check_expression(elem)
-
-        elif isinstance(expr, TryChainExpr):
-            self.check_expression(expr.primary)
-            if expr.secondary:
-                self.check_expression(expr.secondary)
-            if expr.fallback:
-                self.check_expression(expr.fallback)
+        walk_nodes(expr, {CallExpr: self.check_call})
 
     def check_call(self, call: CallExpr) -> None:
         """Check a function call for safety violations"""
+        # Only SAFE mode restricts calls
+        if self.mode != SafetyMode.SAFE:
+            return
+
         # Get the function name
         func_name = self.get_call_name(call)
 
         if not func_name:
             return
 
-        # Helper function to check if func_name matches any operation (exact or suffix match)
-        def matches_operation(func_name: str, operations: set) -> bool:
-            if func_name in operations:
-                return True
-            # Check if any operation is a suffix (e.g., "kernel32.VirtualAlloc" matches "windows.kernel32.VirtualAlloc")
-            for op in operations:
-                if func_name.endswith(op):
-                    return True
-            return False
+        # Most calls share no last component with any restricted operation
+        matched = matching_operations(func_name, _RESTRICTED_BY_LEAF)
+        if not matched:
+            return
 
         # Check for dangerous operations
-        if self.mode == SafetyMode.SAFE:
-            if matches_operation(func_name, self.DANGEROUS_OPERATIONS):
-                self.violations.append(SafetyViolation(
-                    f"Dangerous operation '{func_name}' not allowed in SAFE mode. "
-                    f"Use @unsafe decorator or switch to UNSAFE mode.",
-                    call,
-                    "error"
-                ))
-
-            if matches_operation(func_name, self.INJECTION_OPERATIONS):
-                self.violations.append(SafetyViolation(
-                    f"Process injection operation '{func_name}' not allowed in SAFE mode. "
-                    f"Use @unsafe decorator or switch to UNSAFE mode.",
-                    call,
-                    "error"
-                ))
-
-            if matches_operation(func_name, self.KERNEL_OPERATIONS):
-                self.violations.append(SafetyViolation(
-                    f"Kernel operation '{func_name}' not allowed in SAFE mode. "
-                    f"Use @unsafe decorator or switch to UNSAFE mode.",
-                    call,
-                    "error"
-                ))
-
-            if matches_operation(func_name, self.REGISTRY_WRITE_OPS):
-                self.violations.append(SafetyViolation(
-                    f"Registry write operation '{func_name}' will be logged in SAFE mode.",
-                    call,
-                    "warning"
-                ))
+        if not self.DANGEROUS_OPERATIONS.isdisjoint(matched):
+            self.violations.append(SafetyViolation(
+                f"Dangerous operation '{func_name}' not allowed in SAFE mode. "
+                f"Use @unsafe decorator or switch to UNSAFE mode.",
+                call,
+                "error"
+            ))
+
+        if not self.INJECTION_OPERATIONS.isdisjoint(matched):
+            self.violations.append(SafetyViolation(
+                f"Process injection operation '{func_name}' not allowed in SAFE mode. "
+                f"Use @unsafe decorator or switch to UNSAFE mode.",
+                call,
+                "error"
+            ))
+
+        if not self.KERNEL_OPERATIONS.isdisjoint(matched):
+            self.violations.append(SafetyViolation(
+                f"Kernel operation '{func_name}' not allowed in SAFE mode. "
+                f"Use @unsafe decorator or switch to UNSAFE mode.",
+                call,
+                "error"
+            ))
+
+        if not self.REGISTRY_WRITE_OPS.isdisjoint(matched):
+            self.violations.append(SafetyViolation(
+                f"Registry write operation '{func_name}' will be logged in SAFE mode.",
+                call,
+                "warning"
+            ))
 
     def get_call_name(self, call: CallExpr) -> Optional[str]:
         """Extract function name from call expression"""
-        if isinstance(call.callee, IdentifierExpr):
-            return call.callee.name
-        elif isinstance(call.callee, MemberExpr):
-            # Build full path like "kernel32.VirtualAlloc"
-            parts = []
-            expr = call.callee
-            while isinstance(expr, MemberExpr):
-                parts.insert(0, expr.member)
-                expr = expr.object
-            if isinstance(expr, IdentifierExpr):
-                parts.insert(0, expr.name)
-            return ".".join(parts)
-        return None
+        return resolve_call_name(call)
 
     def add_custom_rule(self, operation: str) -> None:
         """Add a custom safety rule"""
@@ -309,6 +251,103 @@ class SafetyChecker:
         return True
 
 
+# Every restricted operation, grouped by last dotted component for check_call
+_RESTRICTED_BY_LEAF = index_by_leaf(
+    SafetyChecker.DANGEROUS_OPERATIONS | SafetyChecker.INJECTION_OPERATIONS |
+    SafetyChecker.KERNEL_OPERATIONS | SafetyChecker.REGISTRY_WRITE_OPS)
+
+# How walk_nodes reaches each child field: a single node, a list of nodes,
+# or a list of (condition, block) pairs
+_NODE, _NODE_LIST, _NODE_PAIRS = range(3)
+
+# Child fields the safety walk descends into, keyed by the concrete AST class
+# (every node class is a leaf), in source order. A call's callee is not
+# walked, only its arguments
+_CHILD_FIELDS: Dict[type, Tuple[Tuple[str, int], ...]] = {
+    Block: (('statements', _NODE_LIST),),
+    ReturnStmt: (('value', _NODE),),
+    IfStmt: (('condition', _NODE), ('then_block', _NODE),
+             ('elif_clauses', _NODE_PAIRS), ('else_block', _NODE)),
+    WhileStmt: (('condition', _NODE), ('body', _NODE)),
+    ForStmt: (('iterable', _NODE), ('body', _NODE)),
+    MatchStmt: (('value', _NODE), ('cases', _NODE_LIST)),
+    CaseClause: (('pattern', _NODE), ('body', _NODE)),
+    ExprStmt: (('expression', _NODE),),
+    AssignStmt: (('target', _NODE), ('value', _NODE)),
+    DeferStmt: (('statement', _NODE),),
+    VariableDecl: (('initializer', _NODE),),
+    BinaryExpr: (('left', _NODE), ('right', _NODE)),
+    UnaryExpr: (('operand', _NODE),),
+    CallExpr: (('arguments', _NODE_LIST),),
+    MemberExpr: (('object', _NODE),),
+    IndexExpr: (('object', _NODE), ('index', _NODE)),
+    TupleExpr: (('elements', _NODE_LIST),),
+    ArrayExpr: (('elements', _NODE_LIST),),
+    TryChainExpr: (('primary', _NODE), ('secondary', _NODE), ('fallback', _NODE)),
+}
+
+# The walk pushes children last-first, so it reads the fields in reverse
+_PUSH_ORDER = {cls: fields[::-1] for cls, fields in _CHILD_FIELDS.items()}
+
+
+def walk_nodes(root: ASTNode, hooks: Dict[type, Callable[[Any], None]]) -> None:
+    """Visit root and its descendants in source order, calling hooks by node class"""
+    # An explicit stack instead of recursion: no Python frame per node, and
+    # no recursion limit on deeply nested expressions
+    stack = [root]
+    pop = stack.pop
+    push = stack.append
+    extend = stack.extend
+    while stack:
+        node = pop()
+        cls = type(node)
+        hook = hooks.get(cls)
+        if hook is not None:
+            hook(node)
+        fields = _PUSH_ORDER.get(cls)
+        if fields is None:
+            continue
+        for name, kind in fields:
+            child = getattr(node, name)
+            if kind == _NODE:
+                if child is not None:
+                    push(child)
+            elif kind == _NODE_LIST:
+                extend(reversed(child))
+            else:
+                for pair in reversed(child):
+                    extend(reversed(pair))
+
+
+def resolve_call_name(call: CallExpr) -> Optional[str]:
+    """Extract a call's function name, caching it on the node"""
+    # Every safety pass over the same AST asks again; the walk up the member
+    # chain runs once per call site. An unset slot means not resolved yet
+    try:
+        return call.call_name
+    except AttributeError:
+        pass
+
+    name: Optional[str]
+    expr: Expression = call.callee
+    if type(expr) is IdentifierExpr:
+        name = expr.name
+    elif type(expr) is MemberExpr:
+        # Build full path like "kernel32.VirtualAlloc", collected
+        # innermost-last and reversed once
+        parts: List[str] = []
+        while type(expr) is MemberExpr:
+            parts.append(expr.member)
+            expr = expr.object
+        if type(expr) is IdentifierExpr:
+            parts.append(expr.name)
+        parts.reverse()
+        name = ".".join(parts)
+    else:
+        name = None
+    call.call_name = name
+    return name
+
 def check_safety(program: Program, mode: SafetyMode = SafetyMode.SAFE) -> List[SafetyViolation]:
     """Convenience function to check program safety"""
     checker = SafetyChecker(mode)
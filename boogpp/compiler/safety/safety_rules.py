@@ -4,10 +4,34 @@ Defines detailed safety rules and policies for different safety levels.
 """
 
 from enum import Enum, auto
-from typing import Set, Dict, List, Optional
+from typing import Set, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 
+def operation_leaf(operation: str) -> str:
+    """Last dotted component of an operation name"""
+    return operation.rpartition('.')[2]
+
+
+def index_by_leaf(operations: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """Group operation names by their last dotted component, keeping their order"""
+    index: Dict[str, Tuple[str, ...]] = {}
+    for operation in operations:
+        leaf = operation_leaf(operation)
+        index[leaf] = index.get(leaf, ()) + (operation,)
+    return index
+
+
+def matching_operations(name: str, index: Dict[str, Tuple[str, ...]]) -> List[str]:
+    """Indexed operations that name is, or ends with at a dot boundary"""
+    # e.g. "windows.kernel32.VirtualAlloc" matches "kernel32.VirtualAlloc",
+    # but "my_alloc" does not match "alloc"
+    candidates = index.get(operation_leaf(name))
+    if candidates is None:
+        return []
+    return [op for op in candidates if name == op or name.endswith('.' + op)]
+
+
 class SafetyCategory(Enum):
     """Categories of safety-sensitive operations"""
     MEMORY_MANAGEMENT = auto()
@@ -48,6 +72,8 @@ class SafetyRuleDatabase:
 
     def __init__(self):
         self.rules: Dict[str, SafetyRule] = {}
+        # Rule names grouped by last dotted component, kept by _add_rule
+        self.rules_by_leaf: Dict[str, Tuple[str, ...]] = {}
         self._init_rules()
 
     def _init_rules(self):
@@ -245,6 +271,9 @@ class SafetyRuleDatabase:
 
     def _add_rule(self, rule: SafetyRule):
         """Add a rule to the database"""
+        if rule.operation not in self.rules:
+            leaf = operation_leaf(rule.operation)
+            self.rules_by_leaf[leaf] = self.rules_by_leaf.get(leaf, ()) + (rule.operation,)
         self.rules[rule.operation] = rule
 
     def _add_wildcard_rules(self):
@@ -280,10 +309,10 @@ class SafetyRuleDatabase:
         if operation in self.rules:
             return self.rules[operation]
 
-        # Try suffix match for module.function patterns
-        for rule_name, rule in self.rules.items():
-            if operation.endswith(rule_name):
-                return rule
+        # Try suffix match for module.function patterns: only rules sharing
+        # the name's last component can match
+        for rule_name in matching_operations(operation, self.rules_by_leaf):
+            return self.rules[rule_name]
 
         return None
 
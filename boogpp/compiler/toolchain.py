@@ -0,0 +1,86 @@
+"""
+Boogpp Toolchain Discovery
+Locates the LLVM tools used for linking, caching the result across runs.
+"""
+
+import functools
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+TOOLCHAIN_CACHE_FILE = Path.home() / ".boogpp" / "toolchain.json"
+
+# Executable name and common install locations probed when it is not on PATH
+_TOOLS: Dict[str, List[str]] = {
+    'clang': [
+        "C:/Program Files/LLVM/bin/clang.exe",
+        "C:/Program Files (x86)/LLVM/bin/clang.exe",
+    ],
+    'llc': [
+        "C:/Program Files/LLVM/bin/llc.exe",
+        "C:/Program Files (x86)/LLVM/bin/llc.exe",
+    ],
+    'lld-link': [
+        "C:/Program Files/LLVM/bin/lld-link.exe",
+    ],
+}
+
+
+def _probe(tool: str) -> Optional[str]:
+    """Search PATH and common install locations for a tool"""
+    path = shutil.which(tool)
+    if path:
+        return path
+    for candidate in _TOOLS[tool]:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def _load_cached() -> Dict[str, Optional[str]]:
+    """Load previously discovered tool paths"""
+    try:
+        with open(TOOLCHAIN_CACHE_FILE, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cached if isinstance(cached, dict) else {}
+
+
+def _store_cached(toolchain: Dict[str, Optional[str]]) -> None:
+    """Persist discovered tool paths, ignoring failures"""
+    try:
+        TOOLCHAIN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(TOOLCHAIN_CACHE_FILE.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(toolchain, f, indent=2)
+            os.replace(tmp_path, TOOLCHAIN_CACHE_FILE)
+        except BaseException:
+            # Do not leave the temp file behind on a failed write
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        pass
+
+
+@functools.lru_cache(maxsize=1)
+def find_toolchain() -> Dict[str, Optional[str]]:
+    """Locate clang, llc and lld-link, keyed by tool name"""
+    # A cached path costs one existence check; tools that were missing
+    # or have moved are probed again so new installs are picked up
+    cached = _load_cached()
+    toolchain = {}
+    for tool in _TOOLS:
+        path = cached.get(tool)
+        if not (isinstance(path, str) and os.path.exists(path)):
+            path = _probe(tool)
+        toolchain[tool] = path
+
+    if toolchain != cached:
+        _store_cached(toolchain)
+    return toolchain
@@ -3,7 +3,7 @@ Boogpp Type Checker
 Performs type checking and type inference on the AST.
 """
 
-from typing import List, Optional, Dict
+from typing import Any, Callable, List, Optional, Dict
 from ..parser.ast_nodes import *
 from .type_system import (
     Type, TypeKind, TypeEnvironment, TypeVariable,
@@ -34,6 +34,9 @@ class TypeChecker:
         self.errors: List[TypeError] = []
         self.type_annotations: Dict[ASTNode, Type] = {}
         self.current_function_return_type: Optional[Type] = None
+        self.loop_depth = 0  # enclosing while/for loops, for break and continue
+        # Hash-consed compound types, keyed by annotation structure
+        self._resolved_types: Dict[tuple, Type] = {}
 
         # Initialize built-in types and functions
         self._init_builtins()
@@ -71,6 +74,11 @@ class TypeChecker:
             param_types=[PRIMITIVE_TYPES['u64']],
             return_type=PRIMITIVE_TYPES['void']
         ))
+        self.env.define_function('status_string', Type(
+            TypeKind.FUNCTION,
+            param_types=[PRIMITIVE_TYPES['i32']],
+            return_type=PRIMITIVE_TYPES['string']
+        ))
         self.env.define_function('range', Type(
             TypeKind.FUNCTION,
             param_types=[PRIMITIVE_TYPES['i32'], PRIMITIVE_TYPES['i32']],
@@ -82,6 +90,16 @@ class TypeChecker:
         self.errors = []
 
         # First pass: collect all function and struct declarations
+        self.register_declarations(program)
+
+        # Second pass: type check all declarations
+        for decl in program.declarations:
+            self.check_declaration(decl)
+
+        return self.errors
+
+    def register_declarations(self, program: Program) -> None:
+        """Register all top-level function, struct and enum declarations"""
         for decl in program.declarations:
             if isinstance(decl, FunctionDecl):
                 self._register_function(decl)
@@ -90,12 +108,6 @@ class TypeChecker:
             elif isinstance(decl, EnumDecl):
                 self._register_enum(decl)
 
-        # Second pass: type check all declarations
-        for decl in program.declarations:
-            self.check_declaration(decl)
-
-        return self.errors
-
     def _register_function(self, func: FunctionDecl) -> None:
         """Register a function in the type environment"""
         param_types = []
@@ -132,6 +144,22 @@ class TypeChecker:
 
     def resolve_type_annotation(self, type_node: Optional[TypeNode]) -> Type:
         """Resolve a type annotation to a Type"""
+        if type_node is None or isinstance(type_node, TypeName):
+            return self._resolve_type_annotation(type_node)
+
+        # Structurally identical compound annotations share one Type; only
+        # clean resolutions are cached so every bad annotation still reports
+        key = _type_key(type_node)
+        resolved = self._resolved_types.get(key)
+        if resolved is None:
+            error_count = len(self.errors)
+            resolved = self._resolve_type_annotation(type_node)
+            if len(self.errors) == error_count:
+                self._resolved_types[key] = resolved
+        return resolved
+
+    def _resolve_type_annotation(self, type_node: Optional[TypeNode]) -> Type:
+        """Resolve a type annotation to a Type without caching"""
         if type_node is None:
             return Type(TypeKind.UNKNOWN)
 
@@ -211,16 +239,19 @@ class TypeChecker:
 
     def check_variable_decl(self, decl: VariableDecl) -> None:
         """Check a variable declaration"""
-        # Type check initializer if present
-        init_type = None
-        if decl.initializer:
-            init_type = self.check_expression(decl.initializer)
-
         # Resolve declared type
         declared_type = None
         if decl.type_annotation:
             declared_type = self.resolve_type_annotation(decl.type_annotation)
 
+        # Type check initializer if present, against the declared type if any
+        init_type = None
+        if decl.initializer:
+            if declared_type:
+                init_type = self.check_expression_against(decl.initializer, declared_type)
+            else:
+                init_type = self.check_expression(decl.initializer)
+
         # Determine variable type
         if declared_type and init_type:
             # Both declared and inferred - check compatibility
@@ -243,194 +274,248 @@ class TypeChecker:
 
         # Add to environment
         self.env.define_variable(decl.name, var_type)
-        self.type_annotations[decl] = var_type
+        self._annotate(decl, var_type)
 
     def check_statement(self, stmt: Statement) -> None:
         """Check a statement"""
-        if isinstance(stmt, Block):
-            # Create new scope for block
-            self.env = self.env.create_child()
-            for s in stmt.statements:
-                self.check_statement(s)
-            self.env = self.env.parent
-
-        elif isinstance(stmt, ReturnStmt):
-            if stmt.value:
-                return_type = self.check_expression(stmt.value)
-                if self.current_function_return_type:
-                    if not return_type.can_assign_to(self.current_function_return_type):
-                        self.errors.append(TypeError(
-                            f"Cannot return value of type '{return_type}', expected '{self.current_function_return_type}'",
-                            stmt
-                        ))
+        handler = _STATEMENT_CHECKERS.get(type(stmt))
+        if handler is not None:
+            handler(self, stmt)
+
+    def check_block(self, stmt: Block) -> None:
+        """Check a block in a new scope"""
+        # Create new scope for block
+        self.env = self.env.create_child()
+        for s in stmt.statements:
+            self.check_statement(s)
+        self.env = self.env.parent
+
+    def check_return_stmt(self, stmt: ReturnStmt) -> None:
+        """Check a return statement against the function return type"""
+        if stmt.value:
+            if self.current_function_return_type:
+                return_type = self.check_expression_against(stmt.value, self.current_function_return_type)
             else:
-                if (self.current_function_return_type and
-                    self.current_function_return_type.kind != TypeKind.VOID):
+                return_type = self.check_expression(stmt.value)
+            if self.current_function_return_type:
+                if not return_type.can_assign_to(self.current_function_return_type):
                     self.errors.append(TypeError(
-                        f"Must return a value of type '{self.current_function_return_type}'",
+                        f"Cannot return value of type '{return_type}', expected '{self.current_function_return_type}'",
                         stmt
                     ))
-
-        elif isinstance(stmt, IfStmt):
-            cond_type = self.check_expression(stmt.condition)
-            if cond_type.kind != TypeKind.BOOL:
+        else:
+            if (self.current_function_return_type and
+                self.current_function_return_type.kind != TypeKind.VOID):
                 self.errors.append(TypeError(
-                    f"If condition must be bool, got '{cond_type}'",
-                    stmt.condition
+                    f"Must return a value of type '{self.current_function_return_type}'",
+                    stmt
                 ))
-            self.check_statement(stmt.then_block)
-            for cond, block in stmt.elif_clauses:
-                cond_type = self.check_expression(cond)
-                if cond_type.kind != TypeKind.BOOL:
-                    self.errors.append(TypeError(
-                        f"Elif condition must be bool, got '{cond_type}'",
-                        cond
-                    ))
-                self.check_statement(block)
-            if stmt.else_block:
-                self.check_statement(stmt.else_block)
 
-        elif isinstance(stmt, WhileStmt):
-            cond_type = self.check_expression(stmt.condition)
+    def check_if_stmt(self, stmt: IfStmt) -> None:
+        """Check an if statement"""
+        cond_type = self.check_expression(stmt.condition)
+        if cond_type.kind != TypeKind.BOOL:
+            self.errors.append(TypeError(
+                f"If condition must be bool, got '{cond_type}'",
+                stmt.condition
+            ))
+        self.check_statement(stmt.then_block)
+        for cond, block in stmt.elif_clauses:
+            cond_type = self.check_expression(cond)
             if cond_type.kind != TypeKind.BOOL:
                 self.errors.append(TypeError(
-                    f"While condition must be bool, got '{cond_type}'",
-                    stmt.condition
+                    f"Elif condition must be bool, got '{cond_type}'",
+                    cond
                 ))
-            self.check_statement(stmt.body)
+            self.check_statement(block)
+        if stmt.else_block:
+            self.check_statement(stmt.else_block)
+
+    def check_while_stmt(self, stmt: WhileStmt) -> None:
+        """Check a while statement"""
+        cond_type = self.check_expression(stmt.condition)
+        if cond_type.kind != TypeKind.BOOL:
+            self.errors.append(TypeError(
+                f"While condition must be bool, got '{cond_type}'",
+                stmt.condition
+            ))
+        self.loop_depth += 1
+        self.check_statement(stmt.body)
+        self.loop_depth -= 1
+
+    def check_for_stmt(self, stmt: ForStmt) -> None:
+        """Check a for statement"""
+        iter_type = self.check_expression(stmt.iterable)
+        # Check if iterable is a slice or array
+        if iter_type.kind not in (TypeKind.SLICE, TypeKind.ARRAY):
+            self.errors.append(TypeError(
+                f"For loop requires iterable type (slice or array), got '{iter_type}'",
+                stmt.iterable
+            ))
+        # Add loop variable to scope
+        self.env = self.env.create_child()
+        elem_type = iter_type.element_type if iter_type.element_type else Type(TypeKind.UNKNOWN)
+        self.env.define_variable(stmt.variable, elem_type)
+        self.loop_depth += 1
+        self.check_statement(stmt.body)
+        self.loop_depth -= 1
+        self.env = self.env.parent
 
-        elif isinstance(stmt, ForStmt):
-            iter_type = self.check_expression(stmt.iterable)
-            # Check if iterable is a slice or array
-            if iter_type.kind not in (TypeKind.SLICE, TypeKind.ARRAY):
+    def check_break_stmt(self, stmt: BreakStmt) -> None:
+        """Check that a break is inside a loop"""
+        if not self.loop_depth:
+            self.errors.append(TypeError("'break' outside loop", stmt))
+
+    def check_continue_stmt(self, stmt: ContinueStmt) -> None:
+        """Check that a continue is inside a loop"""
+        if not self.loop_depth:
+            self.errors.append(TypeError("'continue' outside loop", stmt))
+
+    def check_match_stmt(self, stmt: MatchStmt) -> None:
+        """Check a match statement"""
+        value_type = self.check_expression(stmt.value)
+        for case in stmt.cases:
+            pattern_type = self.check_expression(case.pattern)
+            # Pattern should be compatible with value type
+            if not pattern_type.can_assign_to(value_type):
                 self.errors.append(TypeError(
-                    f"For loop requires iterable type (slice or array), got '{iter_type}'",
-                    stmt.iterable
+                    f"Match pattern type '{pattern_type}' incompatible with value type '{value_type}'",
+                    case.pattern
                 ))
-            # Add loop variable to scope
-            self.env = self.env.create_child()
-            elem_type = iter_type.element_type if iter_type.element_type else Type(TypeKind.UNKNOWN)
-            self.env.define_variable(stmt.variable, elem_type)
-            self.check_statement(stmt.body)
-            self.env = self.env.parent
-
-        elif isinstance(stmt, MatchStmt):
-            value_type = self.check_expression(stmt.value)
-            for case in stmt.cases:
-                pattern_type = self.check_expression(case.pattern)
-                # Pattern should be compatible with value type
-                if not pattern_type.can_assign_to(value_type):
-                    self.errors.append(TypeError(
-                        f"Match pattern type '{pattern_type}' incompatible with value type '{value_type}'",
-                        case.pattern
-                    ))
-                self.check_statement(case.body)
+            self.check_statement(case.body)
 
-        elif isinstance(stmt, ExprStmt):
-            self.check_expression(stmt.expression)
+    def check_expr_stmt(self, stmt: ExprStmt) -> None:
+        """Check an expression statement"""
+        self.check_expression(stmt.expression)
 
-        elif isinstance(stmt, AssignStmt):
-            target_type = self.check_expression(stmt.target)
+    def check_assign_stmt(self, stmt: AssignStmt) -> None:
+        """Check an assignment"""
+        target_type = self.check_expression(stmt.target)
+        if stmt.operator == '=':
+            value_type = self.check_expression_against(stmt.value, target_type)
+        else:
             value_type = self.check_expression(stmt.value)
 
-            if stmt.operator == '=':
-                if not value_type.can_assign_to(target_type):
-                    self.errors.append(TypeError(
-                        f"Cannot assign value of type '{value_type}' to target of type '{target_type}'",
-                        stmt
-                    ))
-            else:
-                # Compound assignment (+=, -=, etc.)
-                # Check operator compatibility
-                if not target_type.is_numeric() or not value_type.is_numeric():
-                    self.errors.append(TypeError(
-                        f"Compound assignment requires numeric types, got '{target_type}' and '{value_type}'",
-                        stmt
-                    ))
-
-        elif isinstance(stmt, DeferStmt):
-            self.check_statement(stmt.statement)
+        if stmt.operator == '=':
+            if not value_type.can_assign_to(target_type):
+                self.errors.append(TypeError(
+                    f"Cannot assign value of type '{value_type}' to target of type '{target_type}'",
+                    stmt
+                ))
+        else:
+            # Compound assignment (+=, -=, etc.)
+            # Check operator compatibility
+            if not target_type.is_numeric() or not value_type.is_numeric():
+                self.errors.append(TypeError(
+                    f"Compound assignment requires numeric types, got '{target_type}' and '{value_type}'",
+                    stmt
+                ))
 
-        elif isinstance(stmt, VariableDecl):
-            self.check_variable_decl(stmt)
+    def check_defer_stmt(self, stmt: DeferStmt) -> None:
+        """Check a defer statement"""
+        self.check_statement(stmt.statement)
 
     def check_expression(self, expr: Expression) -> Type:
         """Check an expression and return its type"""
-        if isinstance(expr, LiteralExpr):
-            return self.check_literal(expr)
+        handler = _EXPRESSION_CHECKERS.get(type(expr))
+        if handler is not None:
+            return handler(self, expr)
+        return Type(TypeKind.UNKNOWN)
 
-        elif isinstance(expr, IdentifierExpr):
-            var_type = self.env.lookup_variable(expr.name)
-            if var_type is None:
+    def check_identifier_expr(self, expr: IdentifierExpr) -> Type:
+        """Check an identifier against the variables in scope"""
+        var_type = self.env.lookup_variable(expr.name)
+        if var_type is None:
+            self.errors.append(TypeError(
+                f"Undefined variable '{expr.name}'",
+                expr
+            ))
+            return Type(TypeKind.ERROR)
+        self._annotate(expr, var_type)
+        return var_type
+
+    def check_tuple_expr(self, expr: TupleExpr) -> Type:
+        """Check a tuple literal"""
+        element_types = [self.check_expression(e) for e in expr.elements]
+        tuple_type = Type(TypeKind.TUPLE, element_types=element_types)
+        self._annotate(expr, tuple_type)
+        return tuple_type
+
+    def check_array_expr(self, expr: ArrayExpr) -> Type:
+        """Check an array literal"""
+        if not expr.elements:
+            # Empty array - need type annotation
+            return Type(TypeKind.ARRAY, element_type=Type(TypeKind.UNKNOWN), size=0)
+
+        # Check all elements have same type
+        first_type = self.check_expression(expr.elements[0])
+        for elem in expr.elements[1:]:
+            elem_type = self.check_expression(elem)
+            if elem_type != first_type:
                 self.errors.append(TypeError(
-                    f"Undefined variable '{expr.name}'",
-                    expr
+                    f"Array elements must have same type, got '{first_type}' and '{elem_type}'",
+                    elem
                 ))
-                return Type(TypeKind.ERROR)
-            self.type_annotations[expr] = var_type
-            return var_type
-
-        elif isinstance(expr, BinaryExpr):
-            return self.check_binary_expr(expr)
-
-        elif isinstance(expr, UnaryExpr):
-            return self.check_unary_expr(expr)
 
-        elif isinstance(expr, CallExpr):
-            return self.check_call_expr(expr)
-
-        elif isinstance(expr, MemberExpr):
-            return self.check_member_expr(expr)
-
-        elif isinstance(expr, IndexExpr):
-            return self.check_index_expr(expr)
-
-        elif isinstance(expr, TupleExpr):
-            element_types = [self.check_expression(e) for e in expr.elements]
-            tuple_type = Type(TypeKind.TUPLE, element_types=element_types)
-            self.type_annotations[expr] = tuple_type
-            return tuple_type
-
-        elif isinstance(expr, ArrayExpr):
-            if not expr.elements:
-                # Empty array - need type annotation
-                return Type(TypeKind.ARRAY, element_type=Type(TypeKind.UNKNOWN), size=0)
-
-            # Check all elements have same type
-            first_type = self.check_expression(expr.elements[0])
-            for elem in expr.elements[1:]:
-                elem_type = self.check_expression(elem)
-                if elem_type != first_type:
+        array_type = Type(TypeKind.ARRAY, element_type=first_type, size=len(expr.elements))
+        self._annotate(expr, array_type)
+        return array_type
+
+    def check_try_chain_expr(self, expr: TryChainExpr) -> Type:
+        """Check a try_chain expression"""
+        # All branches should have compatible types
+        primary_type = self.check_expression(expr.primary)
+        if expr.secondary:
+            secondary_type = self.check_expression(expr.secondary)
+            if not secondary_type.can_assign_to(primary_type):
+                self.errors.append(TypeError(
+                    f"try_chain secondary type '{secondary_type}' incompatible with primary type '{primary_type}'",
+                    expr.secondary
+                ))
+        if expr.fallback:
+            fallback_type = self.check_expression(expr.fallback)
+            if not fallback_type.can_assign_to(primary_type):
+                self.errors.append(TypeError(
+                    f"try_chain fallback type '{fallback_type}' incompatible with primary type '{primary_type}'",
+                    expr.fallback
+                ))
+        self._annotate(expr, primary_type)
+        return primary_type
+
+    def _annotate(self, node: ASTNode, typ: Type) -> None:
+        """Record a node's type on the node and in type_annotations"""
+        node.resolved_type = typ
+        self.type_annotations[node] = typ
+
+    def check_expression_against(self, expr: Expression, expected: Type) -> Type:
+        """Check an expression against an expected type and return its type"""
+        # Literals take the expected type directly instead of being inferred
+        # as i32/f64 and converted; array literals push the element type down
+        # so each element is checked once rather than compared to the first
+        if isinstance(expr, LiteralExpr):
+            if (expr.literal_type in ('int', 'integer') and expected.is_integer()
+                    and _integer_fits(expr.value, expected)):
+                self._annotate(expr, expected)
+                return expected
+            if expr.literal_type == 'float' and expected.is_float():
+                self._annotate(expr, expected)
+                return expected
+
+        elif (isinstance(expr, ArrayExpr) and expr.elements
+                and expected.kind == TypeKind.ARRAY and expected.element_type):
+            element_type = expected.element_type
+            for elem in expr.elements:
+                elem_type = self.check_expression_against(elem, element_type)
+                if not elem_type.can_assign_to(element_type):
                     self.errors.append(TypeError(
-                        f"Array elements must have same type, got '{first_type}' and '{elem_type}'",
+                        f"Array element of type '{elem_type}' incompatible with element type '{element_type}'",
                         elem
                     ))
-
-            array_type = Type(TypeKind.ARRAY, element_type=first_type, size=len(expr.elements))
-            self.type_annotations[expr] = array_type
+            array_type = Type(TypeKind.ARRAY, element_type=element_type, size=len(expr.elements))
+            self._annotate(expr, array_type)
             return array_type
 
-        elif isinstance(expr, TryChainExpr):
-            # All branches should have compatible types
-            primary_type = self.check_expression(expr.primary)
-            if expr.secondary:
-                secondary_type = self.check_expression(expr.secondary)
-                if not secondary_type.can_assign_to(primary_type):
-                    self.errors.append(TypeError(
-                        f"try_chain secondary type '{secondary_type}' incompatible with primary type '{primary_type}'",
-                        expr.secondary
-                    ))
-            if expr.fallback:
-                fallback_type = self.check_expression(expr.fallback)
-                if not fallback_type.can_assign_to(primary_type):
-                    self.errors.append(TypeError(
-                        f"try_chain fallback type '{fallback_type}' incompatible with primary type '{primary_type}'",
-                        expr.fallback
-                    ))
-            self.type_annotations[expr] = primary_type
-            return primary_type
-
-        return Type(TypeKind.UNKNOWN)
+        return self.check_expression(expr)
 
     def check_literal(self, literal: LiteralExpr) -> Type:
         """Check a literal expression"""
@@ -448,7 +533,7 @@ class TypeChecker:
         else:
             lit_type = Type(TypeKind.UNKNOWN)
 
-        self.type_annotations[literal] = lit_type
+        self._annotate(literal, lit_type)
         return lit_type
 
     def check_binary_expr(self, expr: BinaryExpr) -> Type:
@@ -466,7 +551,7 @@ class TypeChecker:
                 return Type(TypeKind.ERROR)
             # Result type is the wider of the two types
             result_type = left_type if left_type == right_type else PRIMITIVE_TYPES['i32']
-            self.type_annotations[expr] = result_type
+            self._annotate(expr, result_type)
             return result_type
 
         # Comparison operators
@@ -478,7 +563,7 @@ class TypeChecker:
                         expr
                     ))
             result_type = PRIMITIVE_TYPES['bool']
-            self.type_annotations[expr] = result_type
+            self._annotate(expr, result_type)
             return result_type
 
         # Logical operators
@@ -489,7 +574,7 @@ class TypeChecker:
                     expr
                 ))
             result_type = PRIMITIVE_TYPES['bool']
-            self.type_annotations[expr] = result_type
+            self._annotate(expr, result_type)
             return result_type
 
         # Bitwise operators
@@ -501,7 +586,7 @@ class TypeChecker:
                 ))
                 return Type(TypeKind.ERROR)
             result_type = left_type
-            self.type_annotations[expr] = result_type
+            self._annotate(expr, result_type)
             return result_type
 
         return Type(TypeKind.UNKNOWN)
@@ -534,7 +619,7 @@ class TypeChecker:
         else:
             result_type = Type(TypeKind.UNKNOWN)
 
-        self.type_annotations[expr] = result_type
+        self._annotate(expr, result_type)
         return result_type
 
     def check_call_expr(self, expr: CallExpr) -> Type:
@@ -567,15 +652,17 @@ class TypeChecker:
 
             # Check argument types
             for i, (arg, expected_type) in enumerate(zip(expr.arguments, func_type.param_types)):
-                arg_type = self.check_expression(arg)
-                if expected_type.kind != TypeKind.UNKNOWN:  # Skip generic types
-                    if not arg_type.can_assign_to(expected_type):
-                        self.errors.append(TypeError(
-                            f"Argument {i+1} to function '{func_name}': expected '{expected_type}', got '{arg_type}'",
-                            arg
-                        ))
-
-            self.type_annotations[expr] = func_type.return_type
+                if expected_type.kind == TypeKind.UNKNOWN:  # Skip generic types
+                    self.check_expression(arg)
+                    continue
+                arg_type = self.check_expression_against(arg, expected_type)
+                if not arg_type.can_assign_to(expected_type):
+                    self.errors.append(TypeError(
+                        f"Argument {i+1} to function '{func_name}': expected '{expected_type}', got '{arg_type}'",
+                        arg
+                    ))
+
+            self._annotate(expr, func_type.return_type)
             return func_type.return_type
 
         # If not a simple function call, return unknown
@@ -588,7 +675,7 @@ class TypeChecker:
         if object_type.kind == TypeKind.STRUCT:
             if object_type.fields and expr.member in object_type.fields:
                 member_type = object_type.fields[expr.member]
-                self.type_annotations[expr] = member_type
+                self._annotate(expr, member_type)
                 return member_type
             else:
                 self.errors.append(TypeError(
@@ -615,7 +702,7 @@ class TypeChecker:
         # Object must be array or slice
         if object_type.kind in (TypeKind.ARRAY, TypeKind.SLICE):
             elem_type = object_type.element_type
-            self.type_annotations[expr] = elem_type
+            self._annotate(expr, elem_type)
             return elem_type
         else:
             self.errors.append(TypeError(
@@ -625,6 +712,60 @@ class TypeChecker:
             return Type(TypeKind.ERROR)
 
 
+# Dispatch tables, keyed by the concrete AST class (every node class is a leaf)
+_STATEMENT_CHECKERS: Dict[type, Callable[[TypeChecker, Any], None]] = {
+    Block: TypeChecker.check_block,
+    ReturnStmt: TypeChecker.check_return_stmt,
+    IfStmt: TypeChecker.check_if_stmt,
+    WhileStmt: TypeChecker.check_while_stmt,
+    ForStmt: TypeChecker.check_for_stmt,
+    BreakStmt: TypeChecker.check_break_stmt,
+    ContinueStmt: TypeChecker.check_continue_stmt,
+    MatchStmt: TypeChecker.check_match_stmt,
+    ExprStmt: TypeChecker.check_expr_stmt,
+    AssignStmt: TypeChecker.check_assign_stmt,
+    DeferStmt: TypeChecker.check_defer_stmt,
+    VariableDecl: TypeChecker.check_variable_decl,
+}
+
+_EXPRESSION_CHECKERS: Dict[type, Callable[[TypeChecker, Any], Type]] = {
+    LiteralExpr: TypeChecker.check_literal,
+    IdentifierExpr: TypeChecker.check_identifier_expr,
+    BinaryExpr: TypeChecker.check_binary_expr,
+    UnaryExpr: TypeChecker.check_unary_expr,
+    CallExpr: TypeChecker.check_call_expr,
+    MemberExpr: TypeChecker.check_member_expr,
+    IndexExpr: TypeChecker.check_index_expr,
+    TupleExpr: TypeChecker.check_tuple_expr,
+    ArrayExpr: TypeChecker.check_array_expr,
+    TryChainExpr: TypeChecker.check_try_chain_expr,
+}
+
+def _type_key(type_node: Optional[TypeNode]) -> tuple:
+    """Build a structural key for a type annotation"""
+    if isinstance(type_node, TypeName):
+        return ('name', type_node.name)
+    if isinstance(type_node, TypePtr):
+        return ('ptr', _type_key(type_node.element_type))
+    if isinstance(type_node, TypeArray):
+        return ('array', _type_key(type_node.element_type), type_node.size)
+    if isinstance(type_node, TypeSlice):
+        return ('slice', _type_key(type_node.element_type))
+    if isinstance(type_node, TypeTuple):
+        return ('tuple',) + tuple(_type_key(t) for t in type_node.element_types)
+    if isinstance(type_node, TypeResult):
+        return ('result', _type_key(type_node.value_type))
+    return (type(type_node).__name__,)
+
+
+def _integer_fits(value: int, int_type: Type) -> bool:
+    """Check whether an integer literal is representable in an integer type"""
+    bits = int(int_type.kind.name[1:])
+    if int_type.is_signed():
+        return -(1 << (bits - 1)) <= value < (1 << (bits - 1))
+    return 0 <= value < (1 << bits)
+
+
 def check_types(program: Program) -> List[TypeError]:
     """Convenience function to type check a program"""
     checker = TypeChecker()
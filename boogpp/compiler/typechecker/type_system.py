@@ -47,6 +47,15 @@ class TypeKind(Enum):
     ERROR = auto()       # Error type
 
 
+# Kind groups behind the Type.is_* predicates. Tuples rather than sets:
+# Enum.__hash__ runs in Python, so a short identity scan beats a hash probe
+SIGNED_KINDS = (TypeKind.I8, TypeKind.I16, TypeKind.I32, TypeKind.I64)
+UNSIGNED_KINDS = (TypeKind.U8, TypeKind.U16, TypeKind.U32, TypeKind.U64)
+INTEGER_KINDS = SIGNED_KINDS + UNSIGNED_KINDS
+FLOAT_KINDS = (TypeKind.F32, TypeKind.F64)
+NUMERIC_KINDS = INTEGER_KINDS + FLOAT_KINDS
+
+
 @dataclass
 class Type:
     """Represents a type in the type system"""
@@ -94,6 +103,8 @@ class Type:
 
     def __eq__(self, other) -> bool:
         """Check type equality"""
+        if self is other:
+            return True
         if not isinstance(other, Type):
             return False
 
@@ -126,30 +137,23 @@ class Type:
 
     def is_numeric(self) -> bool:
         """Check if type is numeric"""
-        return self.kind in (
-            TypeKind.I8, TypeKind.I16, TypeKind.I32, TypeKind.I64,
-            TypeKind.U8, TypeKind.U16, TypeKind.U32, TypeKind.U64,
-            TypeKind.F32, TypeKind.F64
-        )
+        return self.kind in NUMERIC_KINDS
 
     def is_integer(self) -> bool:
         """Check if type is integer"""
-        return self.kind in (
-            TypeKind.I8, TypeKind.I16, TypeKind.I32, TypeKind.I64,
-            TypeKind.U8, TypeKind.U16, TypeKind.U32, TypeKind.U64
-        )
+        return self.kind in INTEGER_KINDS
 
     def is_signed(self) -> bool:
         """Check if type is signed integer"""
-        return self.kind in (TypeKind.I8, TypeKind.I16, TypeKind.I32, TypeKind.I64)
+        return self.kind in SIGNED_KINDS
 
     def is_unsigned(self) -> bool:
         """Check if type is unsigned integer"""
-        return self.kind in (TypeKind.U8, TypeKind.U16, TypeKind.U32, TypeKind.U64)
+        return self.kind in UNSIGNED_KINDS
 
     def is_float(self) -> bool:
         """Check if type is floating point"""
-        return self.kind in (TypeKind.F32, TypeKind.F64)
+        return self.kind in FLOAT_KINDS
 
     def is_pointer(self) -> bool:
         """Check if type is pointer"""
@@ -0,0 +1,24 @@
+"""
+Boogpp build hook
+Metadata lives in pyproject.toml; this only adds the optional mypyc build
+of the code generator and parser. Set BOOGPP_MYPYC=1 to compile them.
+"""
+
+import os
+
+from setuptools import setup
+
+# Pure-Python and type-clean under mypy, so mypyc compiles them unchanged
+MYPYC_MODULES = [
+    "boogpp/compiler/codegen/llvm_codegen.py",
+    "boogpp/compiler/codegen/promotion.py",
+    "boogpp/compiler/parser/parser.py",
+]
+
+ext_modules = []
+if os.environ.get("BOOGPP_MYPYC") == "1":
+    from mypyc.build import mypycify
+    # Modules they import stay interpreted, so only these must type-check
+    ext_modules = mypycify(["--follow-imports=silent", *MYPYC_MODULES], opt_level="3")
+
+setup(ext_modules=ext_modules)
@@ -32,6 +32,13 @@ func main() -> i32:
     try:
         tokens = tokenize(source, "test.bpp")
         print(f"  ✓ Lexer generated {len(tokens)} tokens")
+
+        # Repeated identifiers and operators share one string object
+        values = tokenize("count + count + count\n", "test.bpp").values
+        if not (values[0] is values[2] is values[4] and values[1] is values[3]):
+            print("  ✗ Repeated identifier/operator values are not shared")
+            return False
+        print("  ✓ Identifier and operator values are shared")
         return True
     except LexerError as e:
         print(f"  ✗ Lexer error: {e}")
@@ -122,6 +129,35 @@ func main() -> i32:
             return False
 
         print(f"  ✓ Unsafe code correctly detected ({len(errors)} violation(s))")
+
+        # A long operator chain nests deeper than the recursion limit
+        deep_code = "func main() -> i32:\n    let x = " + " + ".join(["alloc(1)"] * 3000) + "\n"
+        violations = check_safety(parse(tokenize(deep_code, "deep.bpp")), SafetyMode.SAFE)
+        if len(violations) != 3000:
+            print(f"  ✗ Deep expression reported {len(violations)} violation(s), expected 3000")
+            return False
+
+        print(f"  ✓ Deep expression checked without recursion")
+
+        # An unknown @safety_level mode is reported, not raised
+        typo_code = "@safety_level(mode: SAEF)\nmodule test\n\nfunc main() -> i32:\n    return 0\n"
+        violations = check_safety(parse(tokenize(typo_code, "typo.bpp")), SafetyMode.SAFE)
+        if not any("Unknown safety mode 'SAEF'" in v.message for v in violations):
+            print(f"  ✗ Unknown safety mode was not reported")
+            return False
+
+        print(f"  ✓ Unknown safety mode reported")
+
+        # The parallel (-j) path reports file-level decorator errors too
+        from compiler.parallel import analyze_parallel, PARALLEL_MIN_DECLS
+        functions = "".join(f"func f{i}() -> i32:\n    return {i}\n\n" for i in range(PARALLEL_MIN_DECLS))
+        typo_ast = parse(tokenize("@safety_level(mode: SAEF)\nmodule test\n\n" + functions, "typo.bpp"))
+        violations = analyze_parallel(typo_ast, "typo", SafetyMode.SAFE, 4).violations
+        if not any("Unknown safety mode 'SAEF'" in v.message for v in violations):
+            print(f"  ✗ Unknown safety mode was not reported by the parallel analysis")
+            return False
+
+        print(f"  ✓ Unknown safety mode reported by the parallel analysis")
         return True
 
     except (LexerError, ParseError) as e:
@@ -14,7 +14,7 @@ from compiler.lexer import tokenize
 from compiler.parser import parse
 from compiler.typechecker import TypeChecker, check_types
 from compiler.safety.enhanced_checker import EnhancedSafetyChecker, SafetyMode
-from compiler.codegen import generate_code
+from compiler.codegen import LLVMCodeGenerator, generate_code
 
 
 def test_type_checker_basic():
@@ -113,10 +113,65 @@ func main() -> i32:
             print("✓ Type errors correctly detected:")
             for error in errors:
                 print(f"  {error}")
-            return True
         else:
             print("✗ Expected type errors but none found")
             return False
+
+        # break/continue are only valid inside a loop
+        loop_code = """
+func main() -> i32:
+    var i: i32 = 0
+    while i < 10:
+        i = i + 1
+        if i == 5:
+            break
+        continue
+    if i == 10:
+        break
+    continue
+    return i
+"""
+        messages = [e.message for e in check_types(parse(tokenize(loop_code, "test_loop_errors.bpp")))]
+        if messages != ["'break' outside loop", "'continue' outside loop"]:
+            print(f"✗ Unexpected loop exit errors: {messages}")
+            return False
+
+        print("✓ break/continue outside a loop detected")
+        return True
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_type_checker_expected_types():
+    """Test literals checked against an expected type"""
+    print("\n" + "=" * 60)
+    print("Test: Type Checker - Expected Types")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    let size: u64 = 4096
+    let small: u8 = 300  # Should error: 300 does not fit in u8
+    let values: array[u16, 3] = [1, 2, 3]
+    sleep(100)
+    return 0
+"""
+
+    try:
+        tokens = tokenize(code, "test_expected.bpp")
+        ast = parse(tokens)
+        errors = check_types(ast)
+
+        messages = [str(e) for e in errors]
+        if len(errors) == 1 and "'u8'" in messages[0]:
+            print("✓ Literals take the expected type; out-of-range literal rejected")
+            return True
+        else:
+            print("✗ Unexpected type errors:")
+            for message in messages:
+                print(f"  {message}")
+            return False
     except Exception as e:
         print(f"✗ Exception: {e}")
         return False
@@ -191,6 +246,18 @@ def test_safety_rules_database():
         print("✗ Rule for 'alloc' not found")
         return False
 
+    # Test suffix lookup, which only matches at a dot boundary
+    if SAFETY_RULES.get_rule('windows.kernel32.VirtualAlloc') is None:
+        print("✗ Rule for 'windows.kernel32.VirtualAlloc' not found")
+        return False
+    if SAFETY_RULES.get_rule('mem.realloc') is not SAFETY_RULES.get_rule('realloc'):
+        print("✗ 'mem.realloc' did not resolve to the 'realloc' rule")
+        return False
+    if SAFETY_RULES.get_rule('my_alloc') is not None:
+        print("✗ 'my_alloc' matched a rule")
+        return False
+    print("✓ Suffix lookup matches whole dotted components")
+
     # Test category lookup
     memory_rules = SAFETY_RULES.get_rules_by_category(SafetyCategory.MEMORY_MANAGEMENT)
     print(f"✓ Found {len(memory_rules)} memory management rules")
@@ -319,6 +386,368 @@ func main() -> i32:
         return False
 
 
+def test_code_generator_loop_exits():
+    """Test break/continue inside an if leave well-formed blocks"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Loop Exits")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    var i: i32 = 0
+    while i < 10:
+        i = i + 1
+        if i == 5:
+            break
+        elif i == 3:
+            continue
+        else:
+            pass
+        if i == 2:
+            continue
+            i = i + 1
+    return i
+"""
+
+    try:
+        tokens = tokenize(code, "test_loop_exits.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_loop_exits", type_checker.type_annotations)
+
+        # No block may hold anything after its terminator
+        terminated = False
+        for line in llvm_ir.splitlines():
+            text = line.strip()
+            if text.endswith(":") or text == "}":
+                terminated = False
+            elif terminated and text:
+                print(f"✗ Instruction after terminator: {text}")
+                return False
+            elif text.startswith(("br ", "ret ")):
+                terminated = True
+        print("✓ Every block ends at its terminator")
+
+        import shutil
+        import subprocess
+        llc = shutil.which("llc")
+        if not llc:
+            print("⚠ llc not found, skipping IR verification")
+            return True
+
+        result = subprocess.run([llc, "-o", os.devnull], input=llvm_ir,
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"✗ llc rejected the IR: {result.stderr.strip()}")
+            return False
+        print("✓ llc accepts the IR")
+        return True
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_templates():
+    """Test templated functions match the generic emitter"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Templates")
+    print("=" * 60)
+
+    code = """
+func add(a: i32, b: i32) -> i32:
+    return a + b
+
+func scale(x: f64) -> f64:
+    return x * 2.5
+
+func same(x: i32) -> bool:
+    return x == 2
+
+func nothing() -> void:
+    pass
+
+func main() -> i32:
+    return add(1, 2)
+"""
+
+    try:
+        tokens = tokenize(code, "test_templates.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        templated = generate_code(ast, "test_templates", type_checker.type_annotations)
+
+        class GenericGenerator(LLVMCodeGenerator):
+            def _emit_simple_fn(self, *args):
+                return None
+
+        generic = GenericGenerator("test_templates").generate(ast, type_checker.type_annotations)
+
+        if templated == generic:
+            print("✓ Templated IR is identical to the generic emitter's")
+            return True
+        else:
+            print("✗ Templated IR differs from the generic emitter's")
+            return False
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_promotion():
+    """Test that single-assignment locals skip the stack"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Local Promotion")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    let base: i32 = 40
+    var total: i32 = base
+    total = total + 2
+    return total
+"""
+
+    try:
+        tokens = tokenize(code, "test_promotion.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_promotion", type_checker.type_annotations)
+
+        # Only the reassigned local keeps a stack slot, initialized straight from the constant
+        if llvm_ir.count("alloca") == 1 and "store i32 40, i32* %1" in llvm_ir:
+            print("✓ Constant local promoted; reassigned local kept on the stack")
+            return True
+        else:
+            print("✗ Unexpected allocas:")
+            print(llvm_ir)
+            return False
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_constant_folding():
+    """Test constant folding and strength reduction"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Constant Folding")
+    print("=" * 60)
+
+    code = """
+func scale(x: i32) -> i32:
+    print("scaling")
+    return x * 8
+
+func main() -> i32:
+    print("folding")
+    return (6 * 7 - 2) / 4 + scale(1)
+"""
+
+    try:
+        tokens = tokenize(code, "test_folding.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_folding", type_checker.type_annotations)
+
+        checks = [
+            ("shl i32", "Multiplication by 8 became a shift"),
+            ("add i32 10,", "Literal arithmetic folded to 10"),
+        ]
+
+        all_found = True
+        for pattern, description in checks:
+            if pattern in llvm_ir:
+                print(f"✓ {description}")
+            else:
+                print(f"✗ Missing: {pattern}")
+                all_found = False
+
+        if "mul i32" in llvm_ir or "sdiv i32" in llvm_ir:
+            print("✗ Unfolded arithmetic remains")
+            all_found = False
+
+        return all_found
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_peephole():
+    """Test store-to-load forwarding and algebraic identities"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Peephole")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    var total: i32 = 5
+    total = total * 1 + 0
+    var sign: i32 = -3
+    print("peephole")
+    return total + sign
+"""
+
+    try:
+        tokens = tokenize(code, "test_peephole.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_peephole", type_checker.type_annotations)
+
+        checks = [
+            ("store i32 5, i32* %1\n    store i32 5, i32* %1", "Stored value reused by the next load"),
+            ("add i32 %4, -3", "Negated literal folded"),
+        ]
+
+        all_found = True
+        for pattern, description in checks:
+            if pattern in llvm_ir:
+                print(f"✓ {description}")
+            else:
+                print(f"✗ Missing: {pattern}")
+                all_found = False
+
+        if "mul i32" in llvm_ir or "sub i32 0," in llvm_ir:
+            print("✗ Redundant arithmetic remains")
+            all_found = False
+
+        return all_found
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_string_constants():
+    """Test string literal deduplication and escaping"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - String Constants")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    print("say \\"hi\\"\\n")
+    print("say \\"hi\\"\\n")
+    print("café")
+    return 0
+"""
+
+    try:
+        tokens = tokenize(code, "test_strings.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_strings", type_checker.type_annotations)
+
+        checks = [
+            ('[10 x i8] c"say \\22hi\\22\\0A\\00"', "Quotes and newline escaped as hex"),
+            ('[6 x i8] c"caf\\C3\\A9\\00"', "Non-ASCII sized and escaped by UTF-8 bytes"),
+        ]
+
+        all_found = True
+        for pattern, description in checks:
+            if pattern in llvm_ir:
+                print(f"✓ {description}")
+            else:
+                print(f"✗ Missing: {pattern}")
+                all_found = False
+
+        if llvm_ir.count("private unnamed_addr constant") != 2:
+            print("✗ Repeated literal emitted more than once")
+            all_found = False
+
+        if "= getelementptr inbounds (" in llvm_ir:
+            print("✗ Constant string pointer emitted as an instruction")
+            all_found = False
+
+        return all_found
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
+def test_code_generator_status_strings():
+    """Test status_string folding for constant status codes"""
+    print("\n" + "=" * 60)
+    print("Test: Code Generator - Status Strings")
+    print("=" * 60)
+
+    code = """
+func main() -> i32:
+    print(status_string(SUCCESS))
+    print(status_string(2 + 2))
+    print(status_string(42))
+    return 0
+"""
+
+    try:
+        tokens = tokenize(code, "test_status.bpp")
+        ast = parse(tokens)
+
+        type_checker = TypeChecker()
+        if type_checker.check_program(ast):
+            print("✗ Type errors prevent code generation")
+            return False
+
+        llvm_ir = generate_code(ast, "test_status", type_checker.type_annotations)
+
+        checks = [
+            ('c"SUCCESS\\00"', "SUCCESS folded to its name"),
+            ('c"NOT_FOUND\\00"', "Constant expression folded to its name"),
+            ("call i8* @bpp_status_string(i32 42)", "Unknown code left to the runtime"),
+        ]
+
+        all_found = True
+        for pattern, description in checks:
+            if pattern in llvm_ir:
+                print(f"✓ {description}")
+            else:
+                print(f"✗ Missing: {pattern}")
+                all_found = False
+
+        if llvm_ir.count("call i8* @bpp_status_string") != 1:
+            print("✗ Constant status code still calls the runtime")
+            all_found = False
+
+        return all_found
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        return False
+
+
 def test_end_to_end_pipeline():
     """Test complete compilation pipeline"""
     print("\n" + "=" * 60)
@@ -395,6 +824,83 @@ func main() -> i32:
         return False
 
 
+def test_compilation_cache():
+    """Test front-end and IR cache round trip"""
+    print("\n" + "=" * 60)
+    print("Test: Compilation Cache")
+    print("=" * 60)
+
+    import shutil
+    import tempfile
+    from pathlib import Path
+    from compiler.cache import CompilationCache, COMPILER_DIR, source_digest
+
+    code = """
+func main() -> i32:
+    let x: i32 = 5
+    return x
+"""
+
+    try:
+        tokens = tokenize(code, "test_cache.bpp")
+        ast = parse(tokens)
+        type_checker = TypeChecker()
+        type_checker.check_program(ast)
+        llvm_ir = generate_code(ast, "test_cache", type_checker.type_annotations)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = CompilationCache(Path(tmp), "test")
+            key = cache.make_key(code, "test_cache.bpp", "SAFE")
+
+            if cache.load_frontend(key) is not None or cache.load_ir(key, 0) is not None:
+                print("✗ Empty cache reported a hit")
+                return False
+
+            cache.store_frontend(key, (len(tokens), ast, type_checker.type_annotations, []))
+            cache.store_ir(key, 0, llvm_ir)
+
+            token_count, cached_ast, cached_annotations, warnings = cache.load_frontend(key)
+            if token_count != len(tokens) or len(cached_annotations) != len(type_checker.type_annotations):
+                print("✗ Cached front-end results do not match")
+                return False
+
+            # Annotations must still be keyed by the unpickled AST nodes
+            if generate_code(cached_ast, "test_cache", cached_annotations) != llvm_ir:
+                print("✗ IR from cached AST differs")
+                return False
+
+            if cache.load_ir(key, 0) != llvm_ir or cache.load_ir(key, 2) is not None:
+                print("✗ Cached IR lookup is wrong")
+                return False
+
+            if cache.make_key(code + "\n", "test_cache.bpp", "SAFE") == key:
+                print("✗ Source change did not change cache key")
+                return False
+
+            # Entries from a different compiler build must miss
+            if CompilationCache(Path(tmp), "test", "other").make_key(code, "test_cache.bpp", "SAFE") == key:
+                print("✗ Compiler fingerprint change did not change cache key")
+                return False
+
+            compiler_copy = Path(tmp) / "compiler"
+            shutil.copytree(COMPILER_DIR, compiler_copy, ignore=shutil.ignore_patterns("__pycache__"))
+            fingerprint = source_digest(compiler_copy)
+            with open(compiler_copy / "codegen" / "llvm_codegen.py", "a") as f:
+                f.write("\n# changed\n")
+            if source_digest(compiler_copy) == fingerprint:
+                print("✗ Compiler source change did not change fingerprint")
+                return False
+
+        print("✓ Cache round trip passed")
+        return True
+
+    except Exception as e:
+        print(f"✗ Exception: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def run_all_tests():
     """Run all tests"""
     print("\n" + "=" * 60)
@@ -405,11 +911,20 @@ def run_all_tests():
         ("Type Checker - Basic", test_type_checker_basic),
         ("Type Checker - Inference", test_type_checker_inference),
         ("Type Checker - Errors", test_type_checker_errors),
+        ("Type Checker - Expected Types", test_type_checker_expected_types),
         ("Enhanced Safety Checker", test_enhanced_safety_checker),
         ("Safety Rules Database", test_safety_rules_database),
         ("Code Generator - Basic", test_code_generator_basic),
         ("Code Generator - Control Flow", test_code_generator_control_flow),
+        ("Code Generator - Loop Exits", test_code_generator_loop_exits),
+        ("Code Generator - Templates", test_code_generator_templates),
+        ("Code Generator - Local Promotion", test_code_generator_promotion),
+        ("Code Generator - Constant Folding", test_code_generator_constant_folding),
+        ("Code Generator - Peephole", test_code_generator_peephole),
+        ("Code Generator - String Constants", test_code_generator_string_constants),
+        ("Code Generator - Status Strings", test_code_generator_status_strings),
         ("End-to-End Pipeline", test_end_to_end_pipeline),
+        ("Compilation Cache", test_compilation_cache),
     ]
 
     results = []